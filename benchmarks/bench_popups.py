@@ -0,0 +1,72 @@
+"""提醒弹窗基准：模拟 8 小时会话里反复弹出提醒，统计显示延迟与存活的 QObject 数。
+
+无界面运行（offscreen 平台）::
+
+    python benchmarks/bench_popups.py --hours 8 --interval 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="hla-bench-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QObject, QTimer  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import main_v3  # noqa: E402
+
+
+def _drain(app: QApplication) -> None:
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--hours", type=float, default=8.0)
+    ap.add_argument("--interval", type=int, default=10, help="提醒间隔（秒），默认取 10 秒测试档")
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setStyleSheet(main_v3.STYLE_QSS)
+    # 自动关掉启动时的欢迎对话框等模态窗口
+    dismiss = QTimer()
+    dismiss.timeout.connect(
+        lambda: QApplication.activeModalWidget() and QApplication.activeModalWidget().close()
+    )
+    dismiss.start(50)
+    win = main_v3.MainWindow()
+    win.show()
+    _drain(app)
+    win.start_reminders()
+    _drain(app)
+    win.popups.clear()
+    _drain(app)
+
+    objects_before = len(win.findChildren(QObject))
+    latencies = []
+    reminders = int(args.hours * 3600 / args.interval)
+    for i in range(reminders):
+        t0 = time.perf_counter()
+        win.water_reminder() if i % 2 == 0 else win.sedentary_reminder()
+        app.processEvents()        # 让排队器在下一轮事件里真正显示
+        latencies.append((time.perf_counter() - t0) * 1000)
+        win.popups.clear()
+        _drain(app)
+    objects_after = len(win.findChildren(QObject))
+
+    latencies.sort()
+    print(f"reminders shown:        {reminders}")
+    print(f"show latency median:    {statistics.median(latencies):.2f} ms")
+    print(f"show latency p99:       {latencies[int(0.99 * (len(latencies) - 1))]:.2f} ms")
+    print(f"live QObjects:          {objects_before} -> {objects_after}")
+
+
+if __name__ == "__main__":
+    main()
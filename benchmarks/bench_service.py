@@ -0,0 +1,65 @@
+"""多用户提醒服务基准：每秒派发的提醒数、每个会话的内存占用。
+
+用虚拟时钟推进时间轮，不真正等待::
+
+    python benchmarks/bench_service.py --sessions 100000 --hours 8
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from healthy_life.service import ReminderService  # noqa: E402
+
+WATER_SEC = [30 * 60, 60 * 60, 90 * 60, 120 * 60]
+SED_SEC = [45 * 60, 60 * 60, 75 * 60, 90 * 60]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=100_000)
+    ap.add_argument("--hours", type=float, default=8.0)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    clock = {"now": datetime(2025, 1, 6, 9, 0, 0)}
+    svc = ReminderService(lambda user_id, kind: None, clock=lambda: clock["now"])
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    for i in range(args.sessions):
+        clock["now"] += timedelta(milliseconds=rng.randrange(0, 50))   # 错开开始时间
+        svc.open_session(
+            i,
+            water_interval_sec=rng.choice(WATER_SEC),
+            sedentary_interval_sec=rng.choice(SED_SEC),
+        )
+    open_sec = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    step = timedelta(seconds=svc.tick_sec)
+    ticks = int(args.hours * 3600 / svc.tick_sec)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        clock["now"] += step
+        svc.tick(clock["now"])
+    run_sec = time.perf_counter() - t0
+
+    print(f"sessions:               {args.sessions}")
+    print(f"open sessions:          {open_sec:.2f} s")
+    print(f"memory per session:     {mem / args.sessions:.0f} B")
+    print(f"simulated:              {args.hours:g} h ({ticks} ticks) in {run_sec:.2f} s")
+    print(f"reminders dispatched:   {svc.dispatched}")
+    print(f"reminders / sec:        {svc.dispatched / max(run_sec, 1e-9):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""热点路径基准套件：与 JSON 基线比较，超过阈值的回退直接以非零退出码失败。
+
+无界面运行（offscreen 平台）::
+
+    python benchmarks/suite.py                      # 与 benchmarks/baseline.json 比较
+    python benchmarks/suite.py --update-baseline    # 以本机结果覆盖基线
+    python benchmarks/suite.py -k report --threshold 0.2
+
+每个用例重复若干轮，每轮连续调用 ``number`` 次，记录每次调用耗时（µs）的
+中位数与最小值。``number`` 只是下限：一轮不足 ``MIN_ROUND_SEC`` 时按预估加大次数
+（与 timeit 的 autorange 相同），几十微秒的用例也不会被计时器精度和调度抖动左右；
+计时期间关闭 GC（同 timeit），前面用例留下的对象不会把回收成本摊到后面的用例上。
+判定回退用最小值——它受调度抖动影响最小，与 timeit 的做法一致；阈值按用例放宽到
+基线离散度（中位数 / 最小值 - 1）的 ``NOISE_FACTOR`` 倍，本身抖动大的用例（如要 fsync 的）不误报；
+比较前再按一段固定的纯 Python 校准负载折算，抵消 CPU 降频 / 机器忙闲带来的整体快慢。
+基线与机器相关，换机器后先 ``--update-baseline``。
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="hla-bench-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QTimer, QtMsgType, qInstallMessageHandler  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import main_v3  # noqa: E402
+from healthy_life.config import LANG_EN, LANG_ZH, Settings  # noqa: E402
+from healthy_life.scheduler import REMINDER_MOVE, REMINDER_WATER  # noqa: E402
+from healthy_life.session import ReminderSession  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+MIN_ROUND_SEC = 0.5     # 每轮至少计时这么久
+NOISE_FACTOR = 3        # 单个用例的阈值至少是它基线离散度的这么多倍
+DAY_SCALE = 300         # 有状态的记录用例每调用这么多次换一场新会话
+
+# name -> (准备函数, 每轮最少调用次数)；准备函数接收 MainWindow，返回被测的无参调用
+CASES: Dict[str, Tuple[Callable[["main_v3.MainWindow"], Callable[[], None]], int]] = {}
+
+
+def case(name: str, number: int):
+    def deco(fn):
+        CASES[name] = (fn, number)
+        return fn
+    return deco
+
+
+def _drain() -> None:
+    QApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+# ---------- 用例 ----------
+@case("settings_save", 200)
+def _settings_save(win):
+    s = Settings()
+    return s.save
+
+
+@case("settings_save_write_behind", 2000)
+def _settings_save_wb(win):
+    # 界面线程上的实际成本：序列化 + 交给后台线程
+    return lambda: win.settings.save(win.settings_writer)
+
+
+def _day_scale(win, op: Callable[[], None]) -> Callable[[], None]:
+    """量的是“当日前几百次”的成本：轮次被放大到上万次时，
+    会话里的事件数不随之增长（否则检查点快照按全量序列化，结果取决于调用次数）。"""
+    calls = 0
+
+    def run():
+        nonlocal calls
+        calls += 1
+        if calls % DAY_SCALE == 0:
+            win._clear_activity_ui()
+            win.session.start()
+        op()
+    return run
+
+
+@case("log_sip", 500)
+def _log_sip(win):
+    return _day_scale(win, win.log_sip)
+
+
+@case("log_move", 200)
+def _log_move(win):
+    win._clear_activity_ui()
+    return _day_scale(win, win.log_move)
+
+
+@case("tick_elapsed", 2000)
+def _tick_elapsed(win):
+    return win._tick_elapsed
+
+
+def _report_case(events: int):
+    def setup(win):
+        start = datetime(2025, 1, 6, 9, 0, 0)
+        sess = ReminderSession()
+        sess.start(start)
+        step = timedelta(seconds=8 * 3600 / max(1, events))
+        for i in range(events):
+            when = start + step * (i + 1)
+            sess.log_sip(when) if i % 2 == 0 else sess.log_move(when)
+        end = start + timedelta(hours=8)
+        return lambda: sess.build_report_text(end)
+    return setup
+
+
+for _n, _number in ((10, 2000), (1_000, 2000), (100_000, 200)):
+    case(f"build_report_{_n}", _number)(_report_case(_n))
+
+
+@case("analytics_1m", 3)
+def _analytics(win):
+    import numpy as np
+    from healthy_life import analytics
+    from healthy_life.history import KIND_END, KIND_MOVE, KIND_SIP, KIND_START, DayColumns
+
+    # 一百万条事件：每场会话 start + 38 条随机 sip/move + end，一天一场
+    rng = np.random.default_rng(1)
+    per, n_sess = 40, 25_000
+    day0 = int(datetime(2020, 1, 6, 9).timestamp() * 1000)
+    offsets = np.sort(rng.integers(0, 9 * 3600_000, size=(n_sess, per)), axis=1)
+    ts = (offsets + day0 + np.arange(n_sess)[:, None] * 86_400_000).ravel()
+    kind = rng.choice(np.array([KIND_SIP, KIND_MOVE], dtype="u1"), size=(n_sess, per))
+    kind[:, 0], kind[:, -1] = KIND_START, KIND_END
+    amount = np.where(kind == KIND_SIP, 250, 0).astype("<i4").ravel()
+    cols = DayColumns(ts.astype("<i8"), kind.ravel(), amount)
+    return lambda: analytics.analyze(cols, 3600, 3600)
+
+
+@case("apply_texts_lang_switch", 50)
+def _apply_texts(win):
+    langs = [LANG_EN, LANG_ZH]
+
+    def run():
+        win.settings.language = langs[0]
+        langs.reverse()
+        win.apply_texts()
+    return run
+
+
+@case("apply_texts_same_lang", 200)
+def _apply_texts_same(win):
+    # 语言没变时应几乎不碰控件（ViewSync 去重、下拉框不重建）
+    return win.apply_texts
+
+
+_ASSET_DIR: List[Path] = []
+# 两帧 1x1 的动画 GIF（黑 / 红，每帧 100 ms）：Qt 不能写 GIF，直接给出字节
+_SIT_GIF = bytes.fromhex(
+    "47494638396101000100800000000000ff000021ff0b4e45545343415045322e30030100000021f904000"
+    "a0000002c000000000100010000020244010021f904000a0000002c00000000010001000002024c01003b")
+
+
+def _asset_fixture() -> Path:
+    """合成一套与真实素材尺寸相近的原图（images/ 不随仓库分发），并构建资源包。"""
+    if _ASSET_DIR:
+        return _ASSET_DIR[0]
+    from PyQt5.QtGui import QColor, QImage, QLinearGradient, QPainter
+    from tools.build_assets import build
+
+    root = Path(tempfile.mkdtemp(prefix="hla-assets-"))
+    (root / "images").mkdir()
+    for rel, side, fmt in (("images/logo.png", 1024, "PNG"), ("images/water_remind.jpg", 3000, "JPG"),
+                           ("images/joboff.jpg", 3000, "JPG")):
+        img = QImage(side, side, QImage.Format_RGB32)
+        p = QPainter(img)
+        grad = QLinearGradient(0, 0, side, side)
+        grad.setColorAt(0, QColor("#34C759"))
+        grad.setColorAt(1, QColor("#007AFF"))
+        p.fillRect(0, 0, side, side, grad)
+        p.end()
+        img.save(str(root / rel), fmt, 90)
+    (root / "images" / "sit.gif").write_bytes(_SIT_GIF)
+    build(root, root / "assets.hlpack", dprs=(1.0,))
+    _ASSET_DIR.append(root)
+    return root
+
+
+def _assets_case(bundled: bool):
+    # 冷缓存：启动时的 logo + 两种弹窗大图，每次调用都是新的 AssetCache
+    def setup(win):
+        root = _asset_fixture()
+        bundle = str(root / "assets.hlpack") if bundled else str(root / "missing.hlpack")
+
+        def run():
+            cache = main_v3.AssetCache(root=str(root), bundle_path=bundle)
+            cache.pixmap("images/logo.png", height=75)
+            cache.pixmap("images/water_remind.jpg", 475, 475)
+            cache.pixmap("images/joboff.jpg", 600, 600)
+        return run
+    return setup
+
+
+case("assets_cold_original", 3)(_assets_case(False))
+case("assets_cold_bundle", 20)(_assets_case(True))
+
+
+@case("popup_construct", 30)
+def _popup_construct(win):
+    def run():
+        dlg = main_v3.ReminderPopup((REMINDER_WATER, REMINDER_MOVE), win)
+        dlg.deleteLater()
+        _drain()
+    return run
+
+
+@case("popup_show_pooled", 200)
+def _popup_show(win):
+    def run():
+        win.water_reminder()
+        QApplication.processEvents()
+        win.popups.clear()
+        _drain()
+    return run
+
+
+# ---------- 运行与比较 ----------
+def measure(op: Callable[[], None], number: int, repeat: int,
+            min_sec: float = MIN_ROUND_SEC) -> Dict[str, float]:
+    op()   # 预热：首次调用的懒加载不计入
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            op()
+        took = time.perf_counter() - t0
+        if took < min_sec:
+            number = math.ceil(number * min_sec / max(took, 1e-9))
+        samples: List[float] = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                op()
+            samples.append((time.perf_counter() - t0) / number * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"median_us": round(statistics.median(samples), 3),
+            "min_us": round(min(samples), 3),
+            "number": number}
+
+
+def calibrate(repeat: int) -> float:
+    """固定的纯 Python 负载（µs，取最小值），作为这台机器此刻的“速度单位”。"""
+    def work():
+        d = {}
+        for i in range(20_000):
+            d[i & 1023] = str(i)
+        return sorted(d.values())
+    return measure(work, 5, repeat)["min_us"]
+
+
+def _window() -> "main_v3.MainWindow":
+    # 自动关掉欢迎对话框等模态窗口
+    dismiss = QTimer(QApplication.instance())
+    dismiss.timeout.connect(
+        lambda: QApplication.activeModalWidget() and QApplication.activeModalWidget().close()
+    )
+    dismiss.start(50)
+    win = main_v3.MainWindow()
+    win.show()
+    _drain()
+    win.start_reminders()
+    win.popups.clear()
+    _drain()
+    return win
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float, speed: float = 1.0) -> List[str]:
+    """返回超过阈值的回退说明；基线里没有的用例只打印，不判定。
+
+    ``speed`` 是本次校准耗时 / 基线校准耗时，结果先除以它再比较。
+    """
+    failures = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = case_threshold(base, threshold)
+        ratio = res["min_us"] / speed / max(base["min_us"], 1e-9)
+        if ratio > 1 + limit:
+            failures.append(f"{name}: {base['min_us']:.1f} µs -> {res['min_us']:.1f} µs "
+                            f"(+{(ratio - 1) * 100:.0f}%, threshold +{limit * 100:.0f}%)")
+    return failures
+
+
+def case_threshold(base: Dict[str, float], threshold: float) -> float:
+    """全局阈值与该用例基线离散度的 NOISE_FACTOR 倍，取较大者。"""
+    spread = base["median_us"] / max(base["min_us"], 1e-9) - 1
+    return max(threshold, NOISE_FACTOR * spread)
+
+
+def _quiet_qt(kind, ctx, msg) -> None:
+    if kind >= QtMsgType.QtCriticalMsg:
+        print(msg, file=sys.stderr)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("-k", dest="pattern", default="", help="只运行名字含该子串的用例")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--threshold", type=float, default=0.5, help="允许的回退比例（按最小值）")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--json", type=Path, help="另存本次结果")
+    args = ap.parse_args()
+
+    # offscreen 平台对 raise() 等调用会刷屏警告，只保留严重错误
+    qInstallMessageHandler(_quiet_qt)
+    app = QApplication(sys.argv)
+    app.setStyleSheet(main_v3.STYLE_QSS)
+    win = _window()
+
+    cal = calibrate(args.repeat)
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (setup, number) in CASES.items():
+        if args.pattern not in name:
+            continue
+        results[name] = measure(setup(win), number, args.repeat)
+        _drain()
+    win.shutdown()
+
+    baseline, base_cal = {}, None
+    if args.baseline.is_file():
+        base_doc = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline, base_cal = base_doc.get("results", {}), base_doc.get("calibration_us")
+    speed = cal / base_cal if base_cal else 1.0
+    print(f"calibration: {cal:.0f} µs (baseline {base_cal or '-'}; speed factor {speed:.2f})")
+
+    print(f"{'case':<28}{'number':>8}{'median µs':>12}{'min µs':>12}{'base min':>12}{'limit':>8}")
+    for name, res in results.items():
+        base = baseline.get(name)
+        base_min = "-" if base is None else f"{base['min_us']:.1f}"
+        limit = "-" if base is None else f"+{case_threshold(base, args.threshold) * 100:.0f}%"
+        print(f"{name:<28}{res['number']:>8}{res['median_us']:>12.1f}{res['min_us']:>12.1f}"
+              f"{base_min:>12}{limit:>8}")
+
+    doc = {
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "calibration_us": cal,
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        # 合并旧基线时先把旧结果折算到本次的速度单位
+        merged = {name: {k: round(v * speed, 3) if k.endswith("_us") else v for k, v in res.items()}
+                  for name, res in baseline.items()}
+        merged.update(results)
+        doc["results"] = merged
+        args.baseline.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    failures = compare(results, baseline, args.threshold, speed)
+    if failures:
+        print("\nPERFORMANCE REGRESSION", file=sys.stderr)
+        for line in failures:
+            print("  " + line, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""健康生活小助手的核心逻辑（不依赖 Qt）。"""
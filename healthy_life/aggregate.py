@@ -0,0 +1,182 @@
+"""多用户、多天报告汇总：每位用户一份进程池任务，按时间 k 路归并该用户的事件文件。
+
+目录结构为 ``ROOT/<用户>/health_report_*.{hlar,json,csv}``（桌面端、CLI 或
+``simulate --export`` 写出的文件）。同一场会话有多种格式时只读一份（hlar > json > csv；hlar 需要 NumPy）。
+
+每位用户的事件流用 ``heapq.merge`` 合成一条时间序列，用与报告相同的
+:func:`~healthy_life.report.replay_sessions` 回放，所以每场会话的最长久坐、久坐分布与报告里的数字一致；
+进程之间只传回小小的汇总对象，团队汇总再合并 :class:`GapSketch`::
+
+    python -m healthy_life.aggregate ROOT [--workers 8] [--json rollup.json]
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .report import read_report, replay_sessions
+from .stats import GapSketch
+
+# 同一场会话多种格式并存时的优先顺序（读起来越快越靠前）
+_PREFERENCE = (".hlar", ".json", ".csv")
+DEFAULT_GOAL = 1700       # csv 没有汇总时使用的饮水目标（与 Settings 默认值一致）
+
+
+@dataclass
+class Rollup:
+    """一位用户（或整个团队）的汇总；``merge`` 满足结合律，可按任意顺序合并。"""
+    name: str
+    users: int = 1
+    sessions: int = 0
+    sips: int = 0
+    intake_ml: int = 0
+    goal_ml: int = 0
+    goal_met: int = 0               # 达到饮水目标的会话数
+    moves: int = 0
+    active_sec: float = 0.0
+    longest_sec: float = 0.0        # 所有会话中最长的一段久坐
+    longest: GapSketch = field(default_factory=GapSketch)   # 每场会话“最长久坐”的分布
+    gaps: GapSketch = field(default_factory=GapSketch)      # 全部已结束久坐间隔的分布
+
+    def merge(self, other: "Rollup") -> None:
+        self.users += other.users
+        self.sessions += other.sessions
+        self.sips += other.sips
+        self.intake_ml += other.intake_ml
+        self.goal_ml += other.goal_ml
+        self.goal_met += other.goal_met
+        self.moves += other.moves
+        self.active_sec += other.active_sec
+        self.longest_sec = max(self.longest_sec, other.longest_sec)
+        self.longest.merge(other.longest)
+        self.gaps.merge(other.gaps)
+
+    def to_dict(self) -> Dict[str, object]:
+        hours = self.active_sec / 3600
+        p50, p90 = self.longest.quantiles((0.5, 0.9))
+        g50, g90 = self.gaps.quantiles((0.5, 0.9))
+        return {
+            "name": self.name,
+            "users": self.users,
+            "sessions": self.sessions,
+            "sips": self.sips,
+            "intake_ml": self.intake_ml,
+            "goal_ml": self.goal_ml,
+            "intake_pct_of_goal": round(100 * self.intake_ml / self.goal_ml, 1) if self.goal_ml else 0.0,
+            "goal_met_sessions": self.goal_met,
+            "moves": self.moves,
+            "active_hours": round(hours, 2),
+            "moves_per_hour": round(self.moves / hours, 3) if hours else 0.0,
+            "longest_sedentary_max_sec": round(self.longest_sec, 3),
+            "longest_sedentary_p50_sec": round(p50 or 0.0, 3),
+            "longest_sedentary_p90_sec": round(p90 or 0.0, 3),
+            "sedentary_p50_sec": round(g50 or 0.0, 3),
+            "sedentary_p90_sec": round(g90 or 0.0, 3),
+        }
+
+
+def _pick_files(user_dir: Path) -> List[str]:
+    # 一年几百个文件：用 scandir + 字符串操作，避免逐个构造 Path
+    best: Dict[str, Tuple[int, str]] = {}
+    with os.scandir(user_dir) as it:
+        for entry in it:
+            stem, dot, ext = entry.name.rpartition(".")
+            if not dot or "." + ext not in _PREFERENCE:
+                continue
+            rank = _PREFERENCE.index("." + ext)
+            if stem not in best or rank < best[stem][0]:
+                best[stem] = (rank, entry.path)
+    return [best[stem][1] for stem in sorted(best)]
+
+
+def rollup_user(user_dir: Path) -> Rollup:
+    """读一位用户的全部报告文件并回放；在工作进程里执行。"""
+    user_dir = Path(user_dir)
+    out = Rollup(user_dir.name)
+    summaries: Dict[int, dict] = {}     # 会话开始时间（epoch 秒）→ 报告汇总
+    streams = []
+    for path in _pick_files(user_dir):
+        summary, events = read_report(path)
+        if summary is not None and summary.get("start"):
+            summaries[int(datetime.fromisoformat(summary["start"]).timestamp())] = summary
+        streams.append(events)
+
+    for span in replay_sessions(heapq.merge(*streams)):
+        stats = span.stats
+        summary = summaries.get(span.start_ms // 1000) or {}
+        goal = summary.get("goal_ml", DEFAULT_GOAL)
+        # 活动时长以报告为准；没有汇总时用回放算出的（同样扣除暂停）
+        active = summary.get("duration_sec", span.active_ms / 1000)
+        longest = stats.longest_gap_until(datetime.fromtimestamp(span.end_ms / 1000))
+        out.sessions += 1
+        out.sips += stats.sips
+        out.intake_ml += stats.intake
+        out.goal_ml += goal
+        out.goal_met += stats.intake >= goal
+        out.moves += stats.moves
+        out.active_sec += active
+        out.longest_sec = max(out.longest_sec, longest)
+        out.longest.add(longest)
+        out.gaps.merge(stats.gaps)
+    return out
+
+
+def aggregate(root: Path, workers: Optional[int] = None) -> Tuple[List[Rollup], Rollup]:
+    """返回 (按用户名排序的各用户汇总, 团队汇总)。``workers=1`` 时不开进程池。"""
+    dirs = sorted(p for p in Path(root).iterdir() if p.is_dir())
+    if workers == 1 or len(dirs) <= 1:
+        users = [rollup_user(d) for d in dirs]
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(1, len(dirs) // (workers * 4))
+            users = list(pool.map(rollup_user, dirs, chunksize=chunk))
+    team = Rollup("team", users=0)
+    for u in users:
+        team.merge(u)
+    return users, team
+
+
+def _row(d: Dict[str, object]) -> str:
+    return (f"{d['name']:<16}{d['sessions']:>9}{d['intake_pct_of_goal']:>9.1f}%"
+            f"{d['moves_per_hour']:>10.2f}{d['longest_sedentary_p50_sec'] / 60:>10.1f}"
+            f"{d['longest_sedentary_p90_sec'] / 60:>10.1f}{d['longest_sedentary_max_sec'] / 60:>10.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="healthy_life.aggregate", description="汇总多用户、多天的报告文件")
+    ap.add_argument("root", type=Path, help="ROOT/<用户>/health_report_*")
+    ap.add_argument("--workers", type=int, help="进程数（默认 CPU 核数；1 = 单进程）")
+    ap.add_argument("--json", type=Path, help="把各用户与团队汇总写成 JSON")
+    ap.add_argument("--quiet", action="store_true", help="只打印团队汇总")
+    args = ap.parse_args(argv)
+    if not args.root.is_dir():
+        print(f"目录不存在 / No such directory: {args.root}", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    users, team = aggregate(args.root, args.workers)
+    wall = time.perf_counter() - t0
+
+    print(f"{'user':<16}{'sessions':>9}{'intake':>10}{'moves/h':>10}"
+          f"{'lng p50':>10}{'lng p90':>10}{'lng max':>10}   (min)")
+    if not args.quiet:
+        for u in users:
+            print(_row(u.to_dict()))
+    print(_row(team.to_dict()))
+    print(f"\n{team.users:,} users, {team.sessions:,} sessions in {wall:.2f} s")
+    if args.json:
+        doc = {"team": team.to_dict(), "users": [u.to_dict() for u in users]}
+        args.json.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
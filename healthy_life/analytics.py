@@ -0,0 +1,176 @@
+"""基于 NumPy 的向量化会话分析：久坐间隔分布、按钟点的直方图、饮水曲线与提醒达标率。
+
+输入是历史库 / 列式报告的三列 :class:`DayColumns`（ts 毫秒、kind、amount），
+可以跨很多天、很多场会话；全部计算都是整列运算，没有逐事件的 Python 循环，
+百万级事件一次调用在百毫秒量级。
+
+口径与当日报告一致：久坐间隔是“开始→第一次活动、活动→活动”的墙上时间
+（不扣除暂停）；``include_open=True`` 时再加上最后一次活动→结束这一段。
+
+    from healthy_life.history import HistoryStore
+    cols = HistoryStore(HISTORY_DIR).load_range(start, end)
+    summary = analyze(cols, water_interval_sec=3600, sedentary_interval_sec=3600)
+"""
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Sequence
+
+from .events import to_ms
+from .history import KIND_END, KIND_MOVE, KIND_SIP, KIND_START, DayColumns, _numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .session import ReminderSession
+
+DEFAULT_PERCENTILES = (50, 75, 90, 95, 99)
+
+
+class Gaps(NamedTuple):
+    start_ms: "np.ndarray"     # int64，间隔开始的时刻
+    sec: "np.ndarray"          # float64，间隔长度（秒）
+    session: "np.ndarray"      # int64，所属会话序号（从 1 起）
+
+
+def from_session(sess: "ReminderSession", end_time: datetime) -> DayColumns:
+    """把一场会话（含结束）转成三列，便于对当前会话做同样的分析。"""
+    np = _numpy()
+    buf = sess.events
+    head = [to_ms(sess.start_time)] if sess.start_time is not None else []
+    ts = np.concatenate([head, np.frombuffer(buf.ts, dtype="<i8"), [to_ms(end_time)]])
+    kind = np.concatenate([[KIND_START] * len(head), np.frombuffer(buf.kind, dtype="u1"), [KIND_END]])
+    amount = np.concatenate([[0] * len(head), np.frombuffer(buf.amount, dtype="<i4"), [0]])
+    return DayColumns(ts.astype("<i8"), kind.astype("u1"), amount.astype("<i4"))
+
+
+def session_ids(cols: DayColumns) -> "np.ndarray":
+    """每个事件所属会话的序号：第 k 个 start 之后为 k；第一个 start 之前、end 之后为 0。"""
+    np = _numpy()
+    is_start = cols.kind == KIND_START
+    is_end = cols.kind == KIND_END
+    # 每个事件之前（含自身）最近的一个 start / end 标记；是 start 则处在会话中
+    marker = np.maximum.accumulate(np.where(is_start | is_end, np.arange(len(is_start)), -1))
+    opened = (marker >= 0) & is_start[np.maximum(marker, 0)]
+    # end 只在结束一场进行中的会话时算作会话的一部分；重复的 end（旧版本会记下）为 0
+    before = np.concatenate(([-1], marker))[:-1]
+    closing = is_end & (before >= 0) & is_start[np.maximum(before, 0)]
+    return np.where(opened | closing, np.cumsum(is_start), 0)
+
+
+def intervals(cols: DayColumns, kind: int, include_open: bool = False,
+              sid: Optional["np.ndarray"] = None) -> Gaps:
+    """同一会话内“开始或上一个 ``kind`` 事件”到下一个 ``kind`` 事件的间隔。
+
+    ``kind=KIND_MOVE`` 即久坐间隔，``kind=KIND_SIP`` 即两口水之间的间隔；
+    已经算好的 :func:`session_ids` 可以经 ``sid`` 传入复用。
+    """
+    np = _numpy()
+    if sid is None:
+        sid = session_ids(cols)
+    anchors = ((cols.kind == KIND_START) | (cols.kind == kind)) & (sid > 0)
+    if include_open:
+        anchors |= (cols.kind == KIND_END) & (sid > 0)
+    ts, k, s = cols.ts[anchors], cols.kind[anchors], sid[anchors]
+    ok = (s[1:] == s[:-1]) & (k[1:] != KIND_START)
+    return Gaps(ts[:-1][ok].astype("<i8"), np.diff(ts)[ok] / 1000.0, s[1:][ok].astype("<i8"))
+
+
+def local_seconds(ts_ms: "np.ndarray") -> "np.ndarray":
+    """epoch 毫秒 → 本地时间的“epoch 秒”；时区偏移每天只查一次（取当天正午的偏移）。"""
+    np = _numpy()
+    sec = np.asarray(ts_ms, dtype="<i8") // 1000
+    if not len(sec):
+        return sec
+    days, inverse = np.unique(sec // 86400, return_inverse=True)
+    offsets = np.array([time.localtime(int(d) * 86400 + 43200).tm_gmtoff for d in days], dtype="<i8")
+    return sec + offsets[inverse]
+
+
+def local_hour(ts_ms: "np.ndarray") -> "np.ndarray":
+    """epoch 毫秒 → 本地钟点 0..23。"""
+    return (local_seconds(ts_ms) // 3600) % 24
+
+
+def percentiles(sec: "np.ndarray", qs: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+    np = _numpy()
+    if not len(sec):
+        return {f"p{q:g}": 0.0 for q in qs}
+    return {f"p{q:g}": float(v) for q, v in zip(qs, np.percentile(sec, qs))}
+
+
+def by_hour(gaps: Gaps) -> Dict[str, "np.ndarray"]:
+    """按间隔开始的钟点统计：次数、平均长度、最长（秒），各 24 格。"""
+    np = _numpy()
+    hour = local_hour(gaps.start_ms)
+    count = np.bincount(hour, minlength=24)
+    total = np.bincount(hour, weights=gaps.sec, minlength=24)
+    longest = np.zeros(24)
+    np.maximum.at(longest, hour, gaps.sec)
+    mean = np.divide(total, count, out=np.zeros(24), where=count > 0)
+    return {"count": count, "mean_sec": mean, "max_sec": longest}
+
+
+def histogram(sec: "np.ndarray", bin_min: int = 15, max_min: int = 240) -> Dict[str, "np.ndarray"]:
+    """间隔长度直方图（分钟分桶）；最后一格收纳所有 ≥ max_min 的间隔。"""
+    np = _numpy()
+    edges = np.arange(0, max_min + bin_min, bin_min, dtype=float)
+    counts = np.histogram(np.minimum(sec / 60.0, max_min), bins=np.append(edges[:-1], np.inf))[0]
+    return {"edges_min": edges, "count": counts}
+
+
+def intake_by_hour(cols: DayColumns) -> "np.ndarray":
+    """按钟点的平均饮水量（ml/天）：各钟点累计毫升数 ÷ 有记录的天数。"""
+    np = _numpy()
+    local = local_seconds(cols.ts)
+    sip = cols.kind == KIND_SIP
+    ml = np.bincount((local[sip] // 3600) % 24, weights=cols.amount[sip], minlength=24)
+    return ml / max(1, len(np.unique(local // 86400)))
+
+
+def adherence(gaps: Gaps, interval_sec: float) -> Dict[str, float]:
+    """间隔不超过设定提醒间隔的比例，以及超出部分的累计与平均（秒）。"""
+    np = _numpy()
+    n = len(gaps.sec)
+    if not n:
+        return {"intervals": 0, "within": 1.0, "over": 0, "overdue_total_sec": 0.0, "overdue_mean_sec": 0.0}
+    over = np.maximum(gaps.sec - interval_sec, 0.0)
+    n_over = int(np.count_nonzero(over))
+    return {
+        "intervals": n,
+        "within": float(1 - n_over / n),
+        "over": n_over,
+        "overdue_total_sec": float(over.sum()),
+        "overdue_mean_sec": float(over.sum() / n_over) if n_over else 0.0,
+    }
+
+
+def analyze(cols: DayColumns, water_interval_sec: Optional[float] = None,
+            sedentary_interval_sec: Optional[float] = None,
+            qs: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+    """一次算出面板需要的全部指标；数组保持 ndarray，交给调用方序列化或绘图。"""
+    np = _numpy()
+    sid = session_ids(cols)
+    sed = intervals(cols, KIND_MOVE, sid=sid)
+    sed_open = intervals(cols, KIND_MOVE, include_open=True, sid=sid)
+    water = intervals(cols, KIND_SIP, include_open=True, sid=sid)
+    n_sessions = int(sid.max()) if len(sid) else 0
+    # 每场会话的最长久坐（含最后一段），与报告里的“最长久坐”同口径
+    longest = np.zeros(n_sessions + 1)
+    np.maximum.at(longest, sed_open.session, sed_open.sec)
+    out: Dict[str, object] = {
+        "events": len(cols.ts),
+        "sessions": n_sessions,
+        "sedentary": {
+            "count": len(sed.sec),
+            "mean_sec": float(sed.sec.mean()) if len(sed.sec) else 0.0,
+            **percentiles(sed.sec, qs),
+            "histogram": histogram(sed.sec),
+            "by_hour": by_hour(sed),
+            "longest_per_session_sec": longest[1:],
+        },
+        "intake_ml_by_hour": intake_by_hour(cols),
+    }
+    if sedentary_interval_sec is not None:
+        out["sedentary_adherence"] = adherence(sed_open, sedentary_interval_sec)
+    if water_interval_sec is not None:
+        out["water_adherence"] = adherence(water, water_interval_sec)
+    return out
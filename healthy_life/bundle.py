@@ -0,0 +1,168 @@
+"""预缩放图片资源包：构建时生成各尺寸、各 DPI 的变体，打成一个带索引的文件，运行时 mmap 按键读取。
+
+布局::
+
+    MAGIC | u32 索引长度 | 索引 JSON | 数据块（各自 16 字节对齐，偏移相对文件开头）
+
+索引是 ``{"version", "byteorder", "entries": {键: [变体, ...]}}``，变体为
+``{"dpr", "w", "h", "codec", "frames": [[偏移, 长度, 帧延时 ms], ...]}``，w/h 是物理像素。
+``codec`` 为 ``raw`` 时数据块就是预乘 ARGB32 像素（每行 w*4 字节，构建机字节序），
+不需要任何解码；较大的图（如弹窗大图）用 ``png`` / ``jpg`` 省空间，解码的也只是缩好的图。
+
+键由原图路径和程序请求的逻辑尺寸组成（:func:`asset_key`），与 ``AssetCache`` 的调用一一对应。
+本模块不依赖 Qt；像素的生成见 ``tools/build_assets.py``。
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+BUNDLE_MAGIC = b"HLAPACK1"
+BUNDLE_VERSION = 1
+_ALIGN = 16
+
+Frame = Tuple[int, int, int]        # (偏移, 长度, 帧延时 ms)
+
+# 构建时生成的变体：(原图, 逻辑宽, 逻辑高, 是否动画)，须与界面里 ASSETS.pixmap / ASSETS.movie 的调用一致
+ASSET_DPRS = (1.0, 1.5, 2.0)
+ASSET_VARIANTS = (
+    ("images/logo.png", 0, 75, False),              # 标题栏 logo
+    ("images/water_remind.jpg", 475, 475, False),   # 喝水弹窗
+    ("images/water_remind.jpg", 360, 360, False),   # 喝水 + 久坐合并弹窗
+    ("images/joboff.jpg", 600, 600, False),         # 下班弹窗
+    ("images/sit.gif", 500, 500, True),             # 久坐弹窗动画
+    ("images/sit.gif", 65, 65, True),               # 活动条图标
+)
+
+
+def asset_key(rel_path: str, width: int = 0, height: int = 0) -> str:
+    """``images/logo.png@0x75``：width 为 0 表示只按高度缩放（与 AssetCache.pixmap 一致）。"""
+    return f"{rel_path}@{width}x{height}"
+
+
+class Variant(NamedTuple):
+    dpr: float
+    width: int          # 物理像素
+    height: int
+    codec: str          # "raw" | "png" | "jpg"
+    frames: Tuple[Frame, ...]
+
+    @property
+    def animated(self) -> bool:
+        return len(self.frames) > 1
+
+
+class AssetBundle:
+    """只读的资源包；数据块以 memoryview 形式直接指向映射的文件，不复制。"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self._mm.close()
+            raise ValueError(f"不是资源包文件: {self.path}")
+        off = len(BUNDLE_MAGIC)
+        (n,) = struct.unpack_from("<I", self._mm, off)
+        index = json.loads(self._mm[off + 4:off + 4 + n].decode("utf-8"))
+        if index.get("version") != BUNDLE_VERSION:
+            self._mm.close()
+            raise ValueError(f"资源包版本不符: {index.get('version')}")
+        # 像素按构建机字节序存放；字节序不同时 raw 变体不可用，调用方退回原图
+        native = index.get("byteorder") == sys.byteorder
+        self._entries: Dict[str, List[Variant]] = {}
+        for key, variants in index["entries"].items():
+            vs = [Variant(v["dpr"], v["w"], v["h"], v["codec"], tuple(map(tuple, v["frames"])))
+                  for v in variants if native or v["codec"] != "raw"]
+            self._entries[key] = sorted(vs, key=lambda v: v.dpr)
+
+    @staticmethod
+    def open(path: Path) -> Optional["AssetBundle"]:
+        """文件不存在或损坏时返回 None（程序照常从原图加载）。"""
+        try:
+            return AssetBundle(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def keys(self) -> Iterable[str]:
+        return self._entries.keys()
+
+    def variant(self, key: str, dpr: float = 1.0) -> Optional[Variant]:
+        """不小于 ``dpr`` 的最小变体；都比它小时取最大的。"""
+        variants = self._entries.get(key)
+        if not variants:
+            return None
+        for v in variants:
+            if v.dpr >= dpr:
+                return v
+        return variants[-1]
+
+    def data(self, frame: Frame) -> memoryview:
+        off, length, _ = frame
+        return memoryview(self._mm)[off:off + length]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mm)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class BundleWriter:
+    """构建端：逐个登记变体，最后一次写出（临时文件 + rename）。"""
+
+    def __init__(self):
+        self._entries: Dict[str, List[dict]] = {}
+        self._blobs: List[bytes] = []
+
+    def add(self, key: str, dpr: float, width: int, height: int, codec: str,
+            frames: Iterable[Tuple[bytes, int]]) -> None:
+        """``frames`` 是 (数据, 帧延时 ms)；静态图只有一帧、延时为 0。"""
+        refs = []
+        for blob, delay in frames:
+            refs.append([len(self._blobs), len(blob), int(delay)])
+            self._blobs.append(bytes(blob))
+        self._entries.setdefault(key, []).append(
+            {"dpr": dpr, "w": width, "h": height, "codec": codec, "frames": refs})
+
+    def write(self, path: Path) -> int:
+        """返回写出的字节数。"""
+        # 先按块大小排好偏移（索引里的偏移依赖索引自身长度，固定点迭代一两次即收敛）
+        head_len = 0
+        while True:
+            offsets, pos = [], _align(len(BUNDLE_MAGIC) + 4 + head_len)
+            for blob in self._blobs:
+                offsets.append(pos)
+                pos = _align(pos + len(blob))
+            entries = {
+                key: [dict(v, frames=[[offsets[i], n, d] for i, n, d in v["frames"]]) for v in variants]
+                for key, variants in self._entries.items()
+            }
+            index = json.dumps({"version": BUNDLE_VERSION, "byteorder": sys.byteorder,
+                                "entries": entries}, separators=(",", ":")).encode("utf-8")
+            if len(index) == head_len:
+                break
+            head_len = len(index)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(BUNDLE_MAGIC + struct.pack("<I", len(index)) + index)
+            for off, blob in zip(offsets, self._blobs):
+                fh.write(b"\0" * (off - fh.tell()))
+                fh.write(blob)
+            size = fh.tell()
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        return size
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
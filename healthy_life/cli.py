@@ -0,0 +1,161 @@
+"""无界面命令行：给 shell 钩子、定时任务用的快速入口。
+
+    python -m healthy_life log-sip
+    python -m healthy_life log-move
+    python -m healthy_life status
+    python -m healthy_life report [--format txt|json|csv|col] [--out PATH] [--end]
+    python -m healthy_life report --days 30          # 最近 30 天的全部会话（读历史库）
+
+只导入 healthy_life 里不依赖 Qt 的模块；会话状态从事件日志重放得到，
+记录也追加到同一份日志和历史库（在日志锁内）。桌面程序开着时会收下这些记录、
+并入当前会话；没开时下次启动一并恢复。
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from .config import JOURNAL_PATH, Settings
+from .history import KIND_BY_NAME, open_history
+from .journal import EV_END, EV_MOVE, EV_SIP, EventJournal, JournalState, recover
+from .report import WRITERS, Report, fmt_hm
+from .session import ReminderSession
+
+
+def _load(journal_path: Path):
+    state = recover(journal_path)
+    if not state.session_open or state.start_time is None:
+        return state, None
+    sess = ReminderSession()
+    sess.restore(state)
+    return state, sess
+
+
+def _record(journal_path: Path, history_path: Optional[Path], kind: str, when: datetime, **fields) -> None:
+    journal = EventJournal(journal_path)
+    journal.append(kind, when, **fields)
+    journal.close()
+    history = open_history(history_path)
+    history.append(when, KIND_BY_NAME[kind], fields.get("ml", 0))
+    history.close()
+
+
+def _require_active(sess: Optional[ReminderSession]) -> Optional[str]:
+    if sess is None:
+        return "没有进行中的会话 / No session in progress"
+    if sess.paused:
+        return "会话已暂停 / Session is paused"
+    return None
+
+
+def cmd_log_sip(args) -> int:
+    now = datetime.now()
+    _, sess = _load(args.journal)
+    err = _require_active(sess)
+    if err:
+        print(err, file=sys.stderr)
+        return 1
+    sess.log_sip(now)
+    _record(args.journal, args.history, EV_SIP, now, ml=sess.sip_size)
+    print(f"+{sess.sip_size} ml  {sess.water_progress}/{sess.goal} ml")
+    return 0
+
+
+def cmd_log_move(args) -> int:
+    now = datetime.now()
+    _, sess = _load(args.journal)
+    err = _require_active(sess)
+    if err:
+        print(err, file=sys.stderr)
+        return 1
+    sess.log_move(now)
+    _record(args.journal, args.history, EV_MOVE, now)
+    print(f"活动 / Activities: {sess.stats.moves}")
+    return 0
+
+
+def cmd_status(args) -> int:
+    now = datetime.now()
+    _, sess = _load(args.journal)
+    if sess is None:
+        print("没有进行中的会话 / No session in progress")
+        return 0
+    state = "已暂停 / paused" if sess.paused else "进行中 / running"
+    print(f"状态 / State: {state}")
+    print(f"开始时间 / Start: {sess.start_time:%Y-%m-%d %H:%M:%S}")
+    print(f"共计时长 / Duration: {fmt_hm(sess.elapsed_seconds(now))}")
+    print(f"饮水 / Intake: {sess.water_progress}/{sess.goal} ml ({sess.stats.sips} sips)")
+    print(f"活动 / Activities: {sess.stats.moves}")
+    nxt = sess.seconds_until_next(now)
+    if nxt is not None:
+        print(f"下次提醒 / Next reminder in: {fmt_hm(nxt)}")
+    return 0
+
+
+def _history_report(state: JournalState, history_path: Optional[Path], days: int, now: datetime) -> Report:
+    settings = state.settings or {}
+    first = datetime.combine(now.date() - timedelta(days=days - 1), datetime.min.time())
+    history = open_history(history_path)
+    try:
+        rows = list(history.rows(first, now + timedelta(milliseconds=1)))
+    finally:
+        history.close()
+    return Report.from_events(lambda: iter(rows), now,
+                              settings.get("goal", Settings.goal), settings.get("sip_size", Settings.sip_size))
+
+
+def cmd_report(args) -> int:
+    now = datetime.now()
+    state, sess = _load(args.journal)
+    if args.days:
+        if args.end:
+            print("--days 不能与 --end 同时使用 / --days cannot be combined with --end", file=sys.stderr)
+            return 1
+        report = _history_report(state, args.history, args.days, now)
+    elif sess is None:
+        print("没有进行中的会话 / No session in progress", file=sys.stderr)
+        return 1
+    else:
+        report = sess.report(now)
+    writer = WRITERS[args.format]
+    chunks = writer.render(report)
+    if args.out:
+        fh = open(args.out, "wb") if writer.binary else open(args.out, "w", encoding="utf-8", newline="")
+        with fh:
+            for chunk in chunks:
+                fh.write(chunk)
+    else:
+        out = sys.stdout.buffer if writer.binary else sys.stdout
+        for chunk in chunks:
+            out.write(chunk)
+        if args.format == "txt":
+            out.write("\n")
+        out.flush()
+    if args.end:
+        # 只追加一条 end：桌面程序在运行时由它收下并结束会话，日志的压缩也交给它
+        journal = EventJournal(args.journal)
+        journal.append(EV_END, now)
+        journal.close()
+        history = open_history(args.history)
+        history.append(now, KIND_BY_NAME[EV_END])
+        history.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="healthy_life", description="健康生活小助手命令行")
+    parser.add_argument("--journal", type=Path, default=JOURNAL_PATH, help=argparse.SUPPRESS)
+    parser.add_argument("--history", type=Path, help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("log-sip", help="记录一口 / log a sip").set_defaults(func=cmd_log_sip)
+    sub.add_parser("log-move", help="记录活动 / log an activity").set_defaults(func=cmd_log_move)
+    sub.add_parser("status", help="当前会话状态 / session status").set_defaults(func=cmd_status)
+    p = sub.add_parser("report", help="当日报告 / daily report")
+    p.add_argument("--out", help="写入文件而不是打印 / write to file")
+    p.add_argument("--format", choices=sorted(WRITERS), default="txt", help="报告格式 / report format")
+    p.add_argument("--end", action="store_true", help="同时结束会话 / also end the session")
+    p.add_argument("--days", type=int, help="最近 N 天的全部会话（读历史库） / all sessions of the last N days")
+    p.set_defaults(func=cmd_report)
+    args = parser.parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,190 @@
+"""基于单调纳秒时钟的活动计时（不依赖 Qt）。
+
+墙上时间（``datetime.now()``）会被 NTP 校时、夏令时和系统挂起打乱，
+这里改用单调时钟计算“活动时间”，并把检测到的挂起当作一段暂停：
+
+- Linux：``CLOCK_BOOTTIME``（含挂起）与 ``CLOCK_MONOTONIC``（不含挂起）之差
+  就是挂起时长，精确；
+- macOS：``CLOCK_MONOTONIC`` 与 ``CLOCK_UPTIME_RAW`` 同理；
+- 其他平台（Windows）：没有不含挂起的时钟，只能靠心跳——调用方保证至少每
+  ``stall_sec`` 秒调用一次 ``observe()``，两次观测间多出来的部分按挂起处理。
+
+墙上时间只用于给记录打时间戳。
+"""
+import math
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+_NS = 1_000_000_000
+_MIN_SUSPEND_NS = _NS   # 两个时钟读数之间的微小偏差不算挂起
+
+
+def _clock_ids() -> Tuple[Optional[int], Optional[int]]:
+    """返回 (含挂起的时钟, 不含挂起的时钟)；平台不支持时为 None。"""
+    if sys.platform.startswith("linux"):
+        pair = ("CLOCK_BOOTTIME", "CLOCK_MONOTONIC")
+    elif sys.platform == "darwin":
+        pair = ("CLOCK_MONOTONIC", "CLOCK_UPTIME_RAW")
+    else:
+        return None, None
+    if not hasattr(time, "clock_gettime_ns") or not all(hasattr(time, n) for n in pair):
+        return None, None
+    ids = tuple(getattr(time, n) for n in pair)
+    try:
+        for cid in ids:
+            time.clock_gettime_ns(cid)
+    except OSError:
+        return None, None
+    return ids
+
+
+class SystemClock:
+    """真实时钟。``awake_ns()`` 在无法区分挂起的平台上返回 None。"""
+
+    __slots__ = ("_total_id", "_awake_id")
+
+    def __init__(self) -> None:
+        self._total_id, self._awake_id = _clock_ids()
+
+    def now_ns(self) -> int:
+        if self._total_id is None:
+            return time.monotonic_ns()
+        return time.clock_gettime_ns(self._total_id)
+
+    def awake_ns(self) -> Optional[int]:
+        if self._awake_id is None:
+            return None
+        return time.clock_gettime_ns(self._awake_id)
+
+    def wall(self) -> datetime:
+        return datetime.now()
+
+
+class ManualClock:
+    """手动推进的时钟，用于模拟与确定性测试。
+
+    ``advance`` 模拟正常运行，``suspend`` 模拟系统挂起，``jump_wall`` 模拟
+    校时 / 夏令时（只改墙上时间，不影响单调时钟）。
+    ``exact=False`` 时模拟 Windows：没有不含挂起的时钟。
+    """
+
+    __slots__ = ("_now_ns", "_awake", "_wall", "exact")
+
+    def __init__(self, wall: Optional[datetime] = None, exact: bool = True):
+        self._now_ns = 0
+        self._awake = 0
+        self._wall = wall or datetime(2025, 1, 1, 9, 0, 0)
+        self.exact = exact
+
+    def now_ns(self) -> int:
+        return self._now_ns
+
+    def awake_ns(self) -> Optional[int]:
+        return self._awake if self.exact else None
+
+    def wall(self) -> datetime:
+        return self._wall
+
+    def advance(self, sec: float) -> None:
+        ns = math.ceil(sec * _NS)     # 向上取整，推进到截止点时不会差 1 纳秒
+        self._now_ns += ns
+        self._awake += ns
+        self._wall += timedelta(seconds=sec)
+
+    def suspend(self, sec: float) -> None:
+        self._now_ns += int(sec * _NS)
+        self._wall += timedelta(seconds=sec)
+
+    def jump_wall(self, sec: float) -> None:
+        self._wall += timedelta(seconds=sec)
+
+
+class ActiveClock:
+    """一次会话的活动秒数：单调时钟流逝 - 暂停 - 检测到的挂起。"""
+
+    __slots__ = ("clock", "stall_ns", "running", "_base_ns", "_last_ns", "_last_awake",
+                 "_paused_ns", "_paused_at", "suspended_ns", "_unreported_ns")
+
+    def __init__(self, clock=None, stall_sec: float = 120.0):
+        self.clock = clock or SystemClock()
+        self.stall_ns = int(stall_sec * _NS)
+        self.reset()
+
+    def reset(self) -> None:
+        self.running = False
+        self._base_ns = 0
+        self._last_ns: Optional[int] = None
+        self._last_awake: Optional[int] = None
+        self._paused_ns = 0
+        self._paused_at: Optional[int] = None
+        self.suspended_ns = 0
+        self._unreported_ns = 0
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    @property
+    def exact(self) -> bool:
+        """底层时钟能直接量出挂起；否则（Windows）只能靠两次读数的间隔推断，需要心跳。"""
+        return self.clock.awake_ns() is not None
+
+    def start(self, offset_sec: float = 0.0, paused: bool = False) -> None:
+        """从 offset_sec 秒的活动时间开始计时（恢复会话时 offset 为已有时长）。
+
+        ``paused=True`` 时停在 offset_sec，直到 ``resume()`` 才开始走。
+        """
+        self.reset()
+        now = self.clock.now_ns()
+        self._base_ns = now - int(offset_sec * _NS)
+        self._last_ns = now
+        self._last_awake = self.clock.awake_ns()
+        self.running = True
+        if paused:
+            self._paused_at = now
+
+    def pause(self) -> None:
+        if self.running and self._paused_at is None:
+            self.observe()
+            self._paused_at = self._last_ns
+
+    def resume(self) -> None:
+        if self._paused_at is not None:
+            self.observe()
+            self._paused_ns += self._last_ns - self._paused_at
+            self._paused_at = None
+
+    def observe(self) -> None:
+        """读一次时钟；检测到的挂起（暂停中除外）从活动时间里扣除。"""
+        now = self.clock.now_ns()
+        awake = self.clock.awake_ns()
+        gap = 0
+        if self._last_ns is not None:
+            delta = now - self._last_ns
+            if awake is not None and self._last_awake is not None:
+                gap = delta - (awake - self._last_awake)
+                if gap < _MIN_SUSPEND_NS:
+                    gap = 0
+            elif delta > self.stall_ns:
+                gap = delta - self.stall_ns
+        self._last_ns = now
+        self._last_awake = awake
+        if gap and self.running and self._paused_at is None:
+            self.suspended_ns += gap
+            self._unreported_ns += gap
+
+    def take_suspended(self) -> float:
+        """取走尚未上报的挂起秒数（上报后清零），供调用方补记暂停。"""
+        self.observe()
+        ns, self._unreported_ns = self._unreported_ns, 0
+        return ns / _NS
+
+    def active_seconds(self) -> float:
+        if not self.running:
+            return 0.0
+        self.observe()
+        end = self._last_ns if self._paused_at is None else self._paused_at
+        ns = end - self._base_ns - self._paused_ns - self.suspended_ns
+        return max(0.0, ns / _NS)
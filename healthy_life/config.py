@@ -0,0 +1,101 @@
+"""应用配置：数据目录、语言、提醒间隔选项与持久化的设定（不依赖 Qt）。"""
+import json
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .persist import WriteBehind
+
+APP_NAME = "健康生活小助手"
+APP_DIR = Path(os.getenv("APPDATA", Path.home())) / "HealthyLifeAssistant"
+SETTINGS_PATH = APP_DIR / "settings.json"
+JOURNAL_PATH = APP_DIR / "journal.jsonl"
+HISTORY_DIR = APP_DIR / "history"
+HISTORY_DB_PATH = APP_DIR / "history.sqlite3"
+# 历史库后端："columns"（默认，按天分区的列式文件）或 "sqlite"（可按日期区间查询）
+HISTORY_BACKEND = os.getenv("HEALTHY_LIFE_HISTORY", "columns")
+STARTUP_PROFILE_PATH = APP_DIR / "startup_profile.json"
+METRICS_PROM_PATH = APP_DIR / "metrics.prom"
+METRICS_JSON_PATH = APP_DIR / "metrics.json"
+# “下班”时写出的报告格式（见 healthy_life.report.WRITERS）；txt 会被打开给用户看
+REPORT_FORMATS = ("txt", "json")
+
+# 预缩放资源包（tools/build_assets.py 生成，与程序放在一起）；其中的变体见 bundle.ASSET_VARIANTS
+ASSET_BUNDLE_NAME = "assets.hlpack"
+
+LANG_EN, LANG_ZH = "EN", "ZH"
+
+# 新增：喝水提醒间隔（秒），含 10s/20s 测试选项
+HYDRATE_INTERVALS_SEC = {
+    LANG_EN: [
+        (10,  "10 s (test)"), 
+        (30 * 60, "30 Min"),
+        (60 * 60, "1 Hour"),
+        (90 * 60, "1.5 Hour"),
+        (120*60,  "2 Hours"),
+    ],
+    LANG_ZH: [
+        (10,  "10 秒（测试）"),
+        (30 * 60, "30分钟"),
+        (60 * 60, "1小时"),
+        (90 * 60, "1.5 小时"),
+        (120*60,  "2 小时"),
+    ],
+}
+
+# 新增：久坐提醒间隔（秒），含 10s/20s 测试选项
+SED_INTERVALS_SEC = {
+    LANG_EN: [
+        (10,      "10 s (test)"),
+        (45 * 60, "45 Min"),
+        (60 * 60, "1 Hour"),
+        (75 * 60, "1 Hour 15 Min"),
+        (90 * 60, "1 Hour 30 Min"),
+    ],
+    LANG_ZH: [
+        (10,      "10 秒（测试）"),
+        (45 * 60, "45分钟"),
+        (60 * 60, "1小时"),
+        (75 * 60, "1小时15分"),
+        (90 * 60, "1小时30分"),
+    ],
+}
+
+
+_SAVE_MS = None     # 首次同步保存时注册；命令行只读配置，不必导入 metrics / persist
+
+
+@dataclass
+class Settings:
+    goal: int = 1700
+    sip_size: int = 250
+    interval_min: int = 60
+    water_progress: int = 0
+    last_reset: str = str(datetime.now().date())
+    language: str = LANG_ZH
+
+    @staticmethod
+    def load(writer: Optional["WriteBehind"] = None) -> "Settings":
+        APP_DIR.mkdir(parents=True, exist_ok=True)
+        s = Settings()      # 保持“每次启动即默认”的行为
+        s.save(writer)
+        return s
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, indent=2)
+
+    def save(self, writer: Optional["WriteBehind"] = None) -> None:
+        """原子写入 settings.json；给了 writer 时只登记内容，由后台线程合并写出。"""
+        if writer is not None:
+            writer.submit(self.to_json())
+            return
+        from .metrics import METRICS
+        from .persist import write_atomic
+        global _SAVE_MS
+        if _SAVE_MS is None:
+            _SAVE_MS = METRICS.histogram("hla_settings_save_ms", "Settings.save latency (ms)")
+        with METRICS.timer(_SAVE_MS):
+            write_atomic(SETTINGS_PATH, self.to_json())
@@ -0,0 +1,116 @@
+"""紧凑的会话事件缓冲：三列定长数组代替一串 ``datetime`` 对象。
+
+每条事件只占 13 字节（int64 毫秒时间戳 + uint8 类型 + int32 数值），
+而一个 ``datetime`` 加上列表槽位要 60 字节以上；传感器整天逐口记录时
+内存基本持平。列格式与历史库（history）相同，NumPy 可以直接
+``np.frombuffer`` 零拷贝读取。
+
+按下标或迭代取出的是 :class:`Event`——带 ``__slots__`` 的小记录，只在读取时创建。
+"""
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from typing import Iterable, Iterator, Tuple, Union
+
+Row = Tuple[int, int, int]      # (epoch 毫秒, KIND_*, 数值)
+
+
+def to_ms(when: datetime) -> int:
+    return int(when.timestamp() * 1000)
+
+
+class Event:
+    __slots__ = ("ts_ms", "kind", "amount")
+
+    def __init__(self, ts_ms: int, kind: int, amount: int = 0):
+        self.ts_ms = ts_ms
+        self.kind = kind
+        self.amount = amount
+
+    @property
+    def when(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ms / 1000)
+
+    def __repr__(self) -> str:
+        return f"Event({self.ts_ms}, {self.kind}, {self.amount})"
+
+
+class EventBuffer:
+    """只追加的事件列；调用方保证按时间顺序追加。"""
+
+    __slots__ = ("ts", "kind", "amount")
+
+    def __init__(self, rows: Iterable[Row] = ()):
+        self.ts = array("q")
+        self.kind = array("B")
+        self.amount = array("i")
+        for row in rows:
+            self.append_ms(*row)
+
+    def append(self, when: datetime, kind: int, amount: int = 0) -> None:
+        self.append_ms(to_ms(when), kind, amount)
+
+    def append_ms(self, ts_ms: int, kind: int, amount: int = 0) -> None:
+        self.ts.append(ts_ms)
+        self.kind.append(kind)
+        self.amount.append(amount)
+
+    def insert(self, when: datetime, kind: int, amount: int = 0) -> int:
+        """按时间插入（同一时刻排在已有事件之后），返回下标；补入迟到的记录用。"""
+        ts_ms = to_ms(when)
+        i = bisect_right(self.ts, ts_ms)
+        self.ts.insert(i, ts_ms)
+        self.kind.insert(i, kind)
+        self.amount.insert(i, amount)
+        return i
+
+    def clear(self) -> None:
+        """就地清空，之后可以继续追加；持有 ``np.frombuffer`` 视图时不能调用（array 会拒绝改变大小）。"""
+        del self.ts[:]
+        del self.kind[:]
+        del self.amount[:]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, i: int) -> Event:
+        return Event(self.ts[i], self.kind[i], self.amount[i])
+
+    def __iter__(self) -> Iterator[Event]:
+        return (Event(*row) for row in self.rows())
+
+    def rows(self) -> Iterator[Row]:
+        """按时间顺序的 (ts_ms, kind, amount) 元组，不创建记录对象。"""
+        return zip(self.ts, self.kind, self.amount)
+
+    def times(self, kind: int) -> Iterator[datetime]:
+        """某一类事件的时间（``datetime``），按需转换。"""
+        return (datetime.fromtimestamp(ts / 1000) for ts, k in zip(self.ts, self.kind) if k == kind)
+
+    def count(self, kind: int) -> int:
+        return self.kind.count(kind)
+
+    def copy(self) -> "EventBuffer":
+        twin = EventBuffer()
+        twin.ts = array("q", self.ts)
+        twin.kind = array("B", self.kind)
+        twin.amount = array("i", self.amount)
+        return twin
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.itemsize * len(col) for col in (self.ts, self.kind, self.amount))
+
+    # ---------- 快照 ----------
+    def to_json(self) -> list:
+        """日志快照里的列式表示 ``[[ts...], [kind...], [amount...]]``。"""
+        return [self.ts.tolist(), self.kind.tolist(), self.amount.tolist()]
+
+    @staticmethod
+    def from_json(cols: Union[list, tuple]) -> "EventBuffer":
+        buf = EventBuffer()
+        if cols:
+            buf.ts.extend(cols[0])
+            buf.kind.extend(cols[1])
+            buf.amount.extend(cols[2])
+        return buf
@@ -0,0 +1,130 @@
+"""报告导出的后台线程池：生成与写文件都不占用界面线程。
+
+调用方在界面线程上准备好渲染函数（只读取快照，不碰正在变化的会话），
+:meth:`ReportExporter.submit` 把它交给线程池；渲染函数逐块产出文本，
+每块之间检查取消标志，写完后原子地替换目标文件（``binary=True`` 时块是 bytes）。
+完成、失败或取消时回调 ``on_done(job)``——回调在工作线程里执行，桌面端用 Qt 信号转回界面线程。
+
+目标文件名通常由 :func:`~healthy_life.report.report_path` 以空文件预先占好（``reserved=True``），
+导出失败或被取消时这个空文件随之删除。
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+
+from .metrics import METRICS
+
+_M_EXPORT_MS = METRICS.histogram("hla_report_export_ms", "Report render + write time (ms)")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportJob:
+    """一次导出；``future.result()`` 是写好的路径。"""
+
+    __slots__ = ("path", "reserved", "future", "_cancel")
+
+    def __init__(self, path: Path, reserved: bool = False):
+        self.path = Path(path)
+        self.reserved = reserved        # path 是预先占好的空文件，没写成时要删掉
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """请求取消：还没开始的直接取消，正在写的在下一块之前停下并删掉临时文件。"""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """失败时的异常；成功或取消时为 None。"""
+        if self.future is None or not self.future.done() or self.future.cancelled():
+            return None
+        exc = self.future.exception()
+        return None if isinstance(exc, ExportCancelled) else exc
+
+
+class ReportExporter:
+    def __init__(self, max_workers: int = 2,
+                 on_done: Optional[Callable[[ExportJob], None]] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-export")
+        self._on_done = on_done
+        self._lock = threading.Lock()
+        self._active: List[ExportJob] = []
+
+    def submit(self, path: Path, render: Callable[[], Iterable[Union[str, bytes]]],
+               binary: bool = False, reserved: bool = False) -> ExportJob:
+        job = ExportJob(path, reserved)
+        with self._lock:
+            self._active.append(job)
+        job.future = self._pool.submit(self._run, job, render, binary)
+        job.future.add_done_callback(lambda _f: self._finished(job))
+        return job
+
+    def active(self) -> List[ExportJob]:
+        with self._lock:
+            return list(self._active)
+
+    def cancel_all(self) -> None:
+        for job in self.active():
+            job.cancel()
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """退出时：默认等排队和正在进行的导出写完（报告是用户数据，不主动丢弃）。
+
+        给了 ``timeout`` 时最多等这么久，剩下的取消；``wait=False`` 时全部取消、不等。
+        """
+        if wait and timeout is not None:
+            _, late = wait_futures([job.future for job in self.active() if job.future is not None], timeout)
+            if late:
+                self.cancel_all()
+        elif not wait:
+            self.cancel_all()
+        self._pool.shutdown(wait=wait)
+
+    # ---------- 工作线程 ----------
+    def _run(self, job: ExportJob, render: Callable[[], Iterable[Union[str, bytes]]],
+             binary: bool) -> Path:
+        with METRICS.timer(_M_EXPORT_MS):
+            job.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = job.path.with_name(f"{job.path.name}.{threading.get_ident()}.tmp")
+            try:
+                fh = open(tmp, "wb") if binary else open(tmp, "w", encoding="utf-8", newline="")
+                with fh:
+                    for chunk in render():
+                        if job.cancelled:
+                            raise ExportCancelled(str(job.path))
+                        fh.write(chunk)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                if job.cancelled:
+                    raise ExportCancelled(str(job.path))
+                os.replace(tmp, job.path)
+            except BaseException:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+        return job.path
+
+    def _finished(self, job: ExportJob) -> None:
+        with self._lock:
+            if job in self._active:
+                self._active.remove(job)
+        if job.reserved and (job.future.cancelled() or job.future.exception() is not None):
+            try:
+                os.remove(job.path)
+            except OSError:
+                pass
+        if self._on_done is not None:
+            self._on_done(job)
@@ -0,0 +1,200 @@
+"""按天分区的列式历史事件库，读取时直接内存映射，不做任何解析。
+
+目录结构（每天一个分区，三列等长，小端序定长）::
+
+    history/2025-11-12/ts.i64       事件时间，epoch 毫秒（int64）
+    history/2025-11-12/kind.u8      事件类型（KIND_*，uint8）
+    history/2025-11-12/amount.i32   附带数值，例如一口的毫升数（int32）
+
+写入只在文件末尾追加，不 fsync（事件日志才是权威记录）。分区内按时间有序：另一个进程
+（命令行即时写，桌面端攒一批再写）先写入了更晚的行时，flush 把这段尾巴与新行合并后重写，
+整个过程在 ``ts.i64.lock`` 这把跨进程锁里。flush 在写第一列与最后一列之间崩溃时，
+三列长度会不一致：读取按最短列截断，下一次 flush 先把三列截到相同行数再追加，
+丢的只是写了一半的那一批，之后的行不会错位。
+读取依赖 NumPy（可选依赖，只在读取时导入）。另有可按日期区间查询的 SQLite
+后端（:mod:`healthy_life.sqlhistory`），由 :func:`open_history` 按配置选择。
+"""
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .persist import file_lock
+
+KIND_START = 1
+KIND_END = 2
+KIND_SIP = 3
+KIND_MOVE = 4
+KIND_PAUSE = 5
+KIND_RESUME = 6
+
+# 与事件日志（journal）里的记录名一一对应
+KIND_BY_NAME = {
+    "start": KIND_START, "end": KIND_END, "sip": KIND_SIP,
+    "move": KIND_MOVE, "pause": KIND_PAUSE, "resume": KIND_RESUME,
+}
+
+_COLUMNS = (("ts.i64", "q", "<i8"), ("kind.u8", "B", "u1"), ("amount.i32", "i", "<i4"))
+
+
+class DayColumns(NamedTuple):
+    ts: "np.ndarray"        # int64 epoch 毫秒
+    kind: "np.ndarray"      # uint8
+    amount: "np.ndarray"    # int32
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:   # pragma: no cover - 取决于运行环境
+        raise ImportError("读取历史记录需要 NumPy：pip install numpy") from exc
+    return numpy
+
+
+def _ts_at(fh, i: int) -> int:
+    fh.seek(i * 8)
+    return int.from_bytes(fh.read(8), "little", signed=True)
+
+
+def _rows_upto(fh, rows: int, ts: int) -> int:
+    """已写入的（有序的）ts 列前 ``rows`` 行里 <= ts 的行数；通常只读最后一行。"""
+    if rows == 0 or _ts_at(fh, rows - 1) <= ts:
+        return rows
+    lo, hi = 0, rows - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _ts_at(fh, mid) <= ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _write_day(part: Path, cols: Tuple[array, array, array]) -> None:
+    files = [open(part / name, "a+b") for name, _, _ in _COLUMNS]
+    try:
+        # 上次 flush 写了一半时各列行数不同：先截到共同的行数，新行才能对齐
+        sizes = [fh.seek(0, 2) for fh in files]
+        rows = min(size // col.itemsize for size, col in zip(sizes, cols))
+        # 分区须按时间有序（load_range 二分切片），而别的进程可能已写入比这批更晚的行
+        # （命令行即时写，桌面端攒约 2 秒）：把那段尾巴读出来与这批合并后重写
+        keep = _rows_upto(files[0], rows, min(cols[0]))
+        ordered = all(a <= b for a, b in zip(cols[0], cols[0][1:]))
+        if keep < rows or not ordered:
+            tail = []
+            for fh, col in zip(files, cols):
+                fh.seek(keep * col.itemsize)
+                old = array(col.typecode, fh.read((rows - keep) * col.itemsize))
+                if sys.byteorder != "little":
+                    old.byteswap()
+                tail.append(old)
+            # 稳定排序：同一毫秒里已落盘的行在前
+            merged = sorted([*zip(*tail), *zip(*cols)], key=itemgetter(0))
+            cols = tuple(array(col.typecode, c) for col, c in zip(cols, zip(*merged)))
+        for fh, col, size in zip(files, cols, sizes):
+            if size != keep * col.itemsize:
+                fh.truncate(keep * col.itemsize)
+        for fh, col in zip(files, cols):
+            if sys.byteorder != "little":
+                col.byteswap()
+            col.tofile(fh)
+    finally:
+        for fh in files:
+            fh.close()
+
+
+class HistoryStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # 尚未落盘的缓冲：day -> (ts, kind, amount)
+        self._pending: Dict[date, Tuple[array, array, array]] = {}
+
+    # ---------- 写入 ----------
+    def append(self, when: datetime, kind: int, amount: int = 0) -> None:
+        cols = self._pending.get(when.date())
+        if cols is None:
+            cols = self._pending[when.date()] = (array("q"), array("B"), array("i"))
+        cols[0].append(int(when.timestamp() * 1000))
+        cols[1].append(kind)
+        cols[2].append(amount)
+
+    def flush(self) -> None:
+        for day, cols in self._pending.items():
+            part = self._partition(day)
+            part.mkdir(parents=True, exist_ok=True)
+            # 命令行与桌面端可能同时写同一天：截断、合并都在锁里进行
+            with file_lock(part / _COLUMNS[0][0]):
+                _write_day(part, cols)
+        self._pending.clear()
+
+    close = flush
+
+    # ---------- 读取 ----------
+    def _partition(self, day: date) -> Path:
+        return self.root / day.isoformat()
+
+    def days(self) -> List[date]:
+        if not self.root.is_dir():
+            return []
+        out = []
+        for p in self.root.iterdir():
+            try:
+                out.append(date.fromisoformat(p.name))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    def load_day(self, day: date) -> Optional[DayColumns]:
+        """内存映射一天的三列；该天没有记录时返回 None。"""
+        np = _numpy()
+        part = self._partition(day)
+        paths = [part / name for name, _, _ in _COLUMNS]
+        if not all(p.is_file() for p in paths):
+            return None
+        sizes = [p.stat().st_size // np.dtype(dt).itemsize for p, (_, _, dt) in zip(paths, _COLUMNS)]
+        n = min(sizes)
+        if n == 0:
+            return None
+        return DayColumns(*(
+            np.memmap(p, dtype=dt, mode="r", shape=(n,)) for p, (_, _, dt) in zip(paths, _COLUMNS)
+        ))
+
+    def load_range(self, start: datetime, end: datetime) -> DayColumns:
+        """取 [start, end) 内的全部事件，按时间顺序拼成一组数组。"""
+        np = _numpy()
+        lo, hi = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+        parts: List[DayColumns] = []
+        day = start.date()
+        while day <= end.date():
+            cols = self.load_day(day)
+            if cols is not None:
+                # 分区内按时间有序（flush 保证），二分切片即可
+                i, j = np.searchsorted(cols.ts, [lo, hi])
+                if j > i:
+                    parts.append(DayColumns(cols.ts[i:j], cols.kind[i:j], cols.amount[i:j]))
+            day += timedelta(days=1)
+        if not parts:
+            return DayColumns(np.empty(0, "<i8"), np.empty(0, "u1"), np.empty(0, "<i4"))
+        return DayColumns(*(np.concatenate(col) for col in zip(*parts)))
+
+    def rows(self, start: datetime, end: datetime) -> Iterator[Tuple[int, int, int]]:
+        """[start, end) 内的事件 (ts_ms, kind, amount)，按时间顺序。"""
+        cols = self.load_range(start, end)
+        return zip(cols.ts.tolist(), cols.kind.tolist(), cols.amount.tolist())
+
+
+def open_history(path: Optional[Path] = None, backend: Optional[str] = None):
+    """按配置打开历史库：列式目录（HistoryStore）或 SQLite（SqliteHistory）。
+
+    ``path`` 省略时用配置里对应后端的默认位置。
+    """
+    from .config import HISTORY_BACKEND, HISTORY_DB_PATH, HISTORY_DIR
+    backend = backend or HISTORY_BACKEND
+    if backend == "sqlite":
+        from .sqlhistory import SqliteHistory
+        return SqliteHistory(path or HISTORY_DB_PATH)
+    if backend != "columns":
+        raise ValueError(f"未知的历史库后端: {backend}")
+    return HistoryStore(path or HISTORY_DIR)
@@ -0,0 +1,100 @@
+"""界面与报告用到的中英文文案。"""
+from .config import LANG_EN, LANG_ZH
+
+TRANSLATIONS = {
+    LANG_EN: {
+        "app_name": "Healthy Life Assistant — Hydration & Anti-sedentary",
+        "title": "Health Reminder",
+        "reco_title": "Daily Water Intake Recommendation",
+        "reco_text": (
+            "In general conditions, the Chinese Dietary Guidelines (2022) suggest "
+            "about <b>1700 ml</b> per day for adult men and <b>1500 ml</b> for adult women. "
+            'See details: <a href="http://dg.cnsoc.org/article/04/wDCyy7cWSJCN6pwKHOo5Dw.html">Chinese Dietary Guidelines (2022)</a>'
+        ),
+        "sed_title": "Why Break Up Sitting",
+        "sed_text": (
+            "<ul>"
+            "<li><b>Vascular/Cardio</b>: Standing up every 60 min can improve endothelial function and lower CVD risk.</li>"
+            "<li><b>Spine/Muscles</b>: Brief hourly movement reduces neck and low-back discomfort.</li>"
+            "<li><b>Metabolism</b>: ~6 min of light activity each hour helps lower post-meal glucose and insulin.</li>"
+            "</ul>"
+        ),
+        "settings_title": "Health Settings",
+        "settings_hint": (
+            "Enter your daily water goal and sip size, choose the break interval, then click “Start”. "
+            "Closing the window hides it to the tray; to fully exit, right-click the tray icon and choose “Quit”."
+        ),
+        "progress_section": "Progress",
+        "water_goal": "Daily Water Goal (ml)",
+        "sip_size": "Sip Size (ml)",
+        "water_interval": "💧Hydration Reminder Interval",
+        "interval": "🪑Sedentary Break Interval",
+        "start": "Start", "pause": "Pause", "resume": "Resume", "log_sip": "Log Sip",
+        "hydrate_time": "Hydration Time!", "move_break": "Move Break!",
+        "progress": "You've drank {}/{} ml",
+        "log_move": "Log Activity",
+        "move_msg": "Stand up and stretch — good for blood flow and spine!",
+        "language": "Language", "show": "Show", "quit": "Quit",
+        "started": "Reminders started.", "paused": "Reminders paused.", "resumed": "Reminders resumed.",
+        "goal_done": "Goal Achieved!", "reset_title": "Reset", "reset_msg": "Defaults applied.",
+        "tray_tooltip": "Health Reminder",
+        "elapsed_desc": "Elapsed Time",
+        "water_log_desc": "Water Log",
+        "activity_log_desc": "Activity Log",
+        "activity_count_fmt": "x{}",  # 显示为 x1, x2...
+        "finish_day": "End Day",
+        "report_title": "Daily Health Report",
+        "report_saved": "Report saved to:\n{}",
+        "logged_sip": "Hydration logged.",
+        "logged_move": "Activity logged.",
+        "welcome_title": "Welcome",
+        "welcome_msg": "Welcome to Healthy Life Assistant.",
+    },
+    LANG_ZH: {
+        "app_name": "健康生活小助手：提醒喝水·避免久坐",
+        "title": "健康生活小助手",
+        "reco_title": "每日足量饮水 & 避免久坐",
+        "reco_text": (
+            '<a href="http://dg.cnsoc.org/article/04/wDCyy7cWSJCN6pwKHOo5Dw.html">中国居民膳食指南（2022）</a>建议一般情况下，'
+            "成年男性每天应饮水约<b>1700毫升</b>，成年女性每天应饮水约<b>1500毫升</b>。久坐对健康有害，<b>心血管</b>：长时间久坐与更高的心血管事件和全因死亡风险相关。<b>腰痛/颈痛</b>：尽量“多动少坐”可以减轻颈背/腰背僵硬与不适。<b>代谢</b>：打断久坐（例如每30-60分钟活动1–2分钟），能显著降低餐后血糖等代谢指标。"
+            "健康的饮水频率应以<b>少量多次</b>为原则。"
+        ),
+        "settings_title": "健康设定",
+        "settings_hint": (
+            "<ul>"
+            "<li><b>个人健康设定</b>：根据水杯容量设置「每次饮水量」，再设置「每日饮水目标」[饮水间隔]和[久坐提醒间隔]。</li>"
+            "<li><b>点击“开始”</b>：开始计时会<b>锁定设置</b>；<u>若需修改请点“重置”</u>；离开可点“暂停”，返回后点“继续”。关闭窗口会隐藏到托盘；右键托盘可 显示/暂停/记录一口/记录活动/退出。</li>"
+            "<li><b>结束/下班</b>：点击后生成当日健康报告，可保存本地。</li>"
+            "</ul>"
+        ),
+        "progress_section": "进度",
+        "water_goal": "每日饮水目标 (ml)",
+        "sip_size": "每次饮水量 (ml)",
+        "water_interval": "💧喝水提醒间隔",
+        "interval": "🪑久坐提醒间隔",
+        "start": "开始", "pause": "暂停", "resume": "继续", "log_sip": "记录一杯",
+        "hydrate_time": "喝水时间！", "move_break": "动一动！",
+        "progress": "已饮 {}/{} ml",
+        "log_move": "记录活动",
+        "move_msg": "来活动活动！",
+        "language": "语言", "show": "显示主界面", "quit": "退出",
+        "started": "提醒已启动。", "paused": "提醒已暂停。", "resumed": "提醒已继续。",
+        "goal_done": "目标达成！", "reset_title": "重置", "reset_msg": "欢迎使用健康小助手，默认设置已应用。",
+        "tray_tooltip": "健康提醒",
+        "elapsed_desc": "已运行时间",
+        "water_log_desc": "饮水记录",
+        "activity_log_desc": "活动记录",
+        "activity_count_fmt": "{} 次",  # 显示为 1 次, 2 次...
+        "finish_day": "结束/下班",
+        "report_title": "当日健康活动报告",
+        "report_saved": "报告已保存到：\n{}",
+        "logged_sip": "饮水已记录。",
+        "logged_move": "活动已记录。",
+        "welcome_title": "欢迎使用",
+        "welcome_msg": "欢迎使用健康小助手",
+    },
+}
+
+
+def t(lang: str, key: str) -> str:
+    return TRANSLATIONS.get(lang, TRANSLATIONS[LANG_EN]).get(key, key)
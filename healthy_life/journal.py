@@ -0,0 +1,262 @@
+"""只追加的事件日志：每次记录一口 / 活动只追加一行，而不是重写整个 settings.json。
+
+每行是一条紧凑的 JSON 记录，例如 ``{"e":"sip","t":1731400000.123,"ml":250}``：
+
+- ``start`` / ``end``：一次会话的开始与结束（重置、下班）
+- ``sip`` / ``move``：记录一口 / 记录活动
+- ``pause`` / ``resume``：暂停与继续
+- ``ckpt``：设定与会话状态的完整快照，压缩后文件只剩这一行
+
+写入先进入缓冲区，凑够一批（或由调用方定时）再 flush + fsync，
+崩溃时最多丢失最后一批；末尾被截断的半行在恢复时会被忽略。
+
+桌面程序和命令行可能同时写同一份日志：写入、压缩与重放都在 ``<日志>.lock``
+这把跨进程锁里进行。桌面端每次落盘前先读走别的进程追加的记录（``on_foreign``），
+并入内存中的会话，再写自己的记录或快照，压缩时不会丢掉命令行记下的一口 / 活动。
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .events import EventBuffer
+from .history import KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP
+from .persist import file_lock
+
+EV_START = "start"
+EV_END = "end"
+EV_SIP = "sip"
+EV_MOVE = "move"
+EV_PAUSE = "pause"
+EV_RESUME = "resume"
+EV_CKPT = "ckpt"
+
+
+def _ts(dt: datetime) -> float:
+    return round(dt.timestamp(), 3)
+
+
+def _dt(ts: Optional[float]) -> Optional[datetime]:
+    return None if ts is None else datetime.fromtimestamp(ts)
+
+
+@dataclass
+class JournalState:
+    """从日志重建出来的设定与会话状态。"""
+    settings: Dict[str, Any] = field(default_factory=dict)
+    session_open: bool = False
+    start_time: Optional[datetime] = None
+    water_interval_sec: Optional[int] = None
+    sedentary_interval_sec: Optional[int] = None
+    water_progress: int = 0
+    events: EventBuffer = field(default_factory=EventBuffer)   # 一口 / 活动 / 暂停 / 继续
+    paused_accum: float = 0.0
+    paused_at: Optional[datetime] = None
+    last_event: Optional[datetime] = None   # 最后一条记录的时间，近似为进程退出时刻
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        snap: Dict[str, Any] = {"settings": dict(self.settings), "session": None}
+        if self.session_open and self.start_time is not None:
+            snap["session"] = {
+                "start": _ts(self.start_time),
+                "wi": self.water_interval_sec,
+                "si": self.sedentary_interval_sec,
+                "ml": self.water_progress,
+                "ev": self.events.to_json(),
+                "paused_accum": round(self.paused_accum, 3),
+                "paused_at": _ts(self.paused_at) if self.paused_at else None,
+            }
+        return snap
+
+    @staticmethod
+    def from_snapshot(snap: Dict[str, Any]) -> "JournalState":
+        state = JournalState(settings=dict(snap.get("settings") or {}))
+        sess = snap.get("session")
+        if sess:
+            state.session_open = True
+            state.start_time = _dt(sess["start"])
+            state.water_interval_sec = sess.get("wi")
+            state.sedentary_interval_sec = sess.get("si")
+            state.water_progress = int(sess.get("ml", 0))
+            state.events = EventBuffer.from_json(sess.get("ev"))
+            state.paused_accum = float(sess.get("paused_accum", 0.0))
+            state.paused_at = _dt(sess.get("paused_at"))
+        return state
+
+    def apply(self, rec: Dict[str, Any]) -> None:
+        kind = rec.get("e")
+        when = _dt(rec.get("t"))
+        if kind == EV_CKPT:
+            snap = JournalState.from_snapshot(rec.get("s") or {})
+            self.__dict__.update(snap.__dict__)
+        elif kind == EV_START:
+            for key in ("goal", "sip_size", "interval_min"):
+                if key in rec:
+                    self.settings[key] = rec[key]
+            self.session_open = True
+            self.start_time = when
+            self.water_interval_sec = rec.get("wi")
+            self.sedentary_interval_sec = rec.get("si")
+            self.water_progress = 0
+            self.events.clear()        # 缓冲归这个状态独有：回放多场会话时复用同一组数组
+            self.paused_accum = 0.0
+            self.paused_at = None
+        elif not self.session_open:
+            pass   # 会话之外的零散记录没有意义
+        elif kind == EV_SIP:
+            ml = int(rec.get("ml", 0))
+            self.water_progress += ml
+            self.events.append(when, KIND_SIP, ml)
+        elif kind == EV_MOVE:
+            self.events.append(when, KIND_MOVE)
+        elif kind == EV_PAUSE:
+            self.paused_at = when
+            self.events.append(when, KIND_PAUSE)
+        elif kind == EV_RESUME:
+            if self.paused_at is not None and when is not None:
+                self.paused_accum += (when - self.paused_at).total_seconds()
+            self.paused_at = None
+            self.events.append(when, KIND_RESUME)
+        elif kind == EV_END:
+            self.__dict__.update(JournalState(settings=self.settings).__dict__)
+        if when is not None:
+            self.last_event = when
+
+
+class EventJournal:
+    """追加写 + 批量 fsync 的事件日志文件。
+
+    ``on_foreign``：落盘前读到的、由其他进程（命令行）追加的记录，按文件顺序传给它。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 32,
+        checkpoint_every: int = 512,
+        snapshot: Optional[Callable[[], Dict[str, Any]]] = None,
+        on_foreign: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.snapshot = snapshot            # 提供 ckpt 内容的回调（JournalState.to_snapshot 的结果）
+        self.on_foreign = on_foreign
+        self.since_checkpoint = 0
+        self._lines: List[str] = []         # 尚未写入文件的记录
+        self._end: Optional[int] = None     # 已读到 / 写到的文件末尾；之后的内容来自其他进程
+
+    @property
+    def pending(self) -> int:
+        """尚未写入并 fsync 的记录数。"""
+        return len(self._lines)
+
+    def append(self, kind: str, when: Optional[datetime] = None, **fields: Any) -> None:
+        rec = {"e": kind, "t": _ts(when or datetime.now())}
+        rec.update(fields)
+        self._lines.append(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.since_checkpoint += 1
+        if len(self._lines) >= self.batch_size:
+            self.sync()
+        if self.snapshot is not None and self.since_checkpoint >= self.checkpoint_every:
+            self.compact()
+
+    def sync(self) -> None:
+        """先收下其他进程追加的记录，再把缓冲区写入磁盘并 fsync。"""
+        if not self._lines and self.on_foreign is None:
+            return
+        with file_lock(self.path):
+            self._absorb()
+            self._write()
+
+    def compact(self, snapshot: Optional[Dict[str, Any]] = None) -> None:
+        """用一条 ckpt 快照原子地替换整个日志（写临时文件再 rename）。
+
+        ``snapshot`` 缺省时取 ``self.snapshot()``——在收下其他进程的记录之后才调用，
+        快照里因此包含它们。
+        """
+        with file_lock(self.path):
+            self._absorb()
+            self._write()
+            if snapshot is None:
+                snapshot = self.snapshot() if self.snapshot is not None else {}
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            rec = {"e": EV_CKPT, "t": _ts(datetime.now()), "s": snapshot}
+            with open(tmp, "wb") as fh:
+                fh.write((json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+                fh.flush()
+                os.fsync(fh.fileno())
+                size = fh.tell()
+            os.replace(tmp, self.path)
+            self._end = size
+        self.since_checkpoint = 0
+
+    def recover(self) -> JournalState:
+        """在锁内重放整个日志；之后其他进程追加的记录会交给 ``on_foreign``。"""
+        with file_lock(self.path):
+            state, self._end = _replay(self.path)
+        return state
+
+    def close(self) -> None:
+        self.sync()
+
+    # ---------- 以下都在锁内调用 ----------
+    def _absorb(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if self._end is None or size < self._end:
+            self._end = size        # 第一次打开（没有先 recover）：已有内容视为已读
+            return
+        if size == self._end or self.on_foreign is None:
+            self._end = size
+            return
+        with open(self.path, "rb") as fh:
+            fh.seek(self._end)
+            data = fh.read(size - self._end)
+        data = data[:data.rfind(b"\n") + 1]      # 只要完整的行
+        self._end += len(data)
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        if records:
+            self.on_foreign(records)
+
+    def _write(self) -> None:
+        if not self._lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as fh:
+            fh.write("".join(self._lines).encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+            self._end = fh.tell()
+        self._lines.clear()
+
+
+def _replay(path: Path) -> Tuple[JournalState, int]:
+    state = JournalState()
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return state, 0
+    with fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break   # 崩溃时写了一半的末行
+            state.apply(rec)
+        return state, fh.seek(0, os.SEEK_END)
+
+
+def recover(path: Path) -> JournalState:
+    """按顺序重放日志，重建设定、饮水进度与时间戳列表。"""
+    with file_lock(path):
+        return _replay(path)[0]
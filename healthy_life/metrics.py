@@ -0,0 +1,213 @@
+"""轻量的运行指标：计数器、仪表、直方图与计时器，可导出 Prometheus 文本或 JSON。
+
+默认关闭；设置环境变量 ``HEALTHY_LIFE_METRICS=1`` 后启用。关闭时
+``METRICS`` 返回共享的空操作对象，热点路径上只多一次空方法调用。
+
+    from healthy_life.metrics import METRICS
+    SAVE_MS = METRICS.histogram("hla_settings_save_ms", "Settings.save 耗时")
+    with METRICS.timer(SAVE_MS):
+        ...
+
+导出文件由调用方定期写出（桌面端写到 APP_DIR 下），本地采集代理直接读取。
+"""
+import bisect
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 以毫秒计的默认分桶，覆盖从亚毫秒的界面刷新到秒级的卡顿
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    __slots__ = ("value",)
+    kind = "counter"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, n: float = 1) -> None:
+        self.value += n
+
+
+class Gauge:
+    """当前值；也可以给一个回调，导出时再取值（例如存活的 QMovie 数）。"""
+
+    __slots__ = ("value", "_fn")
+    kind = "gauge"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def read(self) -> float:
+        return float(self._fn()) if self._fn is not None else self.value
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+    kind = "histogram"
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)    # 最后一格是 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: Histogram):
+        self._hist = hist
+
+    def __enter__(self) -> "_Timer":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._hist.observe((time.perf_counter() - self._t0) * 1000)
+
+
+class _Noop:
+    """关闭时的替身：所有指标方法都什么也不做。"""
+
+    __slots__ = ()
+    value = 0.0
+
+    def inc(self, n: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def set_function(self, fn) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def __enter__(self) -> "_Noop":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP = _Noop()
+
+
+def _fmt_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_num(v: float) -> str:
+    return repr(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class Registry:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: Dict[Tuple[str, Labels], object] = {}
+        self._help: Dict[str, str] = {}
+
+    def _get(self, factory, name: str, help: str, labels: Dict[str, str]):
+        if not self.enabled:
+            return _NOOP
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = factory()
+            self._help.setdefault(name, help)
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "",
+                  buckets: Sequence[float] = DEFAULT_BUCKETS_MS, **labels: str) -> Histogram:
+        return self._get(lambda: Histogram(buckets), name, help, labels)
+
+    def timer(self, hist: Histogram):
+        """``with METRICS.timer(h): ...``，把耗时（毫秒）记入直方图。"""
+        return _Timer(hist) if self.enabled else _NOOP
+
+    # ---------- 导出 ----------
+    def _grouped(self) -> List[Tuple[str, List[Tuple[Labels, object]]]]:
+        groups: Dict[str, List[Tuple[Labels, object]]] = {}
+        for (name, labels), metric in self._metrics.items():
+            groups.setdefault(name, []).append((labels, metric))
+        return sorted(groups.items())
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, series in self._grouped():
+            lines.append(f"# HELP {name} {self._help.get(name, '')}")
+            lines.append(f"# TYPE {name} {series[0][1].kind}")
+            for labels, m in series:
+                if isinstance(m, Histogram):
+                    acc = 0
+                    for bound, n in zip(m.bounds + (float("inf"),), m.counts):
+                        acc += n
+                        le = 'le="%s"' % ("+Inf" if bound == float("inf") else _fmt_num(bound))
+                        lines.append(f"{name}_bucket{_fmt_labels(labels, le)} {acc}")
+                    lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_num(m.sum)}")
+                    lines.append(f"{name}_count{_fmt_labels(labels)} {m.count}")
+                else:
+                    value = m.read() if isinstance(m, Gauge) else m.value
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_num(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, object]:
+        out: Dict[str, object] = {"time": round(time.time(), 3)}
+        for name, series in self._grouped():
+            items = []
+            for labels, m in series:
+                item: Dict[str, object] = {"labels": dict(labels)}
+                if isinstance(m, Histogram):
+                    item.update(count=m.count, sum=round(m.sum, 3),
+                                buckets=dict(zip([str(b) for b in m.bounds] + ["+Inf"], m.counts)))
+                else:
+                    item["value"] = m.read() if isinstance(m, Gauge) else m.value
+                items.append(item)
+            out[name] = items
+        return out
+
+    def write(self, prom_path: Path, json_path: Optional[Path] = None) -> None:
+        """原子地写出 Prometheus 文本（以及可选的 JSON 快照）；关闭时什么也不做。"""
+        if not self.enabled:
+            return
+        _atomic_write(Path(prom_path), self.to_prometheus())
+        if json_path is not None:
+            _atomic_write(Path(json_path), json.dumps(self.to_json(), ensure_ascii=False, indent=2))
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+METRICS = Registry(enabled=os.getenv("HEALTHY_LIFE_METRICS", "") not in ("", "0"))
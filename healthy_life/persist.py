@@ -0,0 +1,165 @@
+"""文件落盘：原子写入，以及把频繁的小写入合并到后台线程的 write-behind。
+
+界面线程只把要写的内容（已经序列化好的字符串）交给 :class:`WriteBehind`，
+一个窗口期内的多次修改只写最后一次；写盘在后台线程里用“临时文件 + fsync +
+rename”完成，崩溃时旧文件要么完整保留、要么被新文件整体替换。
+多个进程写同一份文件时用 :func:`file_lock` 互斥。
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+_RETRY_SEC = 5.0
+
+
+def write_atomic(path: Path, text: str) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 临时文件名带上进程 / 线程号，同一文件的并发写互不踩踏
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """文件的跨进程排他锁（锁文件 ``<文件>.lock``）；同一进程内不可重入。"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)   # 拿不到时每秒重试，10 秒后抛 OSError
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class WriteBehind:
+    """同一个文件的延迟合并写入；``delay`` 秒内的多次 submit 只落盘一次。"""
+
+    def __init__(self, path: Path, delay: float = 0.5, name: str = "settings"):
+        self.path = Path(path)
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending: Optional[str] = None
+        self._due = 0.0
+        self._busy = False
+        self._closed = False
+        self.submits = 0
+        self.writes = 0
+        self.errors = 0
+        self.last_error: Optional[OSError] = None
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        from .metrics import METRICS    # 只用到 file_lock 的命令行不必导入
+        self._m_write = METRICS.histogram(f"hla_{name}_write_ms", f"{name} write-behind latency (ms)")
+        self._m_writes = METRICS.counter(f"hla_{name}_writes_total", f"{name} files written")
+        self._m_submits = METRICS.counter(f"hla_{name}_submits_total", f"{name} save requests")
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> None:
+        """登记最新内容；窗口期从这一批的第一次修改算起，不会被连续点击无限推迟。"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WriteBehind 已关闭")
+            if self._pending is None:
+                self._due = time.monotonic() + self.delay
+            self._pending = text
+            self.submits += 1
+            self._m_submits.inc()
+            self._cond.notify()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """立即写出尚未落盘的内容并等待完成；超时返回 False。"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._due = 0.0
+            self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = 2.0) -> bool:
+        """退出前调用：写出最后一批并结束后台线程。"""
+        ok = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return ok
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "submits": self.submits,
+                "writes": self.writes,
+                "coalesced": self.submits - self.writes - (self._pending is not None),
+                "errors": self.errors,
+                "last_ms": round(self.last_ms, 3),
+                "avg_ms": round(self.total_ms / self.writes, 3) if self.writes else 0.0,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        if self._closed:
+                            return
+                        self._cond.wait()
+                        continue
+                    left = self._due - time.monotonic()
+                    if left <= 0 or self._closed:
+                        break
+                    self._cond.wait(left)
+                text, self._pending = self._pending, None
+                self._busy = True
+
+            t0 = time.perf_counter()
+            try:
+                write_atomic(self.path, text)
+                err = None
+            except OSError as exc:
+                err = exc
+            ms = (time.perf_counter() - t0) * 1000
+
+            with self._cond:
+                self._busy = False
+                if err is None:
+                    self.writes += 1
+                    self.last_ms = ms
+                    self.total_ms += ms
+                    self._m_write.observe(ms)
+                    self._m_writes.inc()
+                else:
+                    # 写失败（例如网络漫游目录暂时不可用）：没有更新的内容时稍后重试
+                    self.errors += 1
+                    self.last_error = err
+                    if self._pending is None and not self._closed:
+                        self._pending = text
+                        self._due = time.monotonic() + _RETRY_SEC
+                self._cond.notify_all()
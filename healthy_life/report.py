@@ -0,0 +1,427 @@
+"""结构化的当日报告：一份汇总 + 一串原始事件，由可插拔的写出器流式输出。
+
+- ``txt``：原来的中英双语文本报告；
+- ``json``：汇总 + 事件数组，逐块写出；
+- ``csv``：原始事件，一行一条；
+- ``col``：紧凑的列式二进制，列格式与历史库（history）一致。
+
+写出器都是 ``render(report) -> Iterator[str | bytes]``，事件按需从会话的
+事件缓冲现生成，不会先拼出整份文档。新格式用 :func:`register_writer` 登记。
+:func:`read_report` 是反方向：按扩展名读回 (汇总, 事件迭代器)，供汇总工具使用。
+"""
+import csv
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .events import Row, to_ms
+from .history import KIND_BY_NAME, KIND_END, KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP, KIND_START
+from .stats import GapSketch, SessionStats
+
+if TYPE_CHECKING:
+    from .session import ReminderSession
+
+REPORT_VERSION = 1
+_CHUNK = 1024        # 每块事件条数
+
+KIND_NAMES = {code: name for name, code in KIND_BY_NAME.items()}
+
+
+def fmt_hm(sec: float) -> str:
+    sec = int(max(0, sec))
+    h, r = divmod(sec, 3600)
+    m, _ = divmod(r, 60)
+    return f"{h}小时{m}分钟 / {h}h {m}min"
+
+
+@dataclass
+class ReportSummary:
+    start: Optional[datetime]
+    end: datetime
+    duration_sec: float
+    sips: int
+    sip_ml: int
+    intake_ml: int
+    goal_ml: int
+    remaining_ml: int
+    moves: int
+    avg_move_gap_sec: float
+    longest_sedentary_sec: float
+    median_sedentary_sec: float
+    p90_sedentary_sec: float
+
+    def to_dict(self) -> Dict[str, object]:
+        d = asdict(self)
+        d["start"] = self.start.isoformat(timespec="seconds") if self.start else None
+        d["end"] = self.end.isoformat(timespec="seconds")
+        for key in ("duration_sec", "avg_move_gap_sec", "longest_sedentary_sec",
+                    "median_sedentary_sec", "p90_sedentary_sec"):
+            d[key] = round(d[key], 3)
+        return d
+
+
+class Report:
+    """汇总在构造时算好（O(1)，来自在线统计）；事件每次迭代时现生成。
+
+    事件源直接引用会话的事件缓冲，在工作线程里渲染时应基于 ``frozen()`` 副本。
+    """
+
+    __slots__ = ("summary", "_events")
+
+    def __init__(self, summary: ReportSummary, events: Callable[[], Iterator[Row]]):
+        self.summary = summary
+        self._events = events
+
+    def events(self) -> Iterator[Row]:
+        return self._events()
+
+    @staticmethod
+    def from_session(sess: "ReminderSession", end_time: datetime,
+                     elapsed: Optional[float] = None) -> "Report":
+        if elapsed is None:
+            elapsed = sess.elapsed_seconds(end_time)
+        stats = sess.stats
+        p50, p90 = stats.gaps.quantiles((0.5, 0.9))
+        summary = ReportSummary(
+            start=sess.start_time,
+            end=end_time,
+            duration_sec=elapsed,
+            sips=stats.sips,
+            sip_ml=sess.sip_size,
+            intake_ml=sess.water_progress,
+            goal_ml=sess.goal,
+            remaining_ml=max(0, sess.goal - sess.water_progress),
+            moves=stats.moves,
+            avg_move_gap_sec=stats.avg_move_gap(elapsed),
+            longest_sedentary_sec=stats.longest_gap_until(end_time),
+            median_sedentary_sec=p50 or 0.0,
+            p90_sedentary_sec=p90 or 0.0,
+        )
+        start, buf = sess.start_time, sess.events
+
+        def events() -> Iterator[Row]:
+            if start is not None:
+                yield (to_ms(start), KIND_START, 0)
+            yield from buf.rows()
+            yield (to_ms(end_time), KIND_END, 0)
+
+        return Report(summary, events)
+
+    @staticmethod
+    def from_events(events: Callable[[], Iterator[Row]], end_time: datetime,
+                    goal_ml: int, sip_ml: int) -> "Report":
+        """多场会话合成一份报告，例如历史库里最近一个月的事件。
+
+        用 :func:`replay_sessions` 逐场回放再合并：时长扣除暂停，最长久坐取各场最大，
+        分位数合并各场的草图；饮水目标按“有会话的天数 × 每日目标”计。
+        末尾没有 end 的会话算到 ``end_time``。
+        """
+        totals = _Totals()
+        for span in replay_sessions(events(), to_ms(end_time)):
+            totals.add(span)
+
+        p50, p90 = totals.gaps.quantiles((0.5, 0.9))
+        goal = goal_ml * max(1, len(totals.days))
+        if totals.span_moves:
+            avg_gap = totals.span_sec / totals.span_moves
+        else:
+            avg_gap = totals.active_sec / max(1, totals.moves)
+        summary = ReportSummary(
+            start=totals.first,
+            end=end_time,
+            duration_sec=totals.active_sec,
+            sips=totals.sips,
+            sip_ml=sip_ml,
+            intake_ml=totals.intake,
+            goal_ml=goal,
+            remaining_ml=max(0, goal - totals.intake),
+            moves=totals.moves,
+            avg_move_gap_sec=avg_gap,
+            longest_sedentary_sec=totals.longest,
+            median_sedentary_sec=p50 or 0.0,
+            p90_sedentary_sec=p90 or 0.0,
+        )
+        return Report(summary, events)
+
+
+class SessionSpan(NamedTuple):
+    """:func:`replay_sessions` 回放出的一场会话。"""
+    stats: SessionStats     # 回放器复用同一个对象：只在取下一场之前有效
+    start_ms: int
+    end_ms: int
+    active_ms: int          # 扣除暂停；暂停中结束时暂停算到结束为止
+
+
+def replay_sessions(events: Iterable[Row], end_ms: Optional[int] = None) -> Iterator[SessionSpan]:
+    """把按时间排序的事件逐场回放到 :class:`SessionStats`。
+
+    第一个 start 之前的零散事件忽略；没有 end 就来了下一个 start（进程崩溃）时，
+    上一场算到这个 start 为止；末尾没有 end 的会话算到 ``end_ms``，为 None 时丢弃。
+    """
+    stats = SessionStats()
+    start_ms: Optional[int] = None
+    pause_ms: Optional[int] = None
+    paused = 0
+
+    def span(stop: int) -> SessionSpan:
+        held = paused + (stop - pause_ms if pause_ms is not None else 0)
+        return SessionSpan(stats, start_ms, stop, max(0, stop - start_ms - held))
+
+    for ts, kind, amount in events:
+        if kind == KIND_START:
+            if start_ms is not None:
+                yield span(ts)
+            start_ms, pause_ms, paused = ts, None, 0
+            stats.reset(datetime.fromtimestamp(ts / 1000))
+        elif start_ms is None:
+            continue
+        elif kind == KIND_SIP:
+            stats.add_sip(amount)
+        elif kind == KIND_MOVE:
+            stats.add_move(datetime.fromtimestamp(ts / 1000))
+        elif kind == KIND_PAUSE:
+            pause_ms = ts if pause_ms is None else pause_ms
+        elif kind == KIND_RESUME and pause_ms is not None:
+            paused += ts - pause_ms
+            pause_ms = None
+        elif kind == KIND_END:
+            yield span(ts)
+            start_ms = None
+    if start_ms is not None and end_ms is not None:
+        yield span(end_ms)
+
+
+class _Totals:
+    """from_events 的跨会话累加器。"""
+
+    __slots__ = ("first", "days", "sips", "intake", "moves", "active_sec",
+                 "span_sec", "span_moves", "longest", "gaps")
+
+    def __init__(self):
+        self.first: Optional[datetime] = None
+        self.days = set()
+        self.sips = self.intake = self.moves = 0
+        self.active_sec = 0.0
+        self.span_sec = 0.0          # 各场“第一次到最后一次活动”的时长之和
+        self.span_moves = 0          # 对应的活动间隔数
+        self.longest = 0.0
+        self.gaps = GapSketch()
+
+    def add(self, span: SessionSpan) -> None:
+        stats = span.stats
+        if self.first is None:
+            self.first = stats.start
+        self.days.add(stats.start.date())
+        self.sips += stats.sips
+        self.intake += stats.intake
+        self.moves += stats.moves
+        self.active_sec += span.active_ms / 1000
+        if stats.moves >= 2:
+            self.span_sec += (stats.last_move - stats.first_move).total_seconds()
+            self.span_moves += stats.moves - 1
+        self.longest = max(self.longest, stats.longest_gap_until(datetime.fromtimestamp(span.end_ms / 1000)))
+        self.gaps.merge(stats.gaps)
+
+
+def _chunks(events: Iterator[Row]) -> Iterator[list]:
+    while True:
+        block = list(islice(events, _CHUNK))
+        if not block:
+            return
+        yield block
+
+
+# ---------- 写出器 ----------
+def render_txt(report: Report) -> Iterator[str]:
+    s = report.summary
+    start_str = s.start.strftime("%Y-%m-%d %H:%M:%S") if s.start else "-"
+    lines = [
+        "——————  当日健康活动报告 / Daily Health Report  ——————",
+        f"开始时间 / Start: {start_str}",
+        f"结束时间 / End:   {s.end:%Y-%m-%d %H:%M:%S}",
+        f"共计时长 / Duration: {fmt_hm(s.duration_sec)}",
+        "",
+        "[饮水 / Hydration]",
+        f"累计次数 / Sips: {s.sips}",
+        f"每次饮水 / Per sip: {s.sip_ml} ml",
+        f"累计饮水 / Total intake: {s.intake_ml} ml",
+        f"饮水目标 / Goal: {s.goal_ml} ml",
+        f"还需饮水 / Remaining: {s.remaining_ml} ml",
+        "",
+        "[久坐/活动 Sedentary / Activity]",
+        f"累计活动 / Activities: {s.moves}",
+        f"平均间隔 / Avg between moves: {fmt_hm(s.avg_move_gap_sec)}",
+        f"最长久坐 / Longest sedentary interval: {fmt_hm(s.longest_sedentary_sec)}",
+        f"久坐中位数 / Median sedentary interval: {fmt_hm(s.median_sedentary_sec)}",
+        f"久坐 P90 / 90th percentile sedentary interval: {fmt_hm(s.p90_sedentary_sec)}",
+        "",
+        "（本报告由“健康生活小助手”自动生成 / Generated by Healthy Life Assistant）",
+    ]
+    yield "\n".join(lines)
+
+
+def render_json(report: Report) -> Iterator[str]:
+    head = {"version": REPORT_VERSION, "summary": report.summary.to_dict(),
+            "event_fields": ["ts_ms", "kind", "amount"]}
+    yield json.dumps(head, ensure_ascii=False)[:-1] + ',"events":['
+    sep = "\n"
+    for block in _chunks(report.events()):
+        yield sep + ",\n".join(f'[{ts},"{KIND_NAMES[k]}",{amt}]' for ts, k, amt in block)
+        sep = ",\n"
+    yield "\n]}\n"
+
+
+def render_csv(report: Report) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(("ts_ms", "time", "kind", "amount"))
+    for block in _chunks(report.events()):
+        for ts, k, amt in block:
+            when = datetime.fromtimestamp(ts / 1000).isoformat(timespec="milliseconds")
+            writer.writerow((ts, when, KIND_NAMES[k], amt))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+COL_MAGIC = b"HLAREP1\0"
+
+
+def render_columnar(report: Report) -> Iterator[bytes]:
+    """``MAGIC | u32 汇总长度 | 汇总 JSON | u64 n | ts<i8>[n] | kind u1[n] | amount<i4>[n]``。
+
+    三列各遍历一次事件源，按块写出；列的字节序与历史库一致（小端）。
+    """
+    summary = json.dumps(report.summary.to_dict(), ensure_ascii=False).encode("utf-8")
+    n = sum(len(block) for block in _chunks(report.events()))
+    yield COL_MAGIC + struct.pack("<I", len(summary)) + summary + struct.pack("<Q", n)
+    for col, typecode in ((0, "q"), (1, "B"), (2, "i")):
+        for block in _chunks(report.events()):
+            arr = array(typecode, (ev[col] for ev in block))
+            if sys.byteorder != "little":
+                arr.byteswap()
+            yield arr.tobytes()
+
+
+def read_columnar(path: Path):
+    """读回 ``col`` 文件：返回 (汇总 dict, history.DayColumns)。需要 NumPy。"""
+    from .history import DayColumns, _numpy
+    np = _numpy()
+    raw = Path(path).read_bytes()
+    if not raw.startswith(COL_MAGIC):
+        raise ValueError(f"不是列式报告文件: {path}")
+    off = len(COL_MAGIC)
+    (slen,) = struct.unpack_from("<I", raw, off)
+    off += 4
+    summary = json.loads(raw[off:off + slen].decode("utf-8"))
+    off += slen
+    (n,) = struct.unpack_from("<Q", raw, off)
+    off += 8
+    cols = []
+    for dt in ("<i8", "u1", "<i4"):
+        cols.append(np.frombuffer(raw, dtype=dt, count=n, offset=off))
+        off += n * np.dtype(dt).itemsize
+    return summary, DayColumns(*cols)
+
+
+# ---------- 读回 ----------
+_JSON_EVENTS = ',"events":['
+
+
+def _read_json(path: Path) -> Tuple[Optional[dict], Iterator[Row]]:
+    fh = open(path, "r", encoding="utf-8")
+    head = fh.readline().rstrip()
+    if not head.endswith(_JSON_EVENTS):
+        # 不是 render_json 的逐行布局（例如被别的工具重排过）：整份解析
+        with fh:
+            doc = json.loads(head + fh.read())
+        return doc.get("summary"), ((ts, KIND_BY_NAME[k], amt) for ts, k, amt in doc["events"])
+    summary = json.loads(head[:-len(_JSON_EVENTS)] + "}")["summary"]
+
+    def events() -> Iterator[Row]:
+        with fh:
+            for line in fh:
+                line = line.strip().rstrip(",")
+                if line.startswith("["):
+                    ts, k, amt = json.loads(line)
+                    yield ts, KIND_BY_NAME[k], amt
+    return summary, events()
+
+
+def _read_csv(path: Path) -> Tuple[Optional[dict], Iterator[Row]]:
+    def events() -> Iterator[Row]:
+        with open(path, "r", encoding="utf-8", newline="") as fh:
+            for row in csv.DictReader(fh):
+                yield int(row["ts_ms"]), KIND_BY_NAME[row["kind"]], int(row["amount"])
+    return None, events()
+
+
+def _read_hlar(path: Path) -> Tuple[Optional[dict], Iterator[Row]]:
+    summary, cols = read_columnar(path)
+    return summary, zip(cols.ts.tolist(), cols.kind.tolist(), cols.amount.tolist())
+
+
+_READERS = {".json": _read_json, ".csv": _read_csv, ".hlar": _read_hlar}
+
+
+def read_report(path: Path) -> Tuple[Optional[dict], Iterator[Row]]:
+    """读回 json / csv / col 报告：(汇总 dict 或 None, 按时间排序的事件迭代器)。
+
+    json / csv 的事件是惰性读取的；col 经 :func:`read_columnar` 读取，需要 NumPy。
+    csv 没有汇总（目标、活动时长需由调用方补齐）。
+    """
+    path = Path(path)
+    reader = _READERS.get(path.suffix)
+    if reader is None:
+        raise ValueError(f"不支持的报告格式: {path.name}")
+    return reader(path)
+
+
+@dataclass(frozen=True)
+class Writer:
+    ext: str
+    render: Callable[[Report], Iterator[Union[str, bytes]]]
+    binary: bool = False
+
+
+WRITERS: Dict[str, Writer] = {}
+
+
+def register_writer(name: str, ext: str, render: Callable[[Report], Iterator[Union[str, bytes]]],
+                    binary: bool = False) -> None:
+    WRITERS[name] = Writer(ext, render, binary)
+
+
+register_writer("txt", "txt", render_txt)
+register_writer("json", "json", render_json)
+register_writer("csv", "csv", render_csv)
+register_writer("col", "hlar", render_columnar, binary=True)
+
+
+def report_path(directory: Path, end_time: datetime, ext: str) -> Path:
+    """``health_report_YYYY-MM-DD_HHMMSS.ext``；同一秒已存在时追加 -1、-2……
+
+    名字在返回前就以空文件占用（``O_EXCL``），同一秒提交的几次导出不会选到同一个名字；
+    写出方直接覆盖这个空文件。
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    base = f"health_report_{end_time:%Y-%m-%d_%H%M%S}"
+    n = 0
+    while True:
+        path = directory / (f"{base}.{ext}" if n == 0 else f"{base}-{n}.{ext}")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return path
+        except FileExistsError:
+            n += 1
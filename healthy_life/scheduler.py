@@ -0,0 +1,60 @@
+"""按“活动时间”截止点调度提醒（不依赖 Qt）。
+
+调度器只回答两件事：下一次提醒在第几秒到期、当前有哪些提醒已到期。
+调用方据此布置一个单次定时器，而不是每秒轮询一次时间。
+"""
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+REMINDER_WATER = "water"
+REMINDER_MOVE = "move"
+
+
+class ReminderScheduler:
+    """以活动秒数为键的最小堆，每种提醒在堆中最多一项。"""
+
+    __slots__ = ("_heap", "_intervals", "_seq")
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._intervals: Dict[str, float] = {}
+        self._seq = itertools.count()   # 同一秒到期时按加入顺序触发
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._intervals.clear()
+
+    def schedule(self, kind: str, interval_sec: float, first_due: Optional[float] = None) -> None:
+        """登记一种周期提醒；first_due 缺省为一个间隔之后。已存在的同类提醒会被替换。"""
+        if kind in self._intervals:
+            self._heap = [item for item in self._heap if item[2] != kind]
+            heapq.heapify(self._heap)
+        self._intervals[kind] = float(interval_sec)
+        due = float(interval_sec) if first_due is None else float(first_due)
+        heapq.heappush(self._heap, (due, next(self._seq), kind))
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def due_of(self, kind: str) -> Optional[float]:
+        for due, _, k in self._heap:
+            if k == kind:
+                return due
+        return None
+
+    def pop_due(self, active_sec: float) -> List[str]:
+        """取出所有已到期的提醒，并把它们各自顺延到 active_sec 之后的下一个截止点。
+
+        每种提醒每次最多触发一次：长时间卡顿后落后再多个间隔，也只合并成一次
+        提醒，错过的间隔直接跳过，不会连着弹出一串。
+        """
+        fired: List[Tuple[float, str]] = []
+        while self._heap and self._heap[0][0] <= active_sec:
+            due, _, kind = heapq.heappop(self._heap)
+            fired.append((due, kind))
+        for due, kind in fired:
+            interval = self._intervals[kind]
+            due += (int((active_sec - due) // interval) + 1) * interval
+            heapq.heappush(self._heap, (due, next(self._seq), kind))
+        return [kind for _, kind in fired]
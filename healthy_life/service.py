@@ -0,0 +1,168 @@
+"""无界面的多用户提醒服务：一个 asyncio 进程、一个时间轮，承载大量会话。
+
+每个用户一份 :class:`~healthy_life.session.ReminderSession`，时间轮里只记录
+“谁在第几格到期”；每格（默认 1 秒）只处理这一格里的用户，
+与在线会话总数无关。桌面端只需把开始 / 暂停 / 记录等操作转发过来，
+并接收 ``on_reminder(user_id, kind)`` 回调推送的提醒。
+
+回调可以是协程：它作为任务在后台运行，服务持有任务引用直到完成，
+抛出的异常记入 ``errors`` 并写日志，不会打断时间轮。
+"""
+import asyncio
+import inspect
+import logging
+import math
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from .session import ReminderSession
+
+log = logging.getLogger(__name__)
+
+ReminderCallback = Callable[[Hashable, str], Optional[Awaitable[Any]]]
+
+
+class TimerWheel:
+    """单层哈希时间轮：一圈 ``slots`` 格，超过一圈的条目记录剩余圈数。"""
+
+    __slots__ = ("_slots", "_where", "_cursor")
+
+    def __init__(self, slots: int = 4096):
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, key: Hashable, ticks: int) -> None:
+        """在 ``ticks`` 格之后到期（至少 1 格）；同一个 key 只保留最新一次。"""
+        self.cancel(key)
+        ticks = max(1, int(ticks))
+        n = len(self._slots)
+        slot = (self._cursor + ticks) % n
+        self._slots[slot][key] = (ticks - 1) // n
+        self._where[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._where.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self) -> List[Hashable]:
+        """前进一格，返回本格到期的 key。"""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+        expired = [key for key, rounds in bucket.items() if rounds == 0]
+        for key in expired:
+            del bucket[key]
+            del self._where[key]
+        for key in bucket:
+            bucket[key] -= 1
+        return expired
+
+
+class ReminderService:
+    def __init__(
+        self,
+        on_reminder: ReminderCallback,
+        tick_sec: float = 1.0,
+        wheel_slots: int = 4096,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.on_reminder = on_reminder
+        self.tick_sec = tick_sec
+        self.clock = clock
+        self.sessions: Dict[Hashable, ReminderSession] = {}
+        self.wheel = TimerWheel(wheel_slots)
+        self.dispatched = 0
+        self.errors = 0                 # 协程回调抛出的异常数
+        self._tasks: Set["asyncio.Future[Any]"] = set()   # 进行中的回调；事件循环只持有弱引用
+        self._stop: Optional[asyncio.Event] = None
+
+    # ---------- 会话操作（由前端转发） ----------
+    def open_session(self, user_id: Hashable, **kwargs: Any) -> ReminderSession:
+        now = self.clock()
+        sess = ReminderSession(**kwargs)
+        sess.start(now)
+        self.sessions[user_id] = sess
+        self._arm(user_id, sess, now)
+        return sess
+
+    def close_session(self, user_id: Hashable) -> str:
+        """结束会话并返回当日报告文本。"""
+        sess = self.sessions.pop(user_id)
+        self.wheel.cancel(user_id)
+        return sess.build_report_text(self.clock())
+
+    def pause(self, user_id: Hashable) -> None:
+        if self.sessions[user_id].pause(self.clock()):
+            self.wheel.cancel(user_id)
+
+    def resume(self, user_id: Hashable) -> None:
+        now = self.clock()
+        sess = self.sessions[user_id]
+        if sess.resume(now):
+            self._arm(user_id, sess, now)
+
+    def log_sip(self, user_id: Hashable) -> bool:
+        return self.sessions[user_id].log_sip(self.clock())
+
+    def log_move(self, user_id: Hashable) -> bool:
+        return self.sessions[user_id].log_move(self.clock())
+
+    # ---------- 调度 ----------
+    def _arm(self, user_id: Hashable, sess: ReminderSession, now: datetime) -> None:
+        delay = sess.seconds_until_next(now)
+        if delay is None:
+            self.wheel.cancel(user_id)
+        else:
+            self.wheel.add(user_id, math.ceil(delay / self.tick_sec))
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """时间轮前进一格并派发到期提醒，返回本格派发的条数。"""
+        now = now or self.clock()
+        count = 0
+        for user_id in self.wheel.advance():
+            sess = self.sessions.get(user_id)
+            if sess is None:
+                continue
+            for kind in sess.due_reminders(now):
+                res = self.on_reminder(user_id, kind)
+                if inspect.isawaitable(res):
+                    task = asyncio.ensure_future(res)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._task_done)
+                count += 1
+            self._arm(user_id, sess, now)
+        self.dispatched += count
+        return count
+
+    def _task_done(self, task: "asyncio.Future[Any]") -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.errors += 1
+            log.error("提醒回调出错", exc_info=exc)
+
+    async def run(self) -> None:
+        """按 tick_sec 节拍推进时间轮，直到 stop()。"""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        next_at = loop.time()
+        while True:
+            next_at += self.tick_sec
+            try:
+                await asyncio.wait_for(self._stop.wait(), max(0.0, next_at - loop.time()))
+                return
+            except asyncio.TimeoutError:
+                pass
+            self.tick()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
@@ -0,0 +1,245 @@
+"""一次提醒会话的状态与规则（不依赖 Qt）。
+
+桌面窗口和无界面服务共用这一套逻辑：开始 / 暂停 / 继续、按活动时间调度
+喝水与久坐提醒、记录一口 / 活动，以及生成当日报告。
+所有方法都接受可选的 ``now``，缺省取 ``datetime.now()``。
+
+活动时间默认按墙上时间推算；挂上 ``ActiveClock`` 后改由单调时钟给出，
+``now`` 只用来给记录打时间戳（系统挂起由 ``check_suspend`` 计为暂停）。
+"""
+import copy
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, List, Optional
+
+from .clock import ActiveClock
+from .events import EventBuffer
+from .history import KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP
+from .report import Report, fmt_hm, render_txt
+from .scheduler import ReminderScheduler, REMINDER_WATER, REMINDER_MOVE
+from .stats import SessionStats
+
+if TYPE_CHECKING:
+    from .journal import JournalState
+
+
+class ReminderSession:
+    __slots__ = (
+        "goal", "sip_size", "water_interval_sec", "sedentary_interval_sec",
+        "running", "paused", "start_time", "paused_at", "paused_accum",
+        "water_progress", "events", "scheduler", "stats",
+        "clock",
+    )
+
+    def __init__(
+        self,
+        goal: int = 1700,
+        sip_size: int = 250,
+        water_interval_sec: int = 90 * 60,
+        sedentary_interval_sec: int = 60 * 60,
+        clock: Optional[ActiveClock] = None,
+    ):
+        self.goal = goal
+        self.sip_size = sip_size
+        self.water_interval_sec = water_interval_sec
+        self.sedentary_interval_sec = sedentary_interval_sec
+        self.scheduler = ReminderScheduler()
+        self.stats = SessionStats()
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.running = False
+        self.paused = False
+        self.start_time: Optional[datetime] = None
+        self.paused_at: Optional[datetime] = None
+        self.paused_accum = 0.0          # 累积暂停秒数（float）
+        self.water_progress = 0
+        # 一口 / 活动 / 暂停 / 继续，按时间顺序；reset 换一个新缓冲，不清空旧的
+        self.events = EventBuffer()
+        self.scheduler.clear()
+        self.stats.reset()
+        if self.clock is not None:
+            self.clock.reset()
+
+    # ---------- 生命周期 ----------
+    def start(self, now: Optional[datetime] = None) -> None:
+        self.reset()
+        self.start_time = now or datetime.now()
+        self.stats.reset(self.start_time)
+        self.running = True
+        if self.clock is not None:
+            self.clock.start()
+        self.scheduler.schedule(REMINDER_WATER, self.water_interval_sec)
+        self.scheduler.schedule(REMINDER_MOVE, self.sedentary_interval_sec)
+
+    def pause(self, now: Optional[datetime] = None) -> bool:
+        if not self.running or self.paused:
+            return False
+        self.paused = True
+        self.paused_at = now or datetime.now()
+        self.events.append(self.paused_at, KIND_PAUSE)
+        if self.clock is not None:
+            self.clock.pause()
+        return True
+
+    def resume(self, now: Optional[datetime] = None) -> bool:
+        if not self.running or not self.paused:
+            return False
+        now = now or datetime.now()
+        if self.paused_at is not None:
+            self.paused_accum += (now - self.paused_at).total_seconds()
+            self.paused_at = None
+        self.paused = False
+        self.events.append(now, KIND_RESUME)
+        if self.clock is not None:
+            self.clock.resume()
+        return True
+
+    def load_history(self, events: EventBuffer) -> None:
+        """恢复会话时载入已有记录，并据此重建统计。"""
+        self.events = events.copy()
+        self.stats.reset(self.start_time)
+        for ev in self.events:
+            if ev.kind == KIND_SIP:
+                self.stats.add_sip(ev.amount)
+            elif ev.kind == KIND_MOVE:
+                self.stats.add_move(ev.when)
+
+    def restore(self, state: "JournalState", now: Optional[datetime] = None,
+                pause_at: Optional[datetime] = None) -> None:
+        """按日志重放出的状态接着一个未结束的会话（保持原来的暂停与否）。
+
+        ``pause_at``：会话没在暂停时，从这一刻起按暂停处理，它到现在的这段不计入活动时间。
+        正常退出时日志里已有退出时刻的暂停记录；进程崩溃时只能取最后一条记录的时间。
+        """
+        s = state.settings
+        self.goal = int(s.get("goal", self.goal))
+        self.sip_size = int(s.get("sip_size", self.sip_size))
+        self.water_interval_sec = state.water_interval_sec or self.water_interval_sec
+        self.sedentary_interval_sec = state.sedentary_interval_sec or self.sedentary_interval_sec
+        self.start(state.start_time)
+        self.water_progress = state.water_progress
+        self.load_history(state.events)
+        self.paused_accum = state.paused_accum
+        if state.paused_at is not None:
+            # 暂停事件已经在 state.events 里，这里只恢复状态
+            self.paused, self.paused_at = True, state.paused_at
+        elif pause_at is not None:
+            self.paused, self.paused_at = True, pause_at
+            self.events.append(pause_at, KIND_PAUSE)
+        if self.clock is not None:
+            # 单调时钟从日志推算出的已有活动时长接着走；暂停中的会话停在暂停那一刻的时长上
+            at = self.paused_at or now or datetime.now()
+            self.clock.start(self._wall_elapsed(at), paused=self.paused)
+        self.reschedule_from_elapsed(now)
+
+    def reschedule_from_elapsed(self, now: Optional[datetime] = None) -> None:
+        """恢复会话后，把两种提醒排到当前活动时间之后的下一个整间隔。"""
+        elapsed = self.elapsed_seconds(now)
+        self.scheduler.clear()
+        for kind, interval in ((REMINDER_WATER, self.water_interval_sec),
+                               (REMINDER_MOVE, self.sedentary_interval_sec)):
+            self.scheduler.schedule(kind, interval, (elapsed // interval + 1) * interval)
+
+    # ---------- 时间与调度 ----------
+    def elapsed_seconds(self, now: Optional[datetime] = None) -> float:
+        """当前累计运行秒数（扣除暂停），用于进度时间 & 提醒调度。"""
+        if self.start_time is None:
+            return 0.0
+        if self.clock is not None and self.clock.running:
+            return self.clock.active_seconds()
+        return self._wall_elapsed(now or datetime.now())
+
+    def _wall_elapsed(self, now: datetime) -> float:
+        secs = (now - self.start_time).total_seconds() - float(self.paused_accum)
+        if self.paused_at is not None:
+            secs -= (now - self.paused_at).total_seconds()
+        return max(0.0, secs)
+
+    def check_suspend(self, now: Optional[datetime] = None) -> float:
+        """检测系统挂起；挂起时长计入暂停，返回秒数（没有挂起则为 0）。
+
+        调用方应把 ``now - 返回值`` 到 ``now`` 这一段记成 pause / resume，
+        这样按日志恢复出来的时长也不含挂起。
+        """
+        if self.clock is None or not self.running or self.paused:
+            return 0.0
+        gap = self.clock.take_suspended()
+        if gap:
+            now = now or datetime.now()
+            self.paused_accum += gap
+            self.events.append(now - timedelta(seconds=gap), KIND_PAUSE)
+            self.events.append(now, KIND_RESUME)
+        return gap
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[float]:
+        """距下一次提醒还有多少秒；未开始或暂停时为 None。"""
+        if not self.running or self.paused:
+            return None
+        due = self.scheduler.next_due()
+        if due is None:
+            return None
+        return max(0.0, due - self.elapsed_seconds(now))
+
+    def due_reminders(self, now: Optional[datetime] = None) -> List[str]:
+        if not self.running or self.paused:
+            return []
+        return self.scheduler.pop_due(self.elapsed_seconds(now))
+
+    # ---------- 记录 ----------
+    def log_sip(self, now: Optional[datetime] = None) -> bool:
+        if not self.running or self.paused:
+            return False
+        self.water_progress += self.sip_size
+        self.events.append(now or datetime.now(), KIND_SIP, self.sip_size)
+        self.stats.add_sip(self.sip_size)
+        return True
+
+    def log_move(self, now: Optional[datetime] = None) -> bool:
+        if not self.running or self.paused:
+            return False
+        now = now or datetime.now()
+        self.events.append(now, KIND_MOVE)
+        self.stats.add_move(now)
+        return True
+
+    def merge_event(self, when: datetime, kind: int, amount: int = 0) -> bool:
+        """补入别的进程（命令行）记下的一口 / 活动；会话开始之前的忽略。暂停中也照收。"""
+        if not self.running or self.start_time is None or when < self.start_time:
+            return False
+        if kind not in (KIND_SIP, KIND_MOVE):
+            return False
+        if kind == KIND_SIP:
+            self.water_progress += amount
+        if self.events.insert(when, kind, amount) == len(self.events) - 1:
+            if kind == KIND_SIP:
+                self.stats.add_sip(amount)
+            else:
+                self.stats.add_move(when)
+        else:
+            self.load_history(self.events)     # 插在中间：久坐间隔要重算
+        return True
+
+    @property
+    def goal_reached(self) -> bool:
+        return self.water_progress >= self.goal
+
+    def frozen(self) -> "ReminderSession":
+        """当前状态的独立副本（不带时钟），可交给后台线程生成报告。"""
+        twin = ReminderSession(self.goal, self.sip_size,
+                               self.water_interval_sec, self.sedentary_interval_sec)
+        for name in ("running", "paused", "start_time", "paused_at", "paused_accum",
+                     "water_progress"):
+            setattr(twin, name, getattr(self, name))
+        twin.events = self.events.copy()
+        twin.stats = copy.deepcopy(self.stats)
+        return twin
+
+    # ---------- 报告 ----------
+    def build_report_text(self, end_time: datetime, elapsed: Optional[float] = None) -> str:
+        """elapsed 缺省按 end_time 现算；在副本上生成时由调用方传入原会话的活动时长。"""
+        return "".join(render_txt(self.report(end_time, elapsed)))
+
+    def report(self, end_time: datetime, elapsed: Optional[float] = None) -> Report:
+        """结构化报告（汇总 + 按需生成的事件流），交给 :mod:`report` 的写出器。"""
+        return Report.from_session(self, end_time, elapsed)
@@ -0,0 +1,248 @@
+"""虚拟时钟模拟：不用真的等待，几毫秒回放一整天的提醒与记录。
+
+会话挂上 ``ActiveClock(ManualClock)``，与桌面端走同一套活动计时与调度；
+驱动器按事件跳转时间（下一条脚本动作或下一次提醒，取较早者），
+不逐秒推进，因此每秒能回放上千个模拟小时。
+
+脚本是一串 (时刻, 动作)，动作为 start / pause / resume / sip / move / end；
+随机日程另外按概率对提醒作出反应（提醒后过一会儿记一口 / 起身活动）::
+
+    python -m healthy_life.simulate --script day.json        # 时间线 + 报告
+    python -m healthy_life.simulate --users 5000 --days 5    # 吞吐量统计
+    python -m healthy_life.simulate --users 300 --days 250 --export reports/   # 生成报告文件
+
+``day.json`` 形如 ``[["09:00", "start"], ["12:00", "pause"], ...]``。
+"""
+import argparse
+import heapq
+import itertools
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .clock import ActiveClock, ManualClock
+from .report import WRITERS, Report, report_path
+from .session import ReminderSession
+
+ACT_START = "start"
+ACT_PAUSE = "pause"
+ACT_RESUME = "resume"
+ACT_SIP = "sip"
+ACT_MOVE = "move"
+ACT_END = "end"
+ACTIONS = (ACT_START, ACT_PAUSE, ACT_RESUME, ACT_SIP, ACT_MOVE, ACT_END)
+
+Step = Tuple[datetime, str]
+
+
+@dataclass
+class Persona:
+    """一位模拟用户的设定与习惯。"""
+    goal: int = 1700
+    sip_size: int = 250
+    water_interval_sec: int = 90 * 60
+    sedentary_interval_sec: int = 60 * 60
+    respond_water: float = 0.0      # 收到喝水提醒后记一口的概率
+    respond_move: float = 0.0       # 收到久坐提醒后起身活动的概率
+    react_sec: Tuple[int, int] = (10, 300)
+
+
+@dataclass
+class DayResult:
+    timeline: List[Tuple[datetime, str]] = field(default_factory=list)
+    reports: List[str] = field(default_factory=list)
+    structured: List[Report] = field(default_factory=list)
+    reminders: int = 0
+    active_sec: float = 0.0
+
+
+def simulate_day(script: Iterable[Step], persona: Optional[Persona] = None,
+                 rng: Optional[random.Random] = None, structured: bool = False) -> DayResult:
+    """按脚本回放一天，返回时间线（动作与提醒）和每次 end 时的报告。
+
+    ``structured=True`` 时同时保留结构化报告（:class:`Report`），供导出文件用。
+    """
+    persona = persona or Persona()
+    rng = rng or random.Random(0)
+    seq = itertools.count()
+    pending = [(when, next(seq), act) for when, act in script]
+    heapq.heapify(pending)
+    if not pending:
+        return DayResult()
+
+    clock = ManualClock(wall=pending[0][0])
+    sess = ReminderSession(
+        goal=persona.goal,
+        sip_size=persona.sip_size,
+        water_interval_sec=persona.water_interval_sec,
+        sedentary_interval_sec=persona.sedentary_interval_sec,
+        clock=ActiveClock(clock),
+    )
+    out = DayResult()
+
+    def advance_to(when: datetime) -> None:
+        sec = (when - clock.wall()).total_seconds()
+        if sec > 0:
+            clock.advance(sec)
+
+    while pending:
+        due_in = sess.seconds_until_next()
+        if due_in is not None and clock.wall() + timedelta(seconds=due_in) < pending[0][0]:
+            clock.advance(due_in)
+            now = clock.wall()
+            for kind in sess.due_reminders(now):
+                out.reminders += 1
+                out.timeline.append((now, "reminder " + kind))
+                p = persona.respond_water if kind == "water" else persona.respond_move
+                if p and rng.random() < p:
+                    act = ACT_SIP if kind == "water" else ACT_MOVE
+                    later = now + timedelta(seconds=rng.randint(*persona.react_sec))
+                    heapq.heappush(pending, (later, next(seq), act))
+            continue
+
+        when, _, act = heapq.heappop(pending)
+        advance_to(when)
+        now = clock.wall()
+        if act == ACT_START:
+            sess.start(now)
+            ok = True
+        elif act == ACT_PAUSE:
+            ok = sess.pause(now)
+        elif act == ACT_RESUME:
+            ok = sess.resume(now)
+        elif act == ACT_SIP:
+            ok = sess.log_sip(now)
+        elif act == ACT_MOVE:
+            ok = sess.log_move(now)
+        elif act == ACT_END:
+            ok = sess.running
+            if ok:
+                elapsed = sess.elapsed_seconds(now)
+                out.active_sec += elapsed
+                out.reports.append(sess.build_report_text(now, elapsed))
+                if structured:
+                    # reset() 换一个新的事件缓冲、不清空旧的，报告里的事件源仍然有效
+                    out.structured.append(sess.report(now, elapsed))
+                sess.reset()
+        else:
+            raise ValueError(f"未知动作: {act!r}")
+        if ok:
+            out.timeline.append((now, act))
+    return out
+
+
+def random_day(rng: random.Random, day: date) -> Tuple[Persona, List[Step]]:
+    """随机生成一位用户的一天：上班、午休、零星暂停与自发记录、下班。"""
+    persona = Persona(
+        goal=rng.choice((1500, 1700, 2000, 2500)),
+        sip_size=rng.choice((150, 200, 250, 300)),
+        water_interval_sec=rng.choice((30, 60, 90, 120)) * 60,
+        sedentary_interval_sec=rng.choice((45, 60, 75, 90)) * 60,
+        respond_water=rng.uniform(0.3, 0.95),
+        respond_move=rng.uniform(0.2, 0.9),
+    )
+    base = datetime.combine(day, datetime.min.time())
+
+    def at(minutes: float) -> datetime:
+        return base + timedelta(minutes=minutes)
+
+    start = rng.gauss(9 * 60, 30)
+    lunch = rng.gauss(12 * 60, 20)
+    end = rng.gauss(18 * 60, 45)
+    steps: List[Step] = [
+        (at(start), ACT_START),
+        (at(lunch), ACT_PAUSE),
+        (at(lunch + rng.uniform(30, 75)), ACT_RESUME),
+        (at(end), ACT_END),
+    ]
+    for _ in range(rng.randint(0, 3)):          # 开会、外出等短暂停
+        t = rng.uniform(lunch + 90, end - 40)
+        steps += [(at(t), ACT_PAUSE), (at(t + rng.uniform(5, 30)), ACT_RESUME)]
+    for _ in range(rng.randint(0, 6)):          # 没等提醒自己喝水
+        steps.append((at(rng.uniform(start, end)), ACT_SIP))
+    return persona, sorted(steps)
+
+
+def load_script(path: str, day: date) -> List[Step]:
+    """读取 ``[["09:00", "start"], ...]`` 形式的脚本。"""
+    with open(path, "r", encoding="utf-8") as fh:
+        raw = json.load(fh)
+    steps = []
+    for hhmm, act in raw:
+        if act not in ACTIONS:
+            raise ValueError(f"未知动作: {act!r}")
+        parts = [int(x) for x in hhmm.split(":")]
+        while len(parts) < 3:
+            parts.append(0)
+        steps.append((datetime.combine(day, datetime.min.time()).replace(
+            hour=parts[0], minute=parts[1], second=parts[2]), act))
+    return steps
+
+
+def format_timeline(timeline: Sequence[Tuple[datetime, str]]) -> str:
+    return "\n".join(f"{when:%H:%M:%S}  {what}" for when, what in timeline)
+
+
+def _write_report(path: Path, writer, report: Report) -> None:
+    fh = open(path, "wb") if writer.binary else open(path, "w", encoding="utf-8", newline="")
+    with fh:
+        for chunk in writer.render(report):
+            fh.write(chunk)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="healthy_life.simulate", description="虚拟时钟回放提醒日程")
+    ap.add_argument("--script", help="按脚本回放一天并打印时间线与报告")
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--water-min", type=int, default=90, help="脚本模式下的喝水间隔（分钟）")
+    ap.add_argument("--move-min", type=int, default=60, help="脚本模式下的久坐间隔（分钟）")
+    ap.add_argument("--export", type=Path, help="把每场会话的报告写到 DIR/<用户>/ 下")
+    ap.add_argument("--format", choices=sorted(WRITERS), default="col", help="导出的报告格式")
+    args = ap.parse_args(argv)
+    day0 = date(2025, 1, 6)
+
+    if args.script:
+        persona = Persona(water_interval_sec=args.water_min * 60,
+                          sedentary_interval_sec=args.move_min * 60)
+        res = simulate_day(load_script(args.script, day0), persona)
+        print(format_timeline(res.timeline))
+        for report in res.reports:
+            print()
+            print(report)
+        return 0
+
+    rng = random.Random(args.seed)
+    total = DayResult()
+    reports = 0
+    t0 = time.perf_counter()
+    writer = WRITERS[args.format]
+    for u in range(args.users):
+        user_dir = args.export / f"user{u:05d}" if args.export else None
+        if user_dir is not None:
+            user_dir.mkdir(parents=True, exist_ok=True)
+        for d in range(args.days):
+            persona, steps = random_day(rng, day0 + timedelta(days=d))
+            res = simulate_day(steps, persona, rng, structured=user_dir is not None)
+            total.reminders += res.reminders
+            total.active_sec += res.active_sec
+            reports += len(res.reports)
+            for report in res.structured:
+                _write_report(report_path(user_dir, report.summary.end, writer.ext), writer, report)
+    wall = time.perf_counter() - t0
+    hours = total.active_sec / 3600
+    print(f"user-days:              {args.users * args.days:,}")
+    print(f"simulated active time:  {hours:,.0f} h in {wall:.2f} s ({hours / wall:,.0f} h/s)")
+    print(f"reminders:              {total.reminders:,}")
+    print(f"reports:                {reports:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
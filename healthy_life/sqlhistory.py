@@ -0,0 +1,235 @@
+"""可选的 SQLite 历史库：会话与饮水 / 活动 / 暂停事件存在一个 WAL 模式的数据库里，按日期区间走索引查询。
+
+写入接口与 :class:`~healthy_life.history.HistoryStore` 相同（append / flush / close），
+两者可以互换（见 :func:`~healthy_life.history.open_history`）。界面线程上的 ``append``
+只把事件放进列表；``flush`` 把这一批交给后台线程，在一个事务里提交，界面不等磁盘。
+
+表结构::
+
+    sessions(id, start_ts, end_ts, day)             每场会话；未结束（或进程崩溃）的 end_ts 为 NULL
+    events(ts, day, kind, amount, session)          ts 为 epoch 毫秒，day 为本地日期 YYYY-MM-DD
+    索引 events(day, kind, ts)、events(session, ts)、sessions(day, start_ts)
+
+查询示例::
+
+    db = SqliteHistory(HISTORY_DB_PATH)
+    db.intake_per_day(90)                                   # 最近 90 天每天的饮水量
+    db.longest_sedentary(datetime(2025, 11, 1), datetime.now())   # 本月最长久坐
+"""
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from .events import Row, to_ms
+from .history import KIND_END, KIND_MOVE, KIND_SIP, KIND_START, DayColumns, _numpy
+from .metrics import METRICS
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id       INTEGER PRIMARY KEY,
+    start_ts INTEGER NOT NULL,
+    end_ts   INTEGER,
+    day      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    ts      INTEGER NOT NULL,
+    day     TEXT NOT NULL,
+    kind    INTEGER NOT NULL,
+    amount  INTEGER NOT NULL DEFAULT 0,
+    session INTEGER REFERENCES sessions(id)
+);
+CREATE INDEX IF NOT EXISTS events_day_kind_ts ON events(day, kind, ts);
+CREATE INDEX IF NOT EXISTS events_session_ts ON events(session, ts);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions(day, start_ts);
+"""
+
+_M_COMMIT_MS = METRICS.histogram("hla_history_commit_ms", "SQLite history batch commit time (ms)")
+_M_ROWS = METRICS.counter("hla_history_rows_total", "Events written to the SQLite history")
+
+_Pending = Tuple[int, str, int, int]      # (ts 毫秒, 本地日期, kind, amount)
+
+
+class Gap(NamedTuple):
+    sec: float
+    start: datetime
+    end: datetime
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL：断电最多丢最后几批（事件日志里还有），数据库本身不会损坏
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SqliteHistory:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _connect(self.path) as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.close()
+        self._pending: List[_Pending] = []
+        self._cond = threading.Condition()
+        self._queue: List[List[_Pending]] = []
+        self._busy = False
+        self._closed = False
+        self.batches = 0
+        self.errors = 0
+        self.last_error: Optional[sqlite3.Error] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._thread = threading.Thread(target=self._run, name="history-sqlite", daemon=True)
+        self._thread.start()
+
+    # ---------- 写入（界面线程） ----------
+    def append(self, when: datetime, kind: int, amount: int = 0) -> None:
+        self._pending.append((to_ms(when), when.date().isoformat(), kind, amount))
+
+    def flush(self, wait: bool = False) -> None:
+        """把已 append 的事件交给后台线程提交；``wait=True`` 时等到落盘为止。"""
+        with self._cond:
+            if self._pending:
+                self._queue.append(self._pending)
+                self._pending = []
+                self._cond.notify()
+            if wait:
+                while (self._queue or self._busy) and self._thread.is_alive():
+                    self._cond.wait(0.5)
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # ---------- 后台线程 ----------
+    def _run(self) -> None:
+        conn = _connect(self.path)
+        row = conn.execute(
+            "SELECT id FROM sessions WHERE end_ts IS NULL ORDER BY start_ts DESC LIMIT 1").fetchone()
+        session = row[0] if row else None      # 上次退出时仍在进行的会话
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    batch = self._queue.pop(0)
+                    self._busy = True
+                try:
+                    with METRICS.timer(_M_COMMIT_MS):
+                        session = self._commit(conn, batch, session)
+                    self.batches += 1
+                    _M_ROWS.inc(len(batch))
+                except sqlite3.Error as exc:
+                    # 历史库只是事件日志的副本：记下错误，丢掉这一批，不影响界面
+                    self.errors += 1
+                    self.last_error = exc
+                finally:
+                    with self._cond:
+                        self._busy = False
+                        self._cond.notify_all()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, batch: List[_Pending], session: Optional[int]) -> Optional[int]:
+        with conn:      # 一批一个事务
+            rows = []
+            for ts, day, kind, amount in batch:
+                if kind == KIND_START:
+                    if rows:
+                        conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+                        rows = []
+                    session = conn.execute(
+                        "INSERT INTO sessions (start_ts, day) VALUES (?, ?)", (ts, day)).lastrowid
+                rows.append((ts, day, kind, amount, session))
+                if kind == KIND_END and session is not None:
+                    conn.execute("UPDATE sessions SET end_ts = ? WHERE id = ?", (ts, session))
+                    session = None
+            conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+        return session
+
+    # ---------- 查询（调用方线程，WAL 下读写互不阻塞） ----------
+    def _db(self) -> sqlite3.Connection:
+        if self._reader is None:
+            self._reader = _connect(self.path)
+        return self._reader
+
+    def per_day(self, kind: int, first: date, last: date) -> List[Tuple[date, int, int]]:
+        """[first, last] 内每天某类事件的 (日期, 次数, amount 合计)；没有记录的天不出现。"""
+        cur = self._db().execute(
+            "SELECT day, COUNT(*), TOTAL(amount) FROM events "
+            "WHERE day BETWEEN ? AND ? AND kind = ? GROUP BY day ORDER BY day",
+            (first.isoformat(), last.isoformat(), kind))
+        return [(date.fromisoformat(d), n, int(total)) for d, n, total in cur]
+
+    def intake_per_day(self, days: int = 90, today: Optional[date] = None) -> List[Tuple[date, int]]:
+        """最近 ``days`` 天（含今天）每天的饮水量（ml），没有记录的天为 0。"""
+        today = today or date.today()
+        first = today - timedelta(days=days - 1)
+        got = {d: ml for d, _, ml in self.per_day(KIND_SIP, first, today)}
+        return [(first + timedelta(days=i), got.get(first + timedelta(days=i), 0)) for i in range(days)]
+
+    def longest_sedentary(self, start: datetime, end: datetime) -> Optional[Gap]:
+        """[start, end) 内开始的会话里最长的久坐间隔，口径与 :meth:`Report.from_events` 相同。
+
+        每场会话的间隔为开始→活动、活动→活动，以及最后一次活动（或开始）→会话结束；
+        没有 end 的会话（进行中或进程崩溃）结束于下一场开始，都不超过 ``end``。
+        """
+        lo, hi = to_ms(start), to_ms(end)
+        row = self._db().execute(
+            "WITH s AS ("
+            "  SELECT id, start_ts, MIN(COALESCE(end_ts, LEAD(start_ts) OVER (ORDER BY start_ts), ?), ?) AS stop"
+            "  FROM sessions WHERE day BETWEEN ? AND ? AND start_ts >= ? AND start_ts < ?"
+            "), p AS ("
+            "  SELECT e.session, e.ts FROM s JOIN events e ON e.session = s.id"
+            "  AND e.ts >= s.start_ts AND e.ts < s.stop WHERE e.kind IN (?, ?)"
+            "  UNION ALL SELECT id, stop FROM s"
+            ") "
+            "SELECT ts - prev, prev, ts FROM ("
+            "  SELECT ts, LAG(ts) OVER (PARTITION BY session ORDER BY ts) AS prev FROM p"
+            ") WHERE prev IS NOT NULL ORDER BY 1 DESC LIMIT 1",
+            (hi, hi, start.date().isoformat(), end.date().isoformat(), lo, hi,
+             KIND_START, KIND_MOVE)).fetchone()
+        if row is None:
+            return None
+        gap, a, b = row
+        return Gap(gap / 1000, datetime.fromtimestamp(a / 1000), datetime.fromtimestamp(b / 1000))
+
+    def sessions(self, start: datetime, end: datetime) -> List[Tuple[datetime, Optional[datetime]]]:
+        """[start, end) 内开始的会话 (开始, 结束)；未结束的为 None。"""
+        cur = self._db().execute(
+            "SELECT start_ts, end_ts FROM sessions WHERE day BETWEEN ? AND ? "
+            "AND start_ts >= ? AND start_ts < ? ORDER BY start_ts",
+            (start.date().isoformat(), end.date().isoformat(), to_ms(start), to_ms(end)))
+        return [(datetime.fromtimestamp(a / 1000), None if b is None else datetime.fromtimestamp(b / 1000))
+                for a, b in cur]
+
+    def rows(self, start: datetime, end: datetime) -> Iterator[Row]:
+        """[start, end) 内的全部事件 (ts_ms, kind, amount)，按时间顺序。"""
+        return iter(self._db().execute(
+            "SELECT ts, kind, amount FROM events WHERE day BETWEEN ? AND ? AND ts >= ? AND ts < ? "
+            "ORDER BY ts",
+            (start.date().isoformat(), end.date().isoformat(), to_ms(start), to_ms(end))))
+
+    def load_range(self, start: datetime, end: datetime) -> DayColumns:
+        """与 HistoryStore.load_range 相同的三列，供 analytics 使用。需要 NumPy。"""
+        np = _numpy()
+        ts, kind, amount = [], [], []
+        for t, k, a in self.rows(start, end):
+            ts.append(t)
+            kind.append(k)
+            amount.append(a)
+        return DayColumns(np.array(ts, dtype="<i8"), np.array(kind, dtype="u1"), np.array(amount, dtype="<i4"))
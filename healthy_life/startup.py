@@ -0,0 +1,34 @@
+"""启动阶段计时：记录每个阶段的耗时，写成 JSON 便于在慢机器上排查启动速度。"""
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StartupProfile:
+    def __init__(self, t0: Optional[float] = None):
+        self.t0 = time.perf_counter() if t0 is None else t0   # 进程开始计时的时刻
+        self._last = self.t0
+        self.stages: List[Tuple[str, float]] = []   # (阶段名, 毫秒)
+
+    def mark(self, stage: str) -> None:
+        """结束一个阶段：记录从上一个阶段结束到现在的耗时。"""
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000))
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.t0) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "stages_ms": {name: round(ms, 2) for name, ms in self.stages},
+            "total_ms": round(self.total_ms, 2),
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
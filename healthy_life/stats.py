@@ -0,0 +1,104 @@
+"""会话统计的在线累加器：每次记录 O(1) 更新，生成报告时 O(1) 读取。"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+class GapSketch:
+    """对数分桶的流式分位数草图（DDSketch 思路）。
+
+    每个样本只落入一个桶，分位数的相对误差不超过 ``alpha``；
+    内存只与数值跨度有关，与样本数无关。
+    """
+
+    __slots__ = ("alpha", "_gamma", "_log_gamma", "_buckets", "_zeros", "count")
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zeros = 0          # 0 秒（或负数）单独计数
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self._zeros += 1
+            return
+        idx = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[idx] = self._buckets.get(idx, 0) + 1
+
+    def merge(self, other: "GapSketch") -> None:
+        self.count += other.count
+        self._zeros += other._zeros
+        for idx, n in other._buckets.items():
+            self._buckets[idx] = self._buckets.get(idx, 0) + n
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen or not self._buckets:
+            return 0.0
+        for idx in sorted(self._buckets):
+            seen += self._buckets[idx]
+            if rank < seen:
+                break
+        # 桶 (γ^(i-1), γ^i] 的代表值，相对误差 ≤ alpha
+        return 2 * self._gamma ** idx / (self._gamma + 1)
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        return [self.quantile(q) for q in qs]
+
+
+class SessionStats:
+    """饮水次数 / 总量、活动次数、久坐间隔（最长、平均、分位数）。"""
+
+    __slots__ = ("start", "sips", "intake", "moves", "first_move", "last_move",
+                 "longest_gap", "gaps")
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.reset(start)
+
+    def reset(self, start: Optional[datetime] = None) -> None:
+        self.start = start
+        self.sips = 0
+        self.intake = 0
+        self.moves = 0
+        self.first_move: Optional[datetime] = None
+        self.last_move: Optional[datetime] = None
+        self.longest_gap = 0.0      # 已经结束的久坐间隔中最长的一段（秒）
+        self.gaps = GapSketch()     # 已结束间隔的分布（开始→第一次活动、活动→活动）
+
+    def add_sip(self, ml: int) -> None:
+        self.sips += 1
+        self.intake += ml
+
+    def add_move(self, when: datetime) -> None:
+        prev = self.last_move or self.start
+        if prev is not None:
+            gap = (when - prev).total_seconds()
+            self.gaps.add(gap)
+            if gap > self.longest_gap:
+                self.longest_gap = gap
+        if self.first_move is None:
+            self.first_move = when
+        self.last_move = when
+        self.moves += 1
+
+    def current_gap(self, now: datetime) -> float:
+        """从最近一次活动（或开始）到 now 已经坐了多久。"""
+        prev = self.last_move or self.start
+        return 0.0 if prev is None else max(0.0, (now - prev).total_seconds())
+
+    def longest_gap_until(self, now: datetime) -> float:
+        """截至 now 的最长久坐间隔，包含仍在进行中的这一段。"""
+        return max(self.longest_gap, self.current_gap(now))
+
+    def avg_move_gap(self, elapsed: float) -> float:
+        """相邻两次活动的平均间隔；不足两次活动时按总时长均分。"""
+        if self.moves >= 2:
+            return (self.last_move - self.first_move).total_seconds() / (self.moves - 1)
+        return elapsed / max(1, self.moves)
@@ -1,13 +1,15 @@
-import json
 import os
 import sys
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
-from PyQt5.QtCore import Qt, QTimer, QSize
-from PyQt5.QtGui import QIcon, QPixmap, QMovie
+_PROCESS_T0 = time.perf_counter()   # 启动计时起点：在导入 PyQt5 之前
+
+from PyQt5.QtCore import Qt, QTimer, QSize, QRect, QEvent, QObject, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QColor, QIcon, QImage, QPixmap, QMovie, QPainter
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QSpinBox, QComboBox, QPushButton, QProgressBar, QDialog,
@@ -15,51 +17,50 @@ from PyQt5.QtWidgets import (
     QGroupBox, QToolButton,
 )
 
+from healthy_life.bundle import AssetBundle, Variant, asset_key
+from healthy_life.clock import ActiveClock
+from healthy_life.config import (
+    APP_NAME, APP_DIR, ASSET_BUNDLE_NAME, JOURNAL_PATH, STARTUP_PROFILE_PATH,
+    METRICS_PROM_PATH, METRICS_JSON_PATH, REPORT_FORMATS, SETTINGS_PATH,
+    LANG_EN, LANG_ZH, HYDRATE_INTERVALS_SEC, SED_INTERVALS_SEC, Settings,
+)
+from healthy_life.export import ExportJob, ReportExporter
+from healthy_life.history import KIND_BY_NAME, open_history
+from healthy_life.i18n import t
+from healthy_life.journal import (
+    EventJournal, JournalState,
+    EV_START, EV_END, EV_SIP, EV_MOVE, EV_PAUSE, EV_RESUME,
+)
+from healthy_life.metrics import METRICS
+from healthy_life.persist import WriteBehind
+from healthy_life.report import WRITERS, report_path
+from healthy_life.scheduler import REMINDER_WATER, REMINDER_MOVE
+from healthy_life.session import ReminderSession
+from healthy_life.startup import StartupProfile
+
 
 # ----------------------------- Constants ----------------------------- #
-APP_NAME = "健康生活小助手"
-APP_DIR = Path(os.getenv("APPDATA", Path.home())) / "HealthyLifeAssistant"
-SETTINGS_PATH = APP_DIR / "settings.json"
-
-LANG_EN, LANG_ZH = "EN", "ZH"
 DEBUG_TEST_BUTTONS = False
-
-
-# 新增：喝水提醒间隔（秒），含 10s/20s 测试选项
-HYDRATE_INTERVALS_SEC = {
-    LANG_EN: [
-        (10,  "10 s (test)"), 
-        (30 * 60, "30 Min"),
-        (60 * 60, "1 Hour"),
-        (90 * 60, "1.5 Hour"),
-        (120*60,  "2 Hours"),
-    ],
-    LANG_ZH: [
-        (10,  "10 秒（测试）"),
-        (30 * 60, "30分钟"),
-        (60 * 60, "1小时"),
-        (90 * 60, "1.5 小时"),
-        (120*60,  "2 小时"),
-    ],
-}
-
-# 新增：久坐提醒间隔（秒），含 10s/20s 测试选项
-SED_INTERVALS_SEC = {
-    LANG_EN: [
-        (10,      "10 s (test)"),
-        (45 * 60, "45 Min"),
-        (60 * 60, "1 Hour"),
-        (75 * 60, "1 Hour 15 Min"),
-        (90 * 60, "1 Hour 30 Min"),
-    ],
-    LANG_ZH: [
-        (10,      "10 秒（测试）"),
-        (45 * 60, "45分钟"),
-        (60 * 60, "1小时"),
-        (75 * 60, "1小时15分"),
-        (90 * 60, "1小时30分"),
-    ],
+SUSPEND_HEARTBEAT_SEC = 30      # 会话进行中检测系统挂起的心跳间隔
+SETTINGS_WRITE_DELAY_SEC = 0.5  # 这段时间内的多次设定修改合并成一次写盘
+EXPORT_DRAIN_SEC = 10           # 退出时最多等后台报告导出这么久，之后取消
+METRICS_EXPORT_SEC = 60         # 启用指标时写出 metrics.prom / metrics.json 的间隔
+ACTIVITY_ICON_PX = 65           # 活动图标边长
+ACTIVITY_ICONS_VISIBLE = 12     # 活动条最多画几个图标，其余合并成“+k”角标
+
+# ---- 运行指标（HEALTHY_LIFE_METRICS=1 时启用，否则都是空操作） ---- #
+M_TICK_JITTER = METRICS.histogram("hla_tick_jitter_ms", "elapsed_timer deviation from the 1 s beat (ms)")
+M_POPUP_SHOW = METRICS.histogram("hla_popup_show_ms", "Time to prepare and show a reminder popup (ms)")
+M_REMINDER_LATE = METRICS.histogram(
+    "hla_reminder_lateness_ms", "Reminder firing time past its deadline (ms)",
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000, 30000, 60000),
+)
+M_REMINDERS = {
+    kind: METRICS.counter("hla_reminders_total", "Reminders fired", kind=kind)
+    for kind in (REMINDER_WATER, REMINDER_MOVE)
 }
+M_WIDGET_UPDATES = METRICS.counter("hla_widget_updates_total", "Widget setters actually called")
+M_WIDGET_SKIPPED = METRICS.counter("hla_widget_updates_skipped_total", "Widget setters skipped (value unchanged)")
 
 STYLE_QSS = """
     /* 全局：浅色 Apple 风格 */
@@ -173,105 +174,17 @@ STYLE_QSS = """
     QScrollArea {
         border: none;
     }
-"""
-
-TRANSLATIONS = {
-    LANG_EN: {
-        "app_name": "Healthy Life Assistant — Hydration & Anti-sedentary",
-        "title": "Health Reminder",
-        "reco_title": "Daily Water Intake Recommendation",
-        "reco_text": (
-            "In general conditions, the Chinese Dietary Guidelines (2022) suggest "
-            "about <b>1700 ml</b> per day for adult men and <b>1500 ml</b> for adult women. "
-            'See details: <a href="http://dg.cnsoc.org/article/04/wDCyy7cWSJCN6pwKHOo5Dw.html">Chinese Dietary Guidelines (2022)</a>'
-        ),
-        "sed_title": "Why Break Up Sitting",
-        "sed_text": (
-            "<ul>"
-            "<li><b>Vascular/Cardio</b>: Standing up every 60 min can improve endothelial function and lower CVD risk.</li>"
-            "<li><b>Spine/Muscles</b>: Brief hourly movement reduces neck and low-back discomfort.</li>"
-            "<li><b>Metabolism</b>: ~6 min of light activity each hour helps lower post-meal glucose and insulin.</li>"
-            "</ul>"
-        ),
-        "settings_title": "Health Settings",
-        "settings_hint": (
-            "Enter your daily water goal and sip size, choose the break interval, then click “Start”. "
-            "Closing the window hides it to the tray; to fully exit, right-click the tray icon and choose “Quit”."
-        ),
-        "progress_section": "Progress",
-        "water_goal": "Daily Water Goal (ml)",
-        "sip_size": "Sip Size (ml)",
-        "water_interval": "💧Hydration Reminder Interval",
-        "interval": "🪑Sedentary Break Interval",
-        "start": "Start", "pause": "Pause", "resume": "Resume", "log_sip": "Log Sip",
-        "hydrate_time": "Hydration Time!", "move_break": "Move Break!",
-        "progress": "You've drank {}/{} ml",
-        "log_move": "Log Activity",
-        "move_msg": "Stand up and stretch — good for blood flow and spine!",
-        "language": "Language", "show": "Show", "quit": "Quit",
-        "started": "Reminders started.", "paused": "Reminders paused.", "resumed": "Reminders resumed.",
-        "goal_done": "Goal Achieved!", "reset_title": "Reset", "reset_msg": "Defaults applied.",
-        "tray_tooltip": "Health Reminder",
-        "elapsed_desc": "Elapsed Time",
-        "water_log_desc": "Water Log",
-        "activity_log_desc": "Activity Log",
-        "activity_count_fmt": "x{}",  # 显示为 x1, x2...
-        "finish_day": "End Day",
-        "report_title": "Daily Health Report",
-        "report_saved": "Report saved to:\n{}",
-        "logged_sip": "Hydration logged.",
-        "logged_move": "Activity logged.",
-        "welcome_title": "Welcome",
-        "welcome_msg": "Welcome to Healthy Life Assistant.",
-    },
-    LANG_ZH: {
-        "app_name": "健康生活小助手：提醒喝水·避免久坐",
-        "title": "健康生活小助手",
-        "reco_title": "每日足量饮水 & 避免久坐",
-        "reco_text": (
-            '<a href="http://dg.cnsoc.org/article/04/wDCyy7cWSJCN6pwKHOo5Dw.html">中国居民膳食指南（2022）</a>建议一般情况下，'
-            "成年男性每天应饮水约<b>1700毫升</b>，成年女性每天应饮水约<b>1500毫升</b>。久坐对健康有害，<b>心血管</b>：长时间久坐与更高的心血管事件和全因死亡风险相关。<b>腰痛/颈痛</b>：尽量“多动少坐”可以减轻颈背/腰背僵硬与不适。<b>代谢</b>：打断久坐（例如每30-60分钟活动1–2分钟），能显著降低餐后血糖等代谢指标。"
-            "健康的饮水频率应以<b>少量多次</b>为原则。"
-        ),
-        "settings_title": "健康设定",
-        "settings_hint": (
-            "<ul>"
-            "<li><b>个人健康设定</b>：根据水杯容量设置「每次饮水量」，再设置「每日饮水目标」[饮水间隔]和[久坐提醒间隔]。</li>"
-            "<li><b>点击“开始”</b>：开始计时会<b>锁定设置</b>；<u>若需修改请点“重置”</u>；离开可点“暂停”，返回后点“继续”。关闭窗口会隐藏到托盘；右键托盘可 显示/暂停/记录一口/记录活动/退出。</li>"
-            "<li><b>结束/下班</b>：点击后生成当日健康报告，可保存本地。</li>"
-            "</ul>"
-        ),
-        "progress_section": "进度",
-        "water_goal": "每日饮水目标 (ml)",
-        "sip_size": "每次饮水量 (ml)",
-        "water_interval": "💧喝水提醒间隔",
-        "interval": "🪑久坐提醒间隔",
-        "start": "开始", "pause": "暂停", "resume": "继续", "log_sip": "记录一杯",
-        "hydrate_time": "喝水时间！", "move_break": "动一动！",
-        "progress": "已饮 {}/{} ml",
-        "log_move": "记录活动",
-        "move_msg": "来活动活动！",
-        "language": "语言", "show": "显示主界面", "quit": "退出",
-        "started": "提醒已启动。", "paused": "提醒已暂停。", "resumed": "提醒已继续。",
-        "goal_done": "目标达成！", "reset_title": "重置", "reset_msg": "欢迎使用健康小助手，默认设置已应用。",
-        "tray_tooltip": "健康提醒",
-        "elapsed_desc": "已运行时间",
-        "water_log_desc": "饮水记录",
-        "activity_log_desc": "活动记录",
-        "activity_count_fmt": "{} 次",  # 显示为 1 次, 2 次...
-        "finish_day": "结束/下班",
-        "report_title": "当日健康活动报告",
-        "report_saved": "报告已保存到：\n{}",
-        "logged_sip": "饮水已记录。",
-        "logged_move": "活动已记录。",
-        "welcome_title": "欢迎使用",
-        "welcome_msg": "欢迎使用健康小助手",
-    },
-}
-
 
-def t(lang: str, key: str) -> str:
-    return TRANSLATIONS.get(lang, TRANSLATIONS[LANG_EN]).get(key, key)
+    /* 状态颜色由动态属性 state 决定（ViewSync.state），不再给单个控件设样式表 */
+    #StateLabel {
+        font-weight: 600;
+        font-size: 14pt;
+    }
+    #StateLabel[state="idle"]    { color: #6B7280; }
+    #StateLabel[state="paused"]  { color: #F97316; }
+    #StateLabel[state="running"] { color: #16A34A; }
+    #ElapsedLabel[state="paused"] { color: #9CA3AF; }
+"""
 
 
 def resource_path(rel_path: str) -> str:
@@ -279,52 +192,546 @@ def resource_path(rel_path: str) -> str:
     return os.path.join(base, rel_path)
 
 
-# ----------------------------- Settings ----------------------------- #
-@dataclass
-class Settings:
-    goal: int = 1700
-    sip_size: int = 250
-    interval_min: int = 60
-    water_progress: int = 0
-    last_reset: str = str(datetime.now().date())
-    language: str = LANG_ZH
+# ----------------------------- Assets ----------------------------- #
+_UNSET = object()
 
-    @staticmethod
-    def load() -> "Settings":
-        APP_DIR.mkdir(parents=True, exist_ok=True)
-        s = Settings()      # 保持“每次启动即默认”的行为
-        s.save()
-        return s
-
-    def save(self) -> None:
-        SETTINGS_PATH.write_text(
-            json.dumps(asdict(self), ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
 
+class FrameMovie(QObject):
+    """资源包里预缩放帧序列的播放器。
+
+    只实现本程序用到的那部分 QMovie 接口（start / stop / setPaused / state /
+    currentPixmap / frameChanged），活动条和弹窗不区分两者。帧在第一次播放时
+    才转成 QPixmap，之后循环复用（相当于 QMovie.CacheAll）。
+    """
+
+    frameChanged = pyqtSignal(int)
+
+    def __init__(self, load_frames: Callable[[], List[Tuple[QPixmap, int]]], parent=None):
+        super().__init__(parent)
+        self._load = load_frames
+        self._frames: List[Tuple[QPixmap, int]] = []
+        self._index = 0
+        self._state = QMovie.NotRunning
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._advance)
+
+    def state(self):
+        return self._state
+
+    def currentPixmap(self) -> QPixmap:
+        return self._frames[self._index][0] if self._frames else QPixmap()
+
+    def start(self) -> None:
+        if self._state == QMovie.Running:
+            return
+        if not self._frames:
+            self._frames = self._load()
+            if not self._frames:
+                return
+        self._index = 0
+        self._state = QMovie.Running
+        self.frameChanged.emit(0)
+        self._schedule()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._state = QMovie.NotRunning
+
+    def setPaused(self, paused: bool) -> None:
+        if paused and self._state == QMovie.Running:
+            self._timer.stop()
+            self._state = QMovie.Paused
+        elif not paused and self._state == QMovie.Paused:
+            self._state = QMovie.Running
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if len(self._frames) > 1:
+            self._timer.start(self._frames[self._index][1] or 100)   # 与 QMovie 一致：无延时按 100 ms
+
+    def _advance(self) -> None:
+        self._index = (self._index + 1) % len(self._frames)
+        self.frameChanged.emit(self._index)
+        self._schedule()
+
+
+class AssetCache:
+    """进程内共享的图片缓存：每张图按目标尺寸只解码、缩放一次。
+
+    有预缩放资源包（tools/build_assets.py 生成）时优先按键从包里取，按屏幕 DPI
+    选变体，不再解码原图；包里没有的才从 images/ 加载并在运行时缩放。
+    GIF 按尺寸共享同一个 QMovie（或 FrameMovie），所有活动小图标共用一个帧源。
+    """
+
+    def __init__(self, root: Optional[str] = None, bundle_path: Optional[str] = None):
+        self._root = root
+        self._bundle_path = bundle_path or self._path(ASSET_BUNDLE_NAME)
+        self._bundle = _UNSET
+        self._pixmaps: Dict[Tuple[str, int, int], QPixmap] = {}
+        self._movies: Dict[Tuple[str, int, int], QMovie] = {}
+        self._icons: Dict[str, QIcon] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bundle_hits = 0
+
+    def _path(self, rel_path: str) -> str:
+        return os.path.join(self._root, rel_path) if self._root else resource_path(rel_path)
+
+    @property
+    def bundle(self) -> Optional[AssetBundle]:
+        if self._bundle is _UNSET:    # 第一次用到图片时才映射
+            self._bundle = AssetBundle.open(self._bundle_path)
+        return self._bundle
+
+    def _variant(self, rel_path: str, width: int, height: int):
+        bundle = self.bundle
+        if bundle is None:
+            return None
+        app = QApplication.instance()
+        dpr = app.devicePixelRatio() if app is not None else 1.0
+        v = bundle.variant(asset_key(rel_path, width, height), dpr)
+        if v is not None:
+            self.bundle_hits += 1
+        return v
+
+    def _frame_pixmap(self, v: Variant, frame) -> QPixmap:
+        data = self.bundle.data(frame)
+        if v.codec == "raw":
+            # 像素已是预乘 ARGB32：只包一层 QImage，fromImage 时复制一次，不解码
+            img = QImage(data.tobytes(), v.width, v.height, v.width * 4, QImage.Format_ARGB32_Premultiplied)
+            pix = QPixmap.fromImage(img)
+        else:
+            pix = QPixmap()
+            pix.loadFromData(data.tobytes(), v.codec.upper())
+        pix.setDevicePixelRatio(v.dpr)
+        return pix
+
+    def pixmap(self, rel_path: str, width: int = 0, height: int = 0) -> QPixmap:
+        """按比例缩放到 width×height 以内；width 为 0 时只按高度缩放。"""
+        key = (rel_path, width, height)
+        pix = self._pixmaps.get(key)
+        if pix is not None:
+            self.hits += 1
+            return pix
+        self.misses += 1
+        v = self._variant(rel_path, width, height)
+        if v is not None:
+            pix = self._frame_pixmap(v, v.frames[0])
+        else:
+            pix = QPixmap(self._path(rel_path))
+            if not pix.isNull() and height:
+                if width:
+                    pix = pix.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                else:
+                    pix = pix.scaledToHeight(height, Qt.SmoothTransformation)
+        self._pixmaps[key] = pix
+        return pix
+
+    def icon(self, rel_path: str) -> QIcon:
+        ico = self._icons.get(rel_path)
+        if ico is not None:
+            self.hits += 1
+            return ico
+        self.misses += 1
+        ico = self._icons[rel_path] = QIcon(self._path(rel_path))
+        return ico
+
+    def movie(self, rel_path: str, width: int, height: int) -> QMovie:
+        """同一 GIF、同一尺寸返回同一个 QMovie（包里有预缩放帧时是 FrameMovie）；调用方只负责 start/stop。"""
+        key = (rel_path, width, height)
+        mv = self._movies.get(key)
+        if mv is not None:
+            self.hits += 1
+            return mv
+        self.misses += 1
+        v = self._variant(rel_path, width, height)
+        if v is not None:
+            mv = FrameMovie(lambda: [(self._frame_pixmap(v, f), f[2]) for f in v.frames])
+        else:
+            mv = QMovie(self._path(rel_path))
+            mv.setCacheMode(QMovie.CacheAll)   # 帧解码一次后循环复用
+            mv.setScaledSize(QSize(width, height))
+        self._movies[key] = mv
+        return mv
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bundle_hits": self.bundle_hits,
+            "pixmaps": len(self._pixmaps),
+            "movies": len(self._movies),
+            "movies_running": sum(
+                1 for mv in self._movies.values() if mv.state() == QMovie.Running
+            ),
+        }
+
+
+ASSETS = AssetCache()
+METRICS.gauge("hla_qmovies_live", "Live shared QMovie instances").set_function(
+    lambda: ASSETS.stats()["movies"])
+METRICS.gauge("hla_qmovies_running", "Shared QMovie instances currently playing").set_function(
+    lambda: ASSETS.stats()["movies_running"])
+
+
+# ----------------------------- View sync ----------------------------- #
+
+
+class ViewSync:
+    """界面写入的去重层：记住每个控件上次设置的值，值没变就不调用 setter。
+
+    状态颜色用动态属性（``state``）配合全局 QSS 选择器，只在属性变化时
+    重新 polish 这一个控件，避免逐控件 setStyleSheet 触发整套样式重新解析。
+    只能用于生命周期与窗口相同的控件（按 id 记忆）；会被重建的对象直接调用 setter。
+    """
 
-# ----------------------------- Main Window ----------------------------- #
-class MainWindow(QMainWindow):
     def __init__(self):
-        super().__init__()
-        self.settings = Settings.load()
-        self.running = False
-        self.paused = False
+        self._last: Dict[Tuple[int, str], object] = {}
+        self.updates = 0
+        self.skipped = 0
+
+    def set(self, widget, setter: str, value) -> bool:
+        key = (id(widget), setter)
+        if self._last.get(key, _UNSET) == value:
+            self.skipped += 1
+            M_WIDGET_SKIPPED.inc()
+            return False
+        self._last[key] = value
+        getattr(widget, setter)(value)
+        self.updates += 1
+        M_WIDGET_UPDATES.inc()
+        return True
+
+    def text(self, widget, value: str) -> bool:
+        return self.set(widget, "setText", value)
+
+    def state(self, widget, value: str) -> bool:
+        key = (id(widget), "state")
+        if self._last.get(key, _UNSET) == value:
+            self.skipped += 1
+            M_WIDGET_SKIPPED.inc()
+            return False
+        self._last[key] = value
+        widget.setProperty("state", value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        self.updates += 1
+        M_WIDGET_UPDATES.inc()
+        return True
+
+
+# ----------------------------- Activity strip ----------------------------- #
+class ActivityStrip(QWidget):
+    """活动图标条：一个控件按计数画出 N 个图标，帧来自共享的 QMovie（或 FrameMovie）。
+
+    最多画 ``max_visible`` 个，其余合并成“+k”角标；无论记了多少次活动都只有
+    这一个控件，清空就是把计数归零。动画的播放 / 暂停由窗口按可见性管理。
+    """
+
+    def __init__(self, movie: QMovie, icon_px: int = ACTIVITY_ICON_PX,
+                 max_visible: int = ACTIVITY_ICONS_VISIBLE, spacing: int = 6, parent=None):
+        super().__init__(parent)
+        self.movie = movie
+        self._px = icon_px
+        self._max = max(1, max_visible)
+        self._spacing = spacing
+        self._count = 0
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        font = self.font()
+        font.setBold(True)      # 角标文字；量宽度与绘制用同一字体
+        self.setFont(font)
+        movie.frameChanged.connect(self._on_frame)
+
+    def count(self) -> int:
+        return self._count
+
+    def hidden_count(self) -> int:
+        return max(0, self._count - self._max)
+
+    def set_count(self, n: int) -> None:
+        n = max(0, n)
+        if n == self._count:
+            return
+        layout = self._layout_key()
+        self._count = n
+        if self._layout_key() != layout:
+            self.updateGeometry()
+        self.update()
+
+    def add(self, n: int = 1) -> None:
+        self.set_count(self._count + n)
+
+    def clear(self) -> None:
+        self.set_count(0)
+
+    # ---------- 绘制 ----------
+    def _layout_key(self) -> Tuple[int, int]:
+        # 只有图标个数或角标位数变化时尺寸才会变
+        hidden = self.hidden_count()
+        return min(self._count, self._max), len(str(hidden)) if hidden else 0
+
+    def _badge_text(self) -> str:
+        return f"+{self.hidden_count()}"
+
+    def _badge_width(self) -> int:
+        return max(self._px // 2, self.fontMetrics().horizontalAdvance(self._badge_text()) + 16)
 
-        self.paused_at: Optional[datetime] = None
-        self.water_times: List[datetime] = []   # 记录每次“记录一口”的时间戳
-        self.move_times: List[datetime] = []    # 记录每次“记录活动”的时间戳
+    def _icons_width(self) -> int:
+        n = min(self._count, self._max)
+        return n * self._px + max(0, n - 1) * self._spacing
 
-        self.paused_accum = 0.0          # 累积暂停秒数（float）
+    def sizeHint(self) -> QSize:
+        w = self._icons_width()
+        if self.hidden_count():
+            w += self._spacing + self._badge_width()
+        return QSize(w, self._px)
 
-        # 用“活动时间（进度栏时间）”来控制弹窗
-        self.water_interval_sec = int(1.5 * 60 * 60)   # 喝水提醒间隔（秒）
-        self.sedentary_interval_sec = self.settings.interval_min * 60  # 久坐提醒间隔（秒）
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
 
-        self.next_water_due: Optional[float] = None   # 下一次喝水提醒需要达到的“已运行秒数”
-        self.next_move_due: Optional[float] = None    # 下一次久坐提醒需要达到的“已运行秒数”
+    def _on_frame(self, _frame: int) -> None:
+        if self._count and self.isVisible():
+            self.update(0, 0, self._icons_width(), self._px)   # 角标不随帧变化
 
-        self.setWindowTitle(t(self.settings.language, "title"))
+    def paintEvent(self, event):
+        if not self._count:
+            return
+        p = QPainter(self)
+        pix = self.movie.currentPixmap()
+        if not pix.isNull():
+            dy = (self._px - round(pix.height() / pix.devicePixelRatio())) // 2
+            for i in range(min(self._count, self._max)):
+                p.drawPixmap(i * (self._px + self._spacing), dy, pix)
+        if self.hidden_count():
+            h = min(self._px, self.fontMetrics().height() + 10)
+            rect = QRect(self._icons_width() + self._spacing, (self._px - h) // 2, self._badge_width(), h)
+            p.setRenderHint(QPainter.Antialiasing)
+            p.setPen(Qt.NoPen)
+            p.setBrush(QColor("#007AFF"))
+            p.drawRoundedRect(rect, h / 2, h / 2)
+            p.setPen(QColor("#FFFFFF"))
+            p.drawText(rect, Qt.AlignCenter, self._badge_text())
+        p.end()
+
+
+# ----------------------------- Popups ----------------------------- #
+class ExportSignals(QObject):
+    """导出完成时从工作线程发出；接收方在界面线程，Qt 自动排队投递。"""
+    finished = pyqtSignal(object)   # ExportJob
+
+
+class PopupManager(QObject):
+    """非模态提醒弹窗的排队器。
+
+    同一时间最多显示一个弹窗；显示期间到来的提醒进入队列，同类提醒只排一次；
+    排队中（或同一轮事件里同时到期）的喝水 + 久坐提醒合并成一个弹窗。
+    弹窗用 show() 而不是 exec_()，不会开嵌套事件循环，也不会重入调度器。
+
+    每种组合（喝水 / 久坐 / 合并）的弹窗第一次用到时构建，之后关闭只是隐藏，
+    下次 prepare() 刷新内容后复用；dispose() 统一销毁。
+    """
+
+    ORDER = (REMINDER_WATER, REMINDER_MOVE)
+
+    def __init__(self, build: Callable[[Tuple[str, ...]], "ReminderPopup"], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._build = build
+        self._pool: Dict[Tuple[str, ...], ReminderPopup] = {}
+        self._pending: List[str] = []
+        self._current: Optional[ReminderPopup] = None
+        self._current_kinds: Tuple[str, ...] = ()
+
+    def request(self, kind: str) -> None:
+        if kind in self._pending or kind in self._current_kinds:
+            return
+        self._pending.append(kind)
+        if self._current is None:
+            # 推迟到下一轮事件，同一轮里的其它提醒可以一起合并
+            QTimer.singleShot(0, self._show_next)
+
+    def clear(self) -> None:
+        """丢弃排队的提醒并关掉正在显示的弹窗（重置 / 下班时）。"""
+        self._pending.clear()
+        if self._current is not None:
+            self._current.close()
+
+    def _show_next(self) -> None:
+        if self._current is not None or not self._pending:
+            return
+        kinds = tuple(k for k in self.ORDER if k in self._pending)
+        self._pending.clear()
+        dlg = self._pool.get(kinds)
+        if dlg is None:
+            dlg = self._pool[kinds] = self._build(kinds)
+            dlg.finished.connect(self._on_finished)
+        self._current, self._current_kinds = dlg, kinds
+        with METRICS.timer(M_POPUP_SHOW):
+            dlg.prepare()
+            dlg.show()
+            dlg.raise_()
+            dlg.activateWindow()
+
+    def _on_finished(self, _result: int) -> None:
+        if self.sender() is not self._current:
+            return
+        self._current, self._current_kinds = None, ()
+        if self._pending:
+            QTimer.singleShot(0, self._show_next)
+
+    def dispose(self) -> None:
+        """销毁池中所有弹窗（退出时）。"""
+        self.clear()
+        for dlg in self._pool.values():
+            dlg.deleteLater()
+        self._pool.clear()
+
+
+class ReminderPopup(QDialog):
+    """可复用的提醒弹窗：按 kinds 只构建一次，每次显示前 prepare() 刷新文字和进度。"""
+
+    def __init__(self, kinds: Tuple[str, ...], owner: "MainWindow"):
+        super().__init__(owner)
+        self.kinds = kinds
+        self._owner = owner
+        self._water = REMINDER_WATER in kinds
+        self._move = REMINDER_MOVE in kinds
+        self._movie: Optional[QMovie] = None
+
+        self.setWindowIcon(ASSETS.icon("images/logo.png"))
+        self.setFixedSize(650, 650)
+        v = QVBoxLayout(self)
+
+        self.img_label = img_label = QLabel()
+        if self._water:
+            side = 360 if self._move else 475   # 合并弹窗里图片缩小一点，给两组按钮留位置
+            img_label.setPixmap(ASSETS.pixmap("images/water_remind.jpg", side, side))
+        else:
+            # 帧源可能是 QMovie 或资源包里的 FrameMovie，统一按帧信号贴图
+            self._movie = ASSETS.movie("images/sit.gif", 500, 500)
+            self._movie.frameChanged.connect(self._on_frame)
+            self.finished.connect(self._movie.stop)   # 弹窗关掉后不再播放
+        v.addWidget(img_label, alignment=Qt.AlignCenter)
+
+        if self._water:
+            # 喝水：进度 + 进度条 + “记录一口”
+            self.live = QLabel()
+            v.addWidget(self.live, alignment=Qt.AlignCenter)
+            self.bar = QProgressBar()
+            v.addWidget(self.bar)
+            self.sip_btn = QPushButton()
+            self.sip_btn.clicked.connect(self._log_sip)
+            v.addWidget(self.sip_btn, alignment=Qt.AlignCenter)
+
+        if self._move:
+            # 活动：提示文字 + “记录活动”按钮
+            self.msg = QLabel()
+            self.msg.setWordWrap(True)
+            v.addWidget(self.msg, alignment=Qt.AlignCenter)
+            self.move_btn = QPushButton()
+            self.move_btn.clicked.connect(self._log_move)
+            v.addWidget(self.move_btn, alignment=Qt.AlignCenter)
+
+        # 喝水 5 秒、久坐 7 秒后自动关闭（合并时取较长者），也可以手动关；
+        # 提前关闭时停掉，免得隐藏后再误触发 finished
+        self.closer = QTimer(self)
+        self.closer.setSingleShot(True)
+        self.closer.timeout.connect(self.accept)
+        self.finished.connect(self.closer.stop)
+
+    def prepare(self) -> None:
+        owner = self._owner
+        lang = owner.settings.language
+        self.setWindowTitle(" / ".join(
+            ([t(lang, "hydrate_time")] if self._water else [])
+            + ([t(lang, "move_break")] if self._move else [])
+        ))
+        if self._water:
+            self.live.setText(owner._progress_text())
+            self.bar.setValue(owner._progress_pct())
+            self.sip_btn.setText(t(lang, "log_sip"))
+        if self._move:
+            self.msg.setText(t(lang, "move_msg"))
+            self.move_btn.setText(t(lang, "log_move"))
+            self.move_btn.setEnabled(True)
+        if self._movie is not None:
+            self._movie.start()
+        self.closer.start(7000 if self._move else 5000)
+
+    def _on_frame(self, _frame: int):
+        self.img_label.setPixmap(self._movie.currentPixmap())
+
+    def _log_sip(self):
+        self._owner.log_sip()
+        self.live.setText(self._owner._progress_text())
+        self.bar.setValue(self._owner._progress_pct())
+
+    def _log_move(self):
+        self._owner.log_move()
+        if self._water:
+            self.move_btn.setEnabled(False)   # 合并弹窗里还可以继续记录喝水
+        else:
+            self.accept()   # 记录完顺手关掉弹窗
+
+
+# ----------------------------- Main Window ----------------------------- #
+class MainWindow(QMainWindow):
+    def __init__(self, profile: Optional[StartupProfile] = None):
+        super().__init__()
+        # 分阶段启动：先托盘和最小窗口，推荐 / 设定卡片、图片解码等到第一次显示之后
+        self.profile = profile or StartupProfile()
+        self._startup_done = False
+        self.reco_card: Optional[QGroupBox] = None
+        self.form_card: Optional[QGroupBox] = None
+        # 控件写入经 ViewSync 去重；隐藏到托盘时跳过的刷新在重新可见时补齐
+        self.view = ViewSync()
+        self._view_stale = False
+        self._combo_lang: Optional[str] = None   # 两个间隔下拉框当前按哪种语言填充
+
+        # settings.json 由后台线程合并、原子地写出，界面线程只登记内容
+        self.settings_writer = WriteBehind(SETTINGS_PATH, delay=SETTINGS_WRITE_DELAY_SEC)
+        self.settings = Settings.load(self.settings_writer)
+
+        # 会话状态（暂停累计、时间戳、按“活动时间”调度提醒）都在不依赖 Qt 的 session 里
+        self.session = ReminderSession(
+            goal=self.settings.goal,
+            sip_size=self.settings.sip_size,
+            water_interval_sec=int(1.5 * 60 * 60),
+            sedentary_interval_sec=self.settings.interval_min * 60,
+            clock=ActiveClock(stall_sec=2 * SUSPEND_HEARTBEAT_SEC),
+        )
+
+        # 提醒弹窗：非模态、排队、合并，不阻塞调度
+        self.popups = PopupManager(lambda kinds: ReminderPopup(kinds, self), self)
+        self._joboff_dlg: Optional[QDialog] = None
+
+        # 事件日志：记录一口 / 活动只追加一行；fsync 由 journal_timer 攒批触发
+        self.journal = EventJournal(JOURNAL_PATH, snapshot=self._journal_snapshot,
+                                    on_foreign=self._merge_journal_records)
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.timeout.connect(self._sync_logs)
+        # 命令行追加记录时立刻收下（压缩会 rename 替换文件，监视在回调里重新加上）
+        self.journal_watcher = QFileSystemWatcher(self)
+        self.journal_watcher.fileChanged.connect(self._on_journal_changed)
+
+        # 报告在后台线程池里生成并写文件，完成信号排队回到界面线程
+        self.export_signals = ExportSignals(self)
+        self.export_signals.finished.connect(self._on_report_exported)
+        self.exporter = ReportExporter(on_done=self.export_signals.finished.emit)
+
+        # 运行指标：启用时定期写到 APP_DIR，供本地采集代理读取
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setTimerType(Qt.VeryCoarseTimer)
+        self.metrics_timer.timeout.connect(self._export_metrics)
+        if METRICS.enabled:
+            self.metrics_timer.start(METRICS_EXPORT_SEC * 1000)
+
+        # 长期历史：按天分区的列式文件（或 SQLite，见 HEALTHY_LIFE_HISTORY），与日志一起攒批落盘
+        self.history = open_history()
+
+        self.view.set(self, "setWindowTitle", t(self.settings.language, "title"))
         self.resize(1600, 1300)
         self.setMinimumSize(1000, 650)
 
@@ -337,34 +744,73 @@ class MainWindow(QMainWindow):
         self.outer = QVBoxLayout(page)
         self.outer.setContentsMargins(16, 16, 16, 16)
         self.outer.setSpacing(12)
+        self.profile.mark("window_init")
+
+        self.build_tray()
+        self.profile.mark("tray")
 
         self.build_header()
-        self.build_reco()
-        self.build_form()
+        self.cards = QVBoxLayout()       # 推荐 / 设定卡片的占位，首次显示后再填充
+        self.cards.setSpacing(12)
+        self.outer.addLayout(self.cards)
         self.build_progress()
         self.build_controls()
-        self.build_tray()
+        self.apply_texts()
+        self.profile.mark("window_core")
 
-        QMessageBox.information(
-            self,
+        QApplication.setQuitOnLastWindowClosed(False)
+
+    def _finish_startup(self):
+        """第一次显示后补齐其余部分：卡片、图片、会话恢复、欢迎提示，并写出启动耗时。"""
+        if self._startup_done:
+            return
+        self._ensure_cards()
+        self.profile.mark("cards")
+
+        pix = ASSETS.pixmap("images/logo.png", height=75)
+        if not pix.isNull():
+            self.logo_label.setPixmap(pix)
+        self.profile.mark("assets")
+
+        self._recover_session()
+        self.profile.mark("recover")
+        self._startup_done = True
+
+        try:
+            self.profile.save(STARTUP_PROFILE_PATH)
+        except OSError:
+            pass
+
+        # 欢迎提示不再阻塞启动：open() 立即返回
+        box = QMessageBox(
+            QMessageBox.Information,
             t(self.settings.language, "welcome_title"),
-            t(self.settings.language, "welcome_msg")
+            t(self.settings.language, "welcome_msg"),
+            QMessageBox.Ok,
+            self,
         )
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.open()
 
-        QApplication.setQuitOnLastWindowClosed(False)
+    def _ensure_cards(self):
+        """推荐 / 设定卡片按需构建（首次显示后，或更早被用到时）。"""
+        if self.form_card is not None:
+            return
+        self.build_reco()
+        self.build_form()
+        self.goal_spin.setValue(self.settings.goal)
+        self.sip_spin.setValue(self.settings.sip_size)
+        self._apply_card_texts()
+        if self.running:
+            self._set_inputs_enabled(False)
 
     # ---------- UI builders ----------
     def build_header(self):
         row = QHBoxLayout()
 
-        # --- logo ---
-        logo = QLabel()
-        pix = QPixmap(resource_path("images/logo.png"))
+        # --- logo：先占位，图片在首次显示后再解码 ---
+        self.logo_label = logo = QLabel()
         logo_h = 75
-        if not pix.isNull():
-            pix = pix.scaledToHeight(logo_h, Qt.SmoothTransformation)
-            logo.setPixmap(pix)
-            logo_h = pix.height()
         logo.setFixedSize(logo_h, logo_h)          # 正方形区域，便于对齐
         logo.setAlignment(Qt.AlignCenter)
         row.addWidget(logo)
@@ -409,7 +855,7 @@ class MainWindow(QMainWindow):
     def build_reco(self):
         self.reco_title = QLabel()
         self.reco_title.setObjectName("SectionTitleBlue")
-        self.outer.addWidget(self.reco_title)
+        self.cards.addWidget(self.reco_title)
 
         self.reco_card = QGroupBox()
         self.reco_card.setObjectName("CardBlue")
@@ -421,12 +867,12 @@ class MainWindow(QMainWindow):
         self.reco_label.setWordWrap(True)
         v.addWidget(self.reco_label)
 
-        self.outer.addWidget(self.reco_card)
+        self.cards.addWidget(self.reco_card)
 
     def build_form(self):
         self.form_title = QLabel()
         self.form_title.setObjectName("SectionTitleGreen")
-        self.outer.addWidget(self.form_title)
+        self.cards.addWidget(self.form_title)
 
         self.form_card = QGroupBox()
         self.form_card.setObjectName("CardGreen")
@@ -459,7 +905,7 @@ class MainWindow(QMainWindow):
         form.addRow(self.lbl_water_intv, self.water_interval_box)
         form.addRow(self.lbl_intv, self.interval_box)
 
-        self.outer.addWidget(self.form_card)
+        self.cards.addWidget(self.form_card)
 
     def build_progress(self):
         # 顶部一行：左边“进度”，右边“状态”
@@ -471,6 +917,7 @@ class MainWindow(QMainWindow):
 
         # 新增：状态文字放在右侧
         self.state_label = QLabel()
+        self.state_label.setObjectName("StateLabel")
         self.state_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         header_row.addStretch(1)
         header_row.addWidget(self.state_label)
@@ -494,6 +941,7 @@ class MainWindow(QMainWindow):
         v_time.addWidget(self.elapsed_desc)
 
         self.elapsed_label = QLabel("00:00:00")
+        self.elapsed_label.setObjectName("ElapsedLabel")
         v_time.addWidget(self.elapsed_label)
 
         self.outer.addWidget(self.time_card)
@@ -534,23 +982,33 @@ class MainWindow(QMainWindow):
 
         hdr.addSpacing(12)
 
-        self.moves_row = QHBoxLayout()
-        self.moves_row.setSpacing(6)
-        self.moves_row.setContentsMargins(0, 0, 0, 0)
-        hdr.addLayout(self.moves_row)
+        # 图标按需绘制：控件数量与活动次数无关
+        self.activity_strip = ActivityStrip(
+            ASSETS.movie("images/sit.gif", ACTIVITY_ICON_PX, ACTIVITY_ICON_PX))
+        hdr.addWidget(self.activity_strip)
 
         hdr.addStretch(1)
         v_act.addLayout(hdr)
 
-        self.move_icons = []  # [(QLabel, QMovie), ...]
-
         self.outer.addWidget(self.act_card)
         self.outer.addLayout(prog_layout)
 
-        # 计时器
-        self.start_time = None
+        # 计时器：elapsed_timer 只在窗口可见时每秒刷新时间文字；
+        # reminder_timer 是单次定时器，只在下一次提醒到期时唤醒
         self.elapsed_timer = QTimer(self)
         self.elapsed_timer.timeout.connect(self._tick_elapsed)
+        self._last_tick: Optional[float] = None   # 上一次刷新的 perf_counter（仅指标用）
+
+        self.reminder_timer = QTimer(self)
+        self.reminder_timer.setSingleShot(True)
+        self.reminder_timer.setTimerType(Qt.PreciseTimer)
+        self.reminder_timer.timeout.connect(self._on_reminder_due)
+
+        # 会话进行中低频心跳：没有精确挂起时钟的平台（Windows）靠它检测系统挂起
+        self.suspend_timer = QTimer(self)
+        self.suspend_timer.setTimerType(Qt.VeryCoarseTimer)
+        self.suspend_timer.setInterval(SUSPEND_HEARTBEAT_SEC * 1000)
+        self.suspend_timer.timeout.connect(self._check_suspend)
 
 
     def build_controls(self):
@@ -587,7 +1045,7 @@ class MainWindow(QMainWindow):
 
         # —— 结束与重置（靠右）
         self.finish_btn = QPushButton()
-        self.finish_btn.setText(t(self.settings.language, "finish_day"))
+        self.view.text(self.finish_btn, t(self.settings.language, "finish_day"))
         self.finish_btn.clicked.connect(self.finish_and_report)
         self.finish_btn.setEnabled(False)
 
@@ -617,110 +1075,217 @@ class MainWindow(QMainWindow):
 
     def build_tray(self):
         self.tray = QSystemTrayIcon(self)
-        self.tray.setIcon(QIcon(resource_path("images/logo.png")))
-        self.tray.setToolTip(t(self.settings.language, "tray_tooltip"))
+        self.tray.setIcon(ASSETS.icon("images/logo.png"))
+        self.view.set(self.tray, "setToolTip", t(self.settings.language, "tray_tooltip"))
         self._rebuild_tray_menu()
         self.tray.show()
         self.tray.activated.connect(self.on_tray_activated)
 
-
-        # 初始值赋入
-        self.goal_spin.setValue(self.settings.goal)
-        self.sip_spin.setValue(self.settings.sip_size)
-        self.apply_texts()
-
     # ---------- Texts / Language ----------
     def apply_texts(self):
         lang = self.settings.language
-        self.setWindowTitle(t(lang, "title"))
-        self.title_label.setText(t(lang, "app_name"))
-
-        self.reco_title.setText("💧/🪑 " + t(lang, "reco_title"))
-        self.reco_label.setText(t(lang, "reco_text"))
-
-        self.form_title.setText("⚙️ " + t(lang, "settings_title"))
-        self.settings_hint.setText(t(lang, "settings_hint"))
+        self.view.set(self, "setWindowTitle", t(lang, "title"))
+        self.view.text(self.title_label, t(lang, "app_name"))
 
-        self.prog_title.setText("📊 " + t(lang, "progress_section"))
-        self.log_move_btn.setText(t(lang, "log_move"))
+        self.view.text(self.prog_title, "📊 " + t(lang, "progress_section"))
+        self.view.text(self.log_move_btn, t(lang, "log_move"))
 
-        self.lbl_goal.setText(t(lang, "water_goal"))
-        self.lbl_sip.setText(t(lang, "sip_size"))
-        self.lbl_water_intv.setText(t(lang, "water_interval"))
-        self.lbl_intv.setText(t(lang, "interval"))
+        self.view.text(self.elapsed_desc, "⏱️ " + t(lang, "elapsed_desc"))
+        self.view.text(self.water_log_desc, "💦 " + t(lang, "water_log_desc"))
+        self.view.text(self.activity_log_desc, "🚶 " + t(lang, "activity_log_desc"))
 
-        self.elapsed_desc.setText("⏱️ " + t(lang, "elapsed_desc"))
-        self.water_log_desc.setText("💦 " + t(lang, "water_log_desc"))
-        self.activity_log_desc.setText("🚶 " + t(lang, "activity_log_desc"))
+        self.view.text(self.move_count_label,
+                       t(lang, "activity_count_fmt").format(self.move_count))
 
-        self.move_count_label.setText(
-            t(lang, "activity_count_fmt").format(self.move_count)
-        )
+        if self.form_card is not None:
+            self._apply_card_texts()
 
-        # 喝水提醒间隔
-        self.water_interval_box.blockSignals(True)
-        self.water_interval_box.clear()
-        for sec, label in HYDRATE_INTERVALS_SEC[lang]:
-            self.water_interval_box.addItem(label, sec)
-        default_water = 90 * 60
-        idx = 0
-        for i in range(self.water_interval_box.count()):
-            if self.water_interval_box.itemData(i) == default_water:
-                idx = i
-                break
-        self.water_interval_box.setCurrentIndex(idx)
-        self.water_interval_box.blockSignals(False)
-
-        # 久坐提醒间隔
-        self.interval_box.blockSignals(True)
-        self.interval_box.clear()
-        for sec, label in SED_INTERVALS_SEC[lang]:
-            self.interval_box.addItem(label, sec)
-        target = self.settings.interval_min * 60
-        idx = 0
-        for i in range(self.interval_box.count()):
-            if self.interval_box.itemData(i) == target:
-                idx = i
-                break
-        self.interval_box.setCurrentIndex(idx)
-        self.interval_box.blockSignals(False)
-
-        self.reset_btn.setText(t(lang, "reset_title"))
-        self.start_btn.setText(t(lang, "start") if not self.running else t(lang, "started"))
-        self.pause_btn.setText(t(lang, "pause") if not self.paused else t(lang, "resume"))
-        self.log_btn.setText(t(lang, "log_sip"))
-        self.tray.setToolTip(t(lang, "tray_tooltip"))
+        self.view.text(self.reset_btn, t(lang, "reset_title"))
+        self.view.text(self.start_btn, t(lang, "start") if not self.running else t(lang, "started"))
+        self.view.text(self.pause_btn, t(lang, "pause") if not self.paused else t(lang, "resume"))
+        self.view.text(self.log_btn, t(lang, "log_sip"))
+        self.view.set(self.tray, "setToolTip", t(lang, "tray_tooltip"))
 
         self._update_progress_bar()
-        self.finish_btn.setText(t(lang, "finish_day"))
+        self.view.text(self.finish_btn, t(lang, "finish_day"))
         self._update_state_label()
 
+    def _apply_card_texts(self):
+        """推荐 / 设定卡片的文字与下拉选项（卡片延迟构建，单独拆出）。"""
+        lang = self.settings.language
+        self.view.text(self.reco_title, "💧/🪑 " + t(lang, "reco_title"))
+        self.view.text(self.reco_label, t(lang, "reco_text"))
+
+        self.view.text(self.form_title, "⚙️ " + t(lang, "settings_title"))
+        self.view.text(self.settings_hint, t(lang, "settings_hint"))
+
+        self.view.text(self.lbl_goal, t(lang, "water_goal"))
+        self.view.text(self.lbl_sip, t(lang, "sip_size"))
+        self.view.text(self.lbl_water_intv, t(lang, "water_interval"))
+        self.view.text(self.lbl_intv, t(lang, "interval"))
+
+        # 两个间隔下拉框只在语言变化时重建，并保留当前选中的间隔
+        if self._combo_lang != lang:
+            self._combo_lang = lang
+            self._fill_interval_box(self.water_interval_box, HYDRATE_INTERVALS_SEC[lang], 90 * 60)
+            self._fill_interval_box(self.interval_box, SED_INTERVALS_SEC[lang],
+                                    self.settings.interval_min * 60)
+
+    @staticmethod
+    def _fill_interval_box(box: QComboBox, options, default_sec: int):
+        current = box.currentData()
+        target = default_sec if current is None else current
+        box.blockSignals(True)
+        box.clear()
+        for sec, label in options:
+            box.addItem(label, sec)
+        box.setCurrentIndex(max(0, box.findData(target)))
+        box.blockSignals(False)
 
     def on_lang_change(self, idx: int):
         self.settings.language = LANG_ZH if idx == 1 else LANG_EN
         self.apply_texts()
         self._rebuild_tray_menu()
-        self.settings.save()
+        self.settings.save(self.settings_writer)
 
     def _clear_activity_ui(self):
-        for lbl, mv in self.move_icons:
-            try:
-                mv.stop()
-            except Exception:
-                pass
-            lbl.deleteLater()
-        self.move_icons.clear()
+        self.activity_strip.clear()
+        self.activity_strip.movie.stop()
         self.move_count = 0
-        self.move_count_label.setText(
-            t(self.settings.language, "activity_count_fmt").format(0)
-        )
+        self.view.text(self.move_count_label,
+                       t(self.settings.language, "activity_count_fmt").format(0))
+
+    # ---------- Journal ----------
+    def _journal(self, kind: str, when: Optional[datetime] = None, **fields):
+        when = when or datetime.now()
+        self.journal.append(kind, when, **fields)
+        self.history.append(when, KIND_BY_NAME[kind], fields.get("ml", 0))
+        if not self.journal_timer.isActive():
+            self.journal_timer.start(2000)
+
+    def _sync_logs(self):
+        self.journal.sync()
+        self.history.flush()
+        self._watch_journal()
+
+    def _watch_journal(self):
+        path = str(JOURNAL_PATH)
+        if path not in self.journal_watcher.files() and JOURNAL_PATH.exists():
+            self.journal_watcher.addPath(path)
+
+    def _on_journal_changed(self, _path: str):
+        self.journal.sync()
+        self._watch_journal()
+
+    def _merge_journal_records(self, records: List[dict]):
+        """命令行追加到日志里的记录：一口 / 活动并入当前会话，end 结束会话。"""
+        sips = moves = 0
+        for rec in records:
+            kind = rec.get("e")
+            if kind == EV_END and self.running:
+                # 在日志锁外结束（会压缩日志）；end 已由命令行记下，这里不再重复
+                QTimer.singleShot(0, lambda: self._end_session(journal_end=False))
+            elif kind in (EV_SIP, EV_MOVE) and self.session.merge_event(
+                    datetime.fromtimestamp(rec["t"]), KIND_BY_NAME[kind], int(rec.get("ml", 0))):
+                if kind == EV_SIP:
+                    sips += 1
+                else:
+                    moves += 1
+        if sips:
+            self.settings.water_progress = self.session.water_progress
+            self._update_progress_bar()
+        if moves:
+            self._add_move_icons(moves)
+            self.move_count += moves
+            if self._on_screen():
+                self.view.text(self.move_count_label,
+                               t(self.settings.language, "activity_count_fmt").format(self.move_count))
+            else:
+                self._view_stale = True
+
+    def shutdown(self):
+        """退出前：等导出写完（最多 EXPORT_DRAIN_SEC 秒），把设定、最后一批日志与历史记录落盘，并销毁复用的弹窗。"""
+        self.exporter.shutdown(timeout=EXPORT_DRAIN_SEC)
+        # 进行中的会话记一条暂停：下次启动从退出时刻接着算，而不是从最后一次记录
+        now = datetime.now()
+        if self.session.pause(now):
+            self._journal(EV_PAUSE, now)
+        self.settings_writer.close()
+        self.journal.close()
+        self.history.close()
+        self.popups.dispose()
+        self._export_metrics()
+
+    def _export_metrics(self):
+        METRICS.write(METRICS_PROM_PATH, METRICS_JSON_PATH)
+
+    def _journal_snapshot(self) -> dict:
+        return JournalState(
+            settings=asdict(self.settings),
+            session_open=self.session.running,
+            start_time=self.session.start_time,
+            water_interval_sec=self.session.water_interval_sec,
+            sedentary_interval_sec=self.session.sedentary_interval_sec,
+            water_progress=self.session.water_progress,
+            events=self.session.events,
+            paused_accum=self.session.paused_accum,
+            paused_at=self.session.paused_at,
+        ).to_snapshot()
+
+    def _recover_session(self):
+        """上次退出时会话还没结束：从日志重建进度，并以“已暂停”状态接着用。"""
+        state = self.journal.recover()
+        self._watch_journal()
+        if not state.session_open or state.start_time is None:
+            return
+
+        for key in ("goal", "sip_size", "interval_min"):
+            if key in state.settings:
+                setattr(self.settings, key, int(state.settings[key]))
+        self.goal_spin.setValue(self.settings.goal)
+        self.sip_spin.setValue(self.settings.sip_size)
+
+        sess = self.session
+        sess.water_interval_sec = self.get_water_interval_sec()
+        sess.sedentary_interval_sec = self.get_sedentary_interval_sec()
+        # 正常退出时日志里已有暂停记录；崩溃时从最后一条记录起按暂停处理
+        sess.restore(state, pause_at=state.last_event or datetime.now())
+        self.settings.water_progress = sess.water_progress
+        for box, sec in ((self.water_interval_box, sess.water_interval_sec),
+                         (self.interval_box, sess.sedentary_interval_sec)):
+            idx = box.findData(sec)
+            if idx >= 0:
+                box.setCurrentIndex(idx)
+
+        self._add_move_icons(sess.stats.moves)
+        self.move_count = sess.stats.moves
+        self.view.text(self.move_count_label,
+                       t(self.settings.language, "activity_count_fmt").format(self.move_count))
+
+        self.start_btn.setEnabled(False)
+        self.pause_btn.setEnabled(True)
+        self.log_btn.setEnabled(True)
+        self.log_move_btn.setEnabled(True)
+        self.finish_btn.setEnabled(True)
+        self.view.text(self.pause_btn, t(self.settings.language, "resume"))
+        self.act_pause_resume.setText(t(self.settings.language, "resume"))
+        self._set_inputs_enabled(False)
+        self._update_progress_bar()
+        self._update_state_label()
+        self._tick_elapsed()
+
+        # 把恢复结果（含补记的暂停起点）写成新的快照
+        self.journal.compact()
+        self._watch_journal()
 
     # ---------- Helpers ----------
     def get_sedentary_interval_sec(self) -> int:
+        self._ensure_cards()
         data = self.interval_box.currentData()
         return int(data) if data is not None else 60 * 60
 
     def get_water_interval_sec(self) -> int:
+        self._ensure_cards()
         data = self.water_interval_box.currentData()
         return int(data) if data is not None else 90 * 60
 
@@ -729,14 +1294,22 @@ class MainWindow(QMainWindow):
             self.settings.water_progress, self.settings.goal
         )
 
-    def _update_progress_bar(self):
+    def _progress_pct(self) -> int:
         pct = int(round(
             (self.settings.water_progress / max(1, self.settings.goal)) * 100
         ))
-        self.progress_bar.setValue(max(0, min(100, pct)))
-        self.progress_label.setText(self._progress_text())
+        return max(0, min(100, pct))
+
+    def _update_progress_bar(self):
+        if not self._on_screen():
+            self._view_stale = True   # 托盘里不刷新，重新可见时一并补上
+            return
+        self.view.set(self.progress_bar, "setValue", self._progress_pct())
+        self.view.text(self.progress_label, self._progress_text())
 
     def _set_inputs_enabled(self, enabled: bool):
+        if self.form_card is None:
+            return   # 卡片构建时会按当前状态补上
         self.goal_spin.setEnabled(enabled)
         self.sip_spin.setEnabled(enabled)
         self.water_interval_box.setEnabled(enabled)
@@ -748,57 +1321,127 @@ class MainWindow(QMainWindow):
 
         if not self.running:
             text = "⏺ 未开始" if lang == LANG_ZH else "⏺ Not started"
-            color = "#6B7280"   # 灰色
+            state = "idle"      # 灰色
         elif self.paused:
             text = "⏸ 已暂停" if lang == LANG_ZH else "⏸ Paused"
-            color = "#F97316"   # 橙色
+            state = "paused"    # 橙色
         else:
             text = "▶ 运行中" if lang == LANG_ZH else "▶ Running"
-            color = "#16A34A"   # 绿色
+            state = "running"   # 绿色
+
+        self.view.text(self.state_label, text)
+        self.view.state(self.state_label, state)
+        # 暂停时计时文字变灰（QSS 里的 #ElapsedLabel[state="paused"]）
+        self.view.state(self.elapsed_label, "paused" if self.paused else "running")
 
-        self.state_label.setText(text)
-        self.state_label.setStyleSheet(
-            f"color: {color}; font-weight: 600; font-size: 14pt;"
-        )
 
+    @property
+    def running(self) -> bool:
+        return self.session.running
+
+    @property
+    def paused(self) -> bool:
+        return self.session.paused
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return self.session.start_time
 
     def _elapsed_seconds_now(self) -> float:
         """返回当前累计运行秒数（扣除暂停），用于进度时间 & 提醒调度。"""
-        if self.start_time is None:
-            return 0.0
-        now = datetime.now()
-        secs = (now - self.start_time).total_seconds() - float(self.paused_accum)
-        if self.paused_at is not None:
-            secs -= (now - self.paused_at).total_seconds()
-        return max(0.0, secs)
+        return self.session.elapsed_seconds()
 
     def _tick_elapsed(self):
+        """只刷新时间文字；提醒由 reminder_timer 在截止点单独触发。"""
         if self.start_time is None:
             return
+        if not self._on_screen():
+            self._view_stale = True
+            return
+        if METRICS.enabled:
+            now = time.perf_counter()
+            if self._last_tick is not None:
+                M_TICK_JITTER.observe(abs((now - self._last_tick) * 1000 - 1000))
+            self._last_tick = now
 
         secs = self._elapsed_seconds_now()   # 已扣除暂停时间
         h, rem = divmod(int(secs), 3600)
         m, s = divmod(rem, 60)
-        self.elapsed_label.setText(f"{h:02d}:{m:02d}:{s:02d}")
+        self.view.text(self.elapsed_label, f"{h:02d}:{m:02d}:{s:02d}")
+
+    def _on_screen(self) -> bool:
+        return self.isVisible() and not self.isMinimized()
+
+    def _apply_visibility(self):
+        """隐藏到托盘 / 最小化时暂停活动动画、跳过文字与进度刷新；
+        重新可见时恢复动画，并把期间跳过的刷新一次补齐。"""
+        visible = self._on_screen()
+        strip = self.activity_strip
+        for mv in ((strip.movie,) if strip.count() else ()):
+            if not visible:
+                if mv.state() == QMovie.Running:
+                    mv.setPaused(True)
+            elif mv.state() == QMovie.Paused:
+                mv.setPaused(False)
+            elif mv.state() == QMovie.NotRunning:
+                mv.start()
+        if visible and self._view_stale:
+            self._view_stale = False
+            self._update_progress_bar()
+            self.view.text(self.move_count_label,
+                           t(self.settings.language, "activity_count_fmt").format(self.move_count))
+            self._tick_elapsed()
+        self._sync_elapsed_timer()
+
+    def _sync_elapsed_timer(self):
+        """窗口可见且正在计时时才每秒刷新；隐藏到托盘 / 最小化 / 暂停时停掉。"""
+        counting = self.start_time is not None and not self.paused
+        if counting and self._on_screen():
+            if not self.elapsed_timer.isActive():
+                self._last_tick = None
+                self._tick_elapsed()   # 重新可见时先立刻对齐一次
+                self.elapsed_timer.start(1000)
+        else:
+            self.elapsed_timer.stop()
 
-        # 若没在运行或暂停中，不做提醒逻辑
-        if not self.running or self.paused:
+    def _arm_reminder_timer(self):
+        """按调度器中最近的截止点布置单次定时器；暂停或未开始时不布置。"""
+        self.reminder_timer.stop()
+        delay = self.session.seconds_until_next()
+        if delay is None:
+            self.suspend_timer.stop()
             return
-
-        # —— 用“活动时间秒数”触发喝水提醒 —— #
-        if self.next_water_due is not None and secs >= self.next_water_due:
-            self.water_reminder()
-            self.next_water_due += self.water_interval_sec
-
-        # —— 用“活动时间秒数”触发久坐提醒 —— #
-        if self.next_move_due is not None and secs >= self.next_move_due:
-            self.sedentary_reminder()
-            self.next_move_due += self.sedentary_interval_sec
-        # 若暂停，则把时间文字变成灰色；否则恢复默认颜色
-        if self.paused:
-            self.elapsed_label.setStyleSheet("color: #9CA3AF;")   # 灰
-        else:
-            self.elapsed_label.setStyleSheet("")  # 用回全局样式
+        self.reminder_timer.start(int(delay * 1000))
+        # 有精确挂起时钟时，挂起时长在下一次读时钟时就能扣掉，不必定时唤醒
+        if not self.session.clock.exact:
+            if not self.suspend_timer.isActive():
+                self.suspend_timer.start()
+
+    def _check_suspend(self):
+        """系统挂起的时长按暂停处理，并补记 pause / resume 以便恢复时一致。"""
+        now = datetime.now()
+        gap = self.session.check_suspend(now)
+        if gap:
+            self._journal(EV_PAUSE, now - timedelta(seconds=gap))
+            self._journal(EV_RESUME, now)
+
+    def _on_reminder_due(self):
+        self._check_suspend()
+        # 单次定时器可能略早于截止点触发，此时没有到期项，下面会重新布置；
+        # 挂起或卡顿后错过的多个间隔由调度器合并成一次提醒
+        due = self.session.scheduler.next_due()
+        fired = self.session.due_reminders()
+        if fired and METRICS.enabled:
+            M_REMINDER_LATE.observe(max(0.0, self.session.elapsed_seconds() - due) * 1000)
+            for kind in fired:
+                M_REMINDERS[kind].inc()
+        for kind in fired:
+            if kind == REMINDER_WATER:
+                self.water_reminder()
+            elif kind == REMINDER_MOVE:
+                self.sedentary_reminder()
+        # 弹窗由 PopupManager 非阻塞地排队显示，这里立即布置下一次
+        self._arm_reminder_timer()
 
     def _tray_log_sip(self):
         # 只在“正在运行且未暂停”时生效
@@ -852,12 +1495,12 @@ class MainWindow(QMainWindow):
         self.show()
         self.raise_()
         self.activateWindow()
+        self._apply_visibility()   # 已可见时不会再有 showEvent，这里确保补齐一次
 
     # ---------- Actions ----------
     def start_reminders(self):
+        self._ensure_cards()
         # —— 本次会话开始：清空所有会话统计 —— #
-        self.water_times.clear()
-        self.move_times.clear()
         self._clear_activity_ui()
         self.settings.water_progress = 0
         self._update_progress_bar()
@@ -868,26 +1511,32 @@ class MainWindow(QMainWindow):
         self.settings.interval_min = int(self.get_sedentary_interval_sec() / 60)
         self.settings.water_progress = 0
         self.settings.last_reset = str(datetime.now().date())
-        self.settings.save()
-
-        self.paused_at = None
-        self.paused_accum = 0.0
-        self.start_time = datetime.now()
-        self.elapsed_label.setText("00:00:00")
-        self.elapsed_timer.start(1000)
-
-        # 用当前下拉框计算间隔（秒）
-        self.water_interval_sec = self.get_water_interval_sec()
-        self.sedentary_interval_sec = self.get_sedentary_interval_sec()
-        self.next_water_due = self.water_interval_sec
-        self.next_move_due = self.sedentary_interval_sec
-
-        self.running = True
-        self.paused = False
+        self.settings.save(self.settings_writer)
+
+        # 用当前设定和下拉框间隔（秒）开始新会话
+        sess = self.session
+        sess.goal = self.settings.goal
+        sess.sip_size = self.settings.sip_size
+        sess.water_interval_sec = self.get_water_interval_sec()
+        sess.sedentary_interval_sec = self.get_sedentary_interval_sec()
+        sess.start()
+        self.view.text(self.elapsed_label, "00:00:00")
+
+        self._journal(
+            EV_START,
+            sess.start_time,
+            goal=self.settings.goal,
+            sip_size=self.settings.sip_size,
+            interval_min=self.settings.interval_min,
+            wi=sess.water_interval_sec,
+            si=sess.sedentary_interval_sec,
+        )
+        self._sync_elapsed_timer()
+        self._arm_reminder_timer()
         self.start_btn.setEnabled(False)
         self.pause_btn.setEnabled(True)
         self.log_btn.setEnabled(True)
-        self.pause_btn.setText(t(self.settings.language, "pause"))
+        self.view.text(self.pause_btn, t(self.settings.language, "pause"))
         self.act_pause_resume.setText(t(self.settings.language, "pause"))
 
         self._set_inputs_enabled(False)
@@ -910,12 +1559,11 @@ class MainWindow(QMainWindow):
         if not self.running:
             return
 
-        self.paused = not self.paused
-        if self.paused:
+        now = datetime.now()
+        if self.session.pause(now):
             # 进入暂停：停止“活动时间”计时器，记录暂停起点
-            self.elapsed_timer.stop()
-            self.paused_at = datetime.now()
-            self.pause_btn.setText(t(self.settings.language, "resume"))
+            self._journal(EV_PAUSE, now)
+            self.view.text(self.pause_btn, t(self.settings.language, "resume"))
             self.act_pause_resume.setText(t(self.settings.language, "resume"))
             self.tray.showMessage(
                 t(self.settings.language, "tray_tooltip"),
@@ -925,13 +1573,10 @@ class MainWindow(QMainWindow):
             )
         else:
             # 结束暂停：把这段暂停时间加入累计
-            if self.paused_at is not None:
-                self.paused_accum += (datetime.now() - self.paused_at).total_seconds()
-                self.paused_at = None
-            if self.start_time is not None:
-                self.elapsed_timer.start(1000)
+            self.session.resume(now)
+            self._journal(EV_RESUME, now)
 
-            self.pause_btn.setText(t(self.settings.language, "pause"))
+            self.view.text(self.pause_btn, t(self.settings.language, "pause"))
             self.act_pause_resume.setText(t(self.settings.language, "pause"))
             self.tray.showMessage(
                 t(self.settings.language, "tray_tooltip"),
@@ -939,33 +1584,39 @@ class MainWindow(QMainWindow):
                 QSystemTrayIcon.Information,
                 1500,
             )
-        # 无论暂停还是恢复，都更新一下状态文字
+        # 无论暂停还是恢复，都重新布置定时器并更新状态文字
+        self._sync_elapsed_timer()
+        self._arm_reminder_timer()
         self._update_state_label()
 
     def reset_form(self):
-        self.paused_at = None
-        self.paused_accum = 0.0
-
-        # 保留 stop 调用（虽然不再依赖这两个 QTimer 做逻辑）
-        self.elapsed_timer.stop()
+        self._end_session()
 
-        self.running = False
-        self.paused = False
-        self.start_time = None
+    def _end_session(self, journal_end: bool = True):
+        """会话与基于活动时间的调度一起清零。
 
-        # 基于活动时间的调度清零
-        self.next_water_due = None
-        self.next_move_due = None
+        ``journal_end=False`` 用于命令行已经记下 end 的情况；没有进行中的会话时不记 end。
+        """
+        was_running = self.running
+        self.session.reset()
+        self.popups.clear()
+        self._arm_reminder_timer()
+        self._sync_elapsed_timer()
 
         self._set_inputs_enabled(True)
 
         self.settings.water_progress = 0
         self._update_progress_bar()
-        self.water_times.clear()
-        self.move_times.clear()
         self._clear_activity_ui()
 
-        self.elapsed_label.setText("00:00:00")
+        # 会话结束：日志压缩成一条不含会话的快照
+        if was_running:
+            if journal_end:
+                self._journal(EV_END)
+            self.journal.compact()
+            self._watch_journal()
+
+        self.view.text(self.elapsed_label, "00:00:00")
         self.start_btn.setEnabled(True)
         self.pause_btn.setEnabled(False)
         self.log_btn.setEnabled(False)
@@ -980,13 +1631,13 @@ class MainWindow(QMainWindow):
         )
 
     def log_sip(self):
-        if not self.running or self.paused:
+        now = datetime.now()
+        if not self.session.log_sip(now):
             return
-        self.settings.water_progress += self.settings.sip_size
-        self.settings.save()
+        self.settings.water_progress = self.session.water_progress
+        self._journal(EV_SIP, now, ml=self.session.sip_size)
         self._update_progress_bar()
-        self.water_times.append(datetime.now())
-        if self.settings.water_progress >= self.settings.goal:
+        if self.session.goal_reached:
             self.tray.showMessage(
                 t(self.settings.language, "tray_tooltip"),
                 t(self.settings.language, "goal_done"),
@@ -995,203 +1646,118 @@ class MainWindow(QMainWindow):
             )
 
     def log_move(self):
-        if not self.running or self.paused:
+        now = datetime.now()
+        if not self.session.log_move(now):
             return
-        lbl = QLabel()
-        mv = QMovie(resource_path("images/sit.gif"))
-        mv.setScaledSize(QSize(65, 65))
-        lbl.setMovie(mv)
-        mv.start()
-        self.moves_row.addWidget(lbl)
-        self.move_icons.append((lbl, mv))
+        self._add_move_icons()
 
         self.move_count += 1
-        self.move_count_label.setText(
-            t(self.settings.language, "activity_count_fmt").format(self.move_count)
-        )
-        self.move_times.append(datetime.now())
-
-    def _build_report_text(self, end_time: datetime) -> str:
-        start_str = self.start_time.strftime("%Y-%m-%d %H:%M:%S") if self.start_time else "-"
-        end_str = end_time.strftime("%Y-%m-%d %H:%M:%S")
-
-        elapsed = self._elapsed_seconds_now()
-
-        def fmt_hm(sec: float) -> str:
-            sec = int(max(0, sec))
-            h, r = divmod(sec, 3600)
-            m, _ = divmod(r, 60)
-            return f"{h}小时{m}分钟 / {h}h {m}min"
-
-        sips_cnt = len(self.water_times)
-        sip_size = self.settings.sip_size
-        total_ml = self.settings.water_progress
-        goal_ml = self.settings.goal
-        remain_ml = max(0, goal_ml - total_ml)
-
-        move_times = list(self.move_times)
-        gaps: List[float] = []
-        if self.start_time is not None:
-            prev = self.start_time
-            for t in move_times:
-                gaps.append((t - prev).total_seconds())
-                prev = t
-            gaps.append((end_time - prev).total_seconds())
-
-        if gaps:
-            longest_gap = max(gaps)
-            if len(move_times) >= 2:
-                pair_gaps = [
-                    (move_times[i + 1] - move_times[i]).total_seconds()
-                    for i in range(len(move_times) - 1)
-                ]
-                avg_gap = sum(pair_gaps) / len(pair_gaps)
-            else:
-                avg_gap = elapsed / max(1, len(move_times))
-        else:
-            longest_gap = elapsed
-            avg_gap = elapsed if elapsed > 0 else 0
-
-        lines = [
-            "——————  当日健康活动报告 / Daily Health Report  ——————",
-            f"开始时间 / Start: {start_str}",
-            f"结束时间 / End:   {end_str}",
-            f"共计时长 / Duration: {fmt_hm(elapsed)}",
-            "",
-            "[饮水 / Hydration]",
-            f"累计次数 / Sips: {sips_cnt}",
-            f"每次饮水 / Per sip: {sip_size} ml",
-            f"累计饮水 / Total intake: {total_ml} ml",
-            f"饮水目标 / Goal: {goal_ml} ml",
-            f"还需饮水 / Remaining: {remain_ml} ml",
-            "",
-            "[久坐/活动 Sedentary / Activity]",
-            f"累计活动 / Activities: {len(move_times)}",
-            f"平均间隔 / Avg between moves: {fmt_hm(avg_gap)}",
-            f"最长久坐 / Longest sedentary interval: {fmt_hm(longest_gap)}",
-            "",
-            "（本报告由“健康生活小助手”自动生成 / Generated by Healthy Life Assistant）",
-        ]
-        return "\n".join(lines)
-
-    # ---------- Popups ----------
-    def _show_image_dialog(self, title: str, img_path: str, auto_close_ms: int, hydration: bool):
-        dlg = QDialog(self)
-        dlg.setWindowTitle(title)
-        dlg.setWindowIcon(QIcon(resource_path("images/logo.png")))
-        dlg.setFixedSize(650, 650)
-        v = QVBoxLayout(dlg)
-
-        img_label = QLabel()
-        if img_path.endswith(".gif"):
-            movie = QMovie(resource_path(img_path))
-            movie.setScaledSize(QSize(500, 500))
-            img_label.setMovie(movie)
-            movie.start()
-        else:
-            pix = QPixmap(resource_path(img_path))
-            img_label.setPixmap(
-                pix.scaled(475, 475, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
-        v.addWidget(img_label, alignment=Qt.AlignCenter)
-
-        if hydration:
-            # 喝水弹窗：进度 + 进度条 + “记录一口”
-            live = QLabel(self._progress_text())
-            v.addWidget(live, alignment=Qt.AlignCenter)
-
-            bar = QProgressBar()
-            bar.setValue(self.progress_bar.value())
-            v.addWidget(bar)
-
-            btn = QPushButton(t(self.settings.language, "log_sip"))
-
-            def _log_and_update():
-                self.log_sip()
-                live.setText(self._progress_text())
-                bar.setValue(self.progress_bar.value())
-
-            btn.clicked.connect(_log_and_update)
-            v.addWidget(btn, alignment=Qt.AlignCenter)
+        if self._on_screen():
+            self.view.text(self.move_count_label,
+                           t(self.settings.language, "activity_count_fmt").format(self.move_count))
         else:
-            # 活动弹窗：提示文字 + “记录活动”按钮
-            msg = QLabel(t(self.settings.language, "move_msg"))
-            msg.setWordWrap(True)
-            v.addWidget(msg, alignment=Qt.AlignCenter)
-
-            btn = QPushButton(t(self.settings.language, "log_move"))
-
-            def _log_move_and_close():
-                self.log_move()
-                dlg.accept()   # 记录完顺手关掉弹窗
+            self._view_stale = True
+        self._journal(EV_MOVE, now)
 
-            btn.clicked.connect(_log_move_and_close)
-            v.addWidget(btn, alignment=Qt.AlignCenter)
+    def _add_move_icons(self, n: int = 1):
+        if n <= 0:
+            return
+        strip = self.activity_strip
+        strip.add(n)
+        if strip.movie.state() != QMovie.Running and self._on_screen():
+            strip.movie.start()    # 隐藏时先不播放，重新可见时由 _apply_visibility 启动
 
-        QTimer.singleShot(auto_close_ms, dlg.accept)
-        dlg.exec_()
+    # ---------- Popups ----------
     def _show_joboff_dialog(self):
-        """结束/下班 时弹出的图片窗口（images/joboff.jpg）"""
-        dlg = QDialog(self)
-        dlg.setWindowTitle("下班啦")
-        dlg.setWindowIcon(QIcon(resource_path("images/logo.png")))
-        dlg.setFixedSize(650, 650)
+        """结束/下班 时弹出的图片窗口（images/joboff.jpg），第一次用到时构建，之后复用"""
+        dlg = self._joboff_dlg
+        if dlg is None:
+            dlg = self._joboff_dlg = QDialog(self)
+            dlg.setWindowTitle("下班啦")
+            dlg.setWindowIcon(ASSETS.icon("images/logo.png"))
+            dlg.setFixedSize(650, 650)
 
-        layout = QVBoxLayout(dlg)
+            layout = QVBoxLayout(dlg)
 
-        label = QLabel()
-        pix = QPixmap(resource_path("images/joboff.jpg"))
-        if not pix.isNull():
-            pix = pix.scaled(600, 600, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            label.setPixmap(pix)
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
+            label = QLabel()
+            pix = ASSETS.pixmap("images/joboff.jpg", 600, 600)
+            if not pix.isNull():
+                label.setPixmap(pix)
+            label.setAlignment(Qt.AlignCenter)
+            layout.addWidget(label)
 
-        # 自动 3 秒后关闭，也可以手动点 ×
-        QTimer.singleShot(7000, dlg.accept)
-        dlg.exec_()
+            dlg.closer = QTimer(dlg)
+            dlg.closer.setSingleShot(True)
+            dlg.closer.timeout.connect(dlg.accept)
+            dlg.finished.connect(dlg.closer.stop)
+
+        # 自动 7 秒后关闭，也可以手动点 ×；非模态打开，不挡住报告导出
+        dlg.closer.start(7000)
+        dlg.open()
 
 
     def water_reminder(self):
-        self._show_image_dialog(
-            t(self.settings.language, "hydrate_time"),
-            "images/water_remind.jpg",
-            5000,
-            hydration=True,
-        )
+        self.popups.request(REMINDER_WATER)
 
     def sedentary_reminder(self):
-        self._show_image_dialog(
-            t(self.settings.language, "move_break"),
-            "images/sit.gif",
-            7000,
-            hydration=False,
-        )
+        self.popups.request(REMINDER_MOVE)
 
     def finish_and_report(self):
         # 先弹出“下班”图片窗口
         self._show_joboff_dialog()   # ← 新增这一行
+        self.journal.sync()          # 先收下命令行刚记的一口 / 活动，报告里才有
         end_time = datetime.now()
-        text = self._build_report_text(end_time)
 
-        APP_DIR.mkdir(parents=True, exist_ok=True)
-        path = APP_DIR / f"health_report_{end_time:%Y-%m-%d}.txt"
-        path.write_text(text, encoding="utf-8")
+        # 界面线程上只取快照；生成与写文件交给后台，马上就可以重置会话
+        report = self.session.frozen().report(end_time, self.session.elapsed_seconds(end_time))
+        for fmt in REPORT_FORMATS:
+            writer = WRITERS[fmt]
+            path = report_path(APP_DIR, end_time, writer.ext)
+            self.exporter.submit(path, lambda w=writer: w.render(report), binary=writer.binary,
+                                 reserved=True)
 
+        self.reset_form()
+
+    def _on_report_exported(self, job: ExportJob):
+        if job.cancelled:
+            return
+        # 只有文本报告打开给用户看；其他格式是给下游工具的，失败时仍然提示
+        if job.path.suffix != ".txt" and job.error is None:
+            return
+        lang = self.settings.language
+        if job.error is not None:
+            self._show_message(QMessageBox.Warning, t(lang, "report_title"), str(job.error))
+            return
         try:
-            os.startfile(str(path))  # type: ignore[attr-defined]
+            os.startfile(str(job.path))  # type: ignore[attr-defined]
         except Exception:
             pass
+        self._show_message(QMessageBox.Information, t(lang, "report_title"),
+                           t(lang, "report_saved").format(str(job.path)))
 
-        QMessageBox.information(
-            self,
-            t(self.settings.language, "report_title"),
-            t(self.settings.language, "report_saved").format(str(path)),
-        )
-
-        self.reset_form()
+    def _show_message(self, icon, title: str, text: str):
+        """非模态提示框：不阻塞事件循环，托盘和提醒照常工作。"""
+        box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.open()
 
     # ---------- Window ----------
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._startup_done:
+            self.profile.mark("first_show")
+            QTimer.singleShot(0, self._finish_startup)   # 让首帧先画出来
+        self._apply_visibility()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._apply_visibility()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._apply_visibility()
+
     def closeEvent(self, event):
         event.ignore()
         self.hide()
@@ -1205,6 +1771,8 @@ class MainWindow(QMainWindow):
 
 # --------------------------------- Main --------------------------------- #
 def main():
+    profile = StartupProfile(_PROCESS_T0)
+    profile.mark("imports")
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     app.setStyle("Fusion")
@@ -1212,8 +1780,10 @@ def main():
     app.setApplicationDisplayName(APP_NAME)
     app.setStyleSheet(STYLE_QSS)
 
-    app.setWindowIcon(QIcon(resource_path("images/logo.png")))
-    win = MainWindow()
+    app.setWindowIcon(ASSETS.icon("images/logo.png"))
+    profile.mark("qapplication")
+    win = MainWindow(profile)
+    app.aboutToQuit.connect(win.shutdown)
     win.show()
     sys.exit(app.exec_())
 
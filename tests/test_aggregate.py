@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.aggregate import rollup_user
+from healthy_life.events import to_ms
+from healthy_life.history import KIND_END, KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP, KIND_START
+from healthy_life.report import WRITERS, Report
+
+T0 = datetime(2025, 11, 10, 9, 0, 0)
+
+
+def _at(days=0, minutes=0):
+    return to_ms(T0 + timedelta(days=days, minutes=minutes))
+
+
+def _sessions():
+    # 第一天：有暂停的一场；第二天：崩溃（没有 end）后又开了一场
+    return [
+        [(_at(0, 0), KIND_START, 0), (_at(0, 10), KIND_SIP, 250), (_at(0, 25), KIND_MOVE, 0),
+         (_at(0, 30), KIND_PAUSE, 0), (_at(0, 50), KIND_RESUME, 0), (_at(0, 95), KIND_MOVE, 0),
+         (_at(0, 100), KIND_SIP, 300), (_at(0, 180), KIND_END, 0)],
+        [(_at(1, 0), KIND_START, 0), (_at(1, 40), KIND_MOVE, 0), (_at(1, 41), KIND_SIP, 200)],
+        [(_at(1, 60), KIND_START, 0), (_at(1, 70), KIND_MOVE, 0), (_at(1, 200), KIND_MOVE, 0),
+         (_at(1, 230), KIND_END, 0)],
+    ]
+
+
+def test_rollup_matches_report_from_events(tmp_path):
+    user = tmp_path / "alice"
+    user.mkdir()
+    for i, rows in enumerate(_sessions()):
+        # csv 没有汇总：活动时长完全来自回放
+        text = "".join(WRITERS["csv"].render(Report(None, lambda rows=rows: iter(rows))))
+        (user / f"health_report_{i}.csv").write_text(text, encoding="utf-8")
+
+    rollup = rollup_user(user)
+    events = [row for rows in _sessions() for row in rows]
+    s = Report.from_events(lambda: iter(events), T0 + timedelta(days=2), 1700, 250).summary
+
+    assert rollup.sessions == 3
+    assert (rollup.sips, rollup.intake_ml, rollup.moves) == (s.sips, s.intake_ml, s.moves)
+    assert rollup.active_sec == pytest.approx(s.duration_sec)
+    assert rollup.active_sec == (160 + 60 + 170) * 60
+    assert rollup.longest_sec == pytest.approx(s.longest_sedentary_sec)
+    assert rollup.gaps.count == rollup.moves      # 开始→第一次活动、活动→活动
+    assert rollup.gaps.quantile(0.5) == pytest.approx(s.median_sedentary_sec)
@@ -0,0 +1,156 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.events import to_ms
+from healthy_life.history import KIND_END, KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP, KIND_START, DayColumns
+
+np = pytest.importorskip("numpy")
+analytics = pytest.importorskip("healthy_life.analytics")
+
+T0 = datetime(2025, 11, 10, 8, 0, 0)
+
+
+def _cols(rows):
+    return DayColumns(np.array([r[0] for r in rows], dtype="<i8"),
+                      np.array([r[1] for r in rows], dtype="u1"),
+                      np.array([r[2] for r in rows], dtype="<i4"))
+
+
+def _random_rows(seed, days=3):
+    """几天的事件：每天一到两场会话，偶尔崩溃（没有 end），夹杂会话外的零散事件与重复的 end。"""
+    rng = random.Random(seed)
+    rows = [(to_ms(T0 - timedelta(minutes=5)), KIND_MOVE, 0)]
+    for d in range(days):
+        t = T0 + timedelta(days=d, minutes=rng.randint(0, 90))
+        for _ in range(rng.randint(1, 2)):
+            rows.append((to_ms(t), KIND_START, 0))
+            for _ in range(rng.randint(0, 12)):
+                t += timedelta(seconds=rng.randint(60, 7200))
+                kind = rng.choice((KIND_SIP, KIND_MOVE, KIND_MOVE, KIND_PAUSE, KIND_RESUME))
+                rows.append((to_ms(t), kind, 250 if kind == KIND_SIP else 0))
+            t += timedelta(seconds=rng.randint(60, 3600))
+            if rng.random() < 0.8:
+                rows.append((to_ms(t), KIND_END, 0))
+                if rng.random() < 0.3:
+                    t += timedelta(seconds=30)
+                    rows.append((to_ms(t), KIND_END, 0))      # 旧版本重复记下的 end
+                    rows.append((to_ms(t), KIND_SIP, 250))     # 会话外的一口
+            t += timedelta(minutes=rng.randint(10, 120))
+    return rows
+
+
+# ---- 逐事件的纯 Python 参照实现 ---- #
+def _ref_session_ids(rows):
+    out, current, n = [], 0, 0
+    for _, kind, _ in rows:
+        if kind == KIND_START:
+            n += 1
+            current = n
+        out.append(current)
+        if kind == KIND_END:
+            current = 0
+    return out
+
+
+def _ref_intervals(rows, kind, include_open=False):
+    gaps, prev = [], None
+    for (ts, k, _), sid in zip(rows, _ref_session_ids(rows)):
+        if k == KIND_START:
+            prev = ts
+        elif sid and prev is not None and (k == kind or (include_open and k == KIND_END)):
+            gaps.append((prev, (ts - prev) / 1000, sid))
+            prev = None if k == KIND_END else ts
+    return gaps
+
+
+def _hour(ts):
+    return datetime.fromtimestamp(ts / 1000).hour
+
+
+def _ref_percentile(values, q):
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+def _check(rows):
+    cols = _cols(rows)
+    sid = analytics.session_ids(cols)
+    assert sid.tolist() == _ref_session_ids(rows)
+
+    for kind in (KIND_MOVE, KIND_SIP):
+        for include_open in (False, True):
+            got = analytics.intervals(cols, kind, include_open=include_open)
+            ref = _ref_intervals(rows, kind, include_open)
+            assert list(zip(got.start_ms.tolist(), got.sec.tolist(), got.session.tolist())) == ref
+
+    sed = [sec for _, sec, _ in _ref_intervals(rows, KIND_MOVE)]
+    sed_open = _ref_intervals(rows, KIND_MOVE, include_open=True)
+    out = analytics.analyze(cols, water_interval_sec=3600, sedentary_interval_sec=1800)
+    n_sessions = max(_ref_session_ids(rows), default=0)
+    assert out["events"] == len(rows)
+    assert out["sessions"] == n_sessions
+
+    s = out["sedentary"]
+    assert s["count"] == len(sed)
+    assert s["mean_sec"] == pytest.approx(sum(sed) / len(sed) if sed else 0.0)
+    for q in analytics.DEFAULT_PERCENTILES:
+        assert s[f"p{q:g}"] == pytest.approx(_ref_percentile(sed, q) if sed else 0.0)
+
+    hist = [0] * 16
+    for sec in sed:
+        hist[min(int(min(sec / 60, 240) // 15), 15)] += 1
+    assert s["histogram"]["count"].tolist() == hist
+
+    count, total, longest = [0] * 24, [0.0] * 24, [0.0] * 24
+    for start, sec, _ in _ref_intervals(rows, KIND_MOVE):
+        h = _hour(start)
+        count[h] += 1
+        total[h] += sec
+        longest[h] = max(longest[h], sec)
+    assert s["by_hour"]["count"].tolist() == count
+    assert s["by_hour"]["mean_sec"] == pytest.approx([t / c if c else 0.0 for t, c in zip(total, count)])
+    assert s["by_hour"]["max_sec"] == pytest.approx(longest)
+
+    per_session = [0.0] * n_sessions
+    for _, sec, sid_ in sed_open:
+        per_session[sid_ - 1] = max(per_session[sid_ - 1], sec)
+    assert s["longest_per_session_sec"] == pytest.approx(per_session)
+
+    ml = [0] * 24
+    for ts, kind, amount in rows:
+        if kind == KIND_SIP:
+            ml[_hour(ts)] += amount
+    days = len({datetime.fromtimestamp(ts / 1000).date() for ts, _, _ in rows})
+    assert out["intake_ml_by_hour"] == pytest.approx([m / max(1, days) for m in ml])
+
+    for key, gaps, limit in (("sedentary_adherence", sed_open, 1800),
+                             ("water_adherence", _ref_intervals(rows, KIND_SIP, True), 3600)):
+        over = [max(0.0, sec - limit) for _, sec, _ in gaps]
+        n_over = sum(1 for o in over if o > 0)
+        adh = out[key]
+        assert adh["intervals"] == len(gaps)
+        assert adh["over"] == n_over
+        assert adh["within"] == pytest.approx(1 - n_over / len(gaps) if gaps else 1.0)
+        assert adh["overdue_total_sec"] == pytest.approx(sum(over))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference(seed):
+    _check(_random_rows(seed))
+
+
+def test_single_day():
+    _check(_random_rows(42, days=1))
+
+
+def test_empty():
+    _check([])
+    out = analytics.analyze(_cols([]), 3600, 3600)
+    assert out["sessions"] == 0
+    assert out["sedentary"]["count"] == 0
+    assert out["sedentary_adherence"]["within"] == 1.0
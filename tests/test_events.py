@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.events import EventBuffer, to_ms
+from healthy_life.history import KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP
+from healthy_life.journal import EV_END, EV_MOVE, EV_PAUSE, EV_RESUME, EV_SIP, EV_START, EventJournal, recover
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+
+
+def _row(i):
+    return (to_ms(T0) + 1000 * i, (KIND_SIP, KIND_MOVE)[i % 2], 250 * (i % 2 == 0))
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 8, 9, 16, 17, 64, 65, 1023, 1024, 1025, 4097])
+def test_append_across_growth_boundaries(n):
+    # array 按块扩容：在扩容点前后的长度上，三列始终等长、内容不错位
+    rows = [_row(i) for i in range(n)]
+    buf = EventBuffer()
+    for row in rows:
+        buf.append_ms(*row)
+    assert len(buf) == len(buf.ts) == len(buf.kind) == len(buf.amount) == n
+    assert list(buf.rows()) == rows
+    assert buf.nbytes == 13 * n
+    assert list(EventBuffer(rows).rows()) == rows
+
+
+def test_zero_copy_view_after_growth():
+    np = pytest.importorskip("numpy")
+    buf = EventBuffer(_row(i) for i in range(1025))
+    ts = np.frombuffer(buf.ts, dtype="<i8")
+    assert ts.tolist() == list(buf.ts)
+    with pytest.raises(BufferError):
+        buf.append_ms(*_row(1025))     # 有视图时 array 拒绝扩容，不会让视图指向已释放的内存
+    del ts
+    buf.append_ms(*_row(1025))
+    assert len(buf) == 1026
+
+
+def test_iteration_order_and_insert():
+    buf = EventBuffer()
+    buf.append(T0, KIND_SIP, 250)
+    buf.append(T0 + timedelta(minutes=10), KIND_MOVE)
+    buf.append(T0 + timedelta(minutes=20), KIND_SIP, 300)
+
+    assert buf.insert(T0 + timedelta(minutes=5), KIND_MOVE) == 1
+    assert buf.insert(T0 + timedelta(minutes=10), KIND_PAUSE) == 3      # 同一时刻排在已有事件之后
+    assert buf.insert(T0 - timedelta(minutes=1), KIND_RESUME) == 0
+    assert buf.insert(T0 + timedelta(hours=1), KIND_MOVE) == len(buf) - 1
+
+    rows = list(buf.rows())
+    assert [ts for ts, _, _ in rows] == sorted(ts for ts, _, _ in rows)
+    assert [k for _, k, _ in rows] == [KIND_RESUME, KIND_SIP, KIND_MOVE, KIND_MOVE, KIND_PAUSE, KIND_SIP, KIND_MOVE]
+    assert [(e.ts_ms, e.kind, e.amount) for e in buf] == rows
+    assert (buf[-1].ts_ms, buf[-1].kind) == rows[-1][:2]
+    assert buf[1].when == T0
+    assert list(buf.times(KIND_SIP)) == [T0, T0 + timedelta(minutes=20)]
+    assert buf.count(KIND_MOVE) == 3
+
+
+def test_clear_and_reuse():
+    buf = EventBuffer(_row(i) for i in range(100))
+    twin = buf.copy()
+    ts = buf.ts
+    buf.clear()
+    assert len(buf) == 0 and list(buf.rows()) == [] and buf.nbytes == 0
+    assert buf.ts is ts                   # 就地清空，数组对象不变
+    assert len(twin) == 100               # 副本不受影响
+
+    rows = [_row(i) for i in range(3)]
+    for row in rows:
+        buf.append_ms(*row)
+    assert list(buf.rows()) == rows
+    assert list(EventBuffer.from_json(buf.to_json()).rows()) == rows
+    assert list(EventBuffer.from_json([]).rows()) == []
+
+
+def test_journal_replay_round_trip(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = EventJournal(path, batch_size=1000)
+    # 第一场会被第二场的 start 清掉：回放复用同一个缓冲
+    journal.append(EV_START, T0 - timedelta(days=1))
+    journal.append(EV_MOVE, T0 - timedelta(days=1) + timedelta(minutes=3))
+    journal.append(EV_END, T0 - timedelta(days=1) + timedelta(hours=1))
+
+    expected = EventBuffer()
+    journal.append(EV_START, T0)
+    for i in range(1, 200):
+        when = T0 + timedelta(seconds=37 * i, milliseconds=123 * i % 1000)
+        kind = (EV_SIP, EV_MOVE, EV_PAUSE, EV_RESUME)[i % 4]
+        ml = 250 if kind == EV_SIP else 0
+        journal.append(kind, when, **({"ml": ml} if ml else {}))
+        expected.append(when, {EV_SIP: KIND_SIP, EV_MOVE: KIND_MOVE,
+                               EV_PAUSE: KIND_PAUSE, EV_RESUME: KIND_RESUME}[kind], ml)
+    journal.close()
+
+    state = recover(path)
+    assert state.session_open and state.start_time == T0
+    assert list(state.events.rows()) == list(expected.rows())
+    assert state.water_progress == 250 * expected.count(KIND_SIP)
+
+    # 压缩成快照（列式）后再回放，结果相同
+    journal = EventJournal(path, snapshot=state.to_snapshot)
+    journal.compact()
+    journal.close()
+    assert list(recover(path).events.rows()) == list(expected.rows())
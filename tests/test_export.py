@@ -0,0 +1,56 @@
+import threading
+import time
+from datetime import datetime
+
+from healthy_life.export import ReportExporter
+from healthy_life.report import report_path
+
+END = datetime(2025, 11, 12, 18, 30, 5)
+
+
+def test_report_path_reserves_distinct_names(tmp_path):
+    a = report_path(tmp_path, END, "txt")
+    b = report_path(tmp_path, END, "txt")
+    assert (a.name, b.name) == ("health_report_2025-11-12_183005.txt", "health_report_2025-11-12_183005-1.txt")
+    assert a.is_file() and b.is_file()
+
+
+def test_failed_and_cancelled_exports_release_their_names(tmp_path):
+    gate = threading.Event()
+
+    def blocked():
+        gate.wait(5)
+        yield "ok"
+
+    def broken():
+        yield "x"
+        raise RuntimeError("boom")
+
+    exporter = ReportExporter(max_workers=1)
+    first = exporter.submit(report_path(tmp_path, END, "txt"), blocked, reserved=True)
+    queued = exporter.submit(report_path(tmp_path, END, "json"), lambda: iter(["{}"]), reserved=True)
+    queued.cancel()
+    gate.set()
+    failed = exporter.submit(report_path(tmp_path, END, "csv"), broken, reserved=True)
+    exporter.shutdown()
+
+    assert first.future.result().read_text(encoding="utf-8") == "ok"
+    assert isinstance(failed.error, RuntimeError)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["health_report_2025-11-12_183005.txt"]
+
+
+def test_shutdown_cancels_exports_past_the_timeout(tmp_path):
+    def slow():
+        while True:
+            time.sleep(0.01)
+            yield "."
+
+    exporter = ReportExporter(max_workers=1)
+    running = exporter.submit(report_path(tmp_path, END, "txt"), slow, reserved=True)
+    queued = exporter.submit(report_path(tmp_path, END, "json"), slow, reserved=True)
+    t0 = time.perf_counter()
+    exporter.shutdown(timeout=0.1)
+    assert time.perf_counter() - t0 < 2
+    assert running.cancelled and queued.cancelled
+    assert exporter.active() == []
+    assert list(tmp_path.iterdir()) == []
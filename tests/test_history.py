@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.history import KIND_MOVE, KIND_SIP, HistoryStore
+
+pytest.importorskip("numpy")
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+
+
+def _ms(when):
+    return int(when.timestamp() * 1000)
+
+
+def test_partial_flush_does_not_shift_rows(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append(T0, KIND_SIP, 250)
+    store.append(T0 + timedelta(minutes=1), KIND_MOVE)
+    store.flush()
+
+    # 模拟上次 flush 写完 ts 列、写了半个 kind 后崩溃
+    part = tmp_path / T0.date().isoformat()
+    with open(part / "ts.i64", "ab") as fh:
+        fh.write((123).to_bytes(8, "little") * 3)
+    with open(part / "kind.u8", "ab") as fh:
+        fh.write(bytes([KIND_SIP]))
+
+    store = HistoryStore(tmp_path)
+    store.append(T0 + timedelta(minutes=2), KIND_SIP, 300)
+    store.flush()
+
+    rows = list(store.rows(T0, T0 + timedelta(hours=1)))
+    assert rows == [
+        (_ms(T0), KIND_SIP, 250),
+        (_ms(T0 + timedelta(minutes=1)), KIND_MOVE, 0),
+        (_ms(T0 + timedelta(minutes=2)), KIND_SIP, 300),
+    ]
+    assert [(part / n).stat().st_size for n in ("ts.i64", "kind.u8", "amount.i32")] == [24, 3, 12]
+
+
+def test_interleaved_writers_keep_day_in_time_order(tmp_path):
+    # 桌面端攒了一批还没落盘，命令行先写入了更晚的一口
+    desktop = HistoryStore(tmp_path)
+    desktop.append(T0, KIND_SIP, 250)
+    desktop.append(T0 + timedelta(seconds=2), KIND_MOVE)
+    desktop.flush()
+    desktop.append(T0 + timedelta(seconds=10), KIND_MOVE)
+    desktop.append(T0 + timedelta(seconds=12), KIND_SIP, 200)
+
+    cli = HistoryStore(tmp_path)
+    cli.append(T0 + timedelta(seconds=11), KIND_SIP, 100)
+    cli.flush()
+    desktop.flush()
+
+    rows = list(HistoryStore(tmp_path).rows(T0, T0 + timedelta(hours=1)))
+    assert rows == [
+        (_ms(T0), KIND_SIP, 250),
+        (_ms(T0 + timedelta(seconds=2)), KIND_MOVE, 0),
+        (_ms(T0 + timedelta(seconds=10)), KIND_MOVE, 0),
+        (_ms(T0 + timedelta(seconds=11)), KIND_SIP, 100),
+        (_ms(T0 + timedelta(seconds=12)), KIND_SIP, 200),
+    ]
+    # 区间查询靠二分切片，乱序时会漏掉区间内的行
+    assert list(HistoryStore(tmp_path).rows(T0 + timedelta(seconds=11), T0 + timedelta(seconds=12))) == [
+        (_ms(T0 + timedelta(seconds=11)), KIND_SIP, 100),
+    ]
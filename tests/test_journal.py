@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from healthy_life.history import KIND_BY_NAME, KIND_MOVE, KIND_SIP
+from healthy_life.journal import EV_END, EV_MOVE, EV_SIP, EV_START, EventJournal, JournalState, recover
+from healthy_life.session import ReminderSession
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+
+
+class Desktop:
+    """桌面端的最小替身：内存中的会话 + 带 on_foreign 的日志。"""
+
+    def __init__(self, path):
+        self.session = ReminderSession(sip_size=250)
+        self.journal = EventJournal(path, snapshot=self.snapshot, on_foreign=self.merge)
+        self.foreign = []
+
+    def merge(self, records):
+        self.foreign += records
+        for rec in records:
+            if rec["e"] in (EV_SIP, EV_MOVE):
+                self.session.merge_event(datetime.fromtimestamp(rec["t"]), KIND_BY_NAME[rec["e"]],
+                                         rec.get("ml", 0))
+
+    def snapshot(self):
+        s = self.session
+        return JournalState(session_open=s.running, start_time=s.start_time,
+                            water_progress=s.water_progress, events=s.events,
+                            paused_accum=s.paused_accum, paused_at=s.paused_at).to_snapshot()
+
+
+def _cli(path, kind, when, **fields):
+    journal = EventJournal(path)
+    journal.append(kind, when, **fields)
+    journal.close()
+
+
+def test_compact_keeps_cli_records(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    app = Desktop(path)
+    app.journal.recover()
+    app.session.start(T0)
+    app.journal.append(EV_START, T0)
+    app.session.log_sip(T0 + timedelta(minutes=10))
+    app.journal.append(EV_SIP, T0 + timedelta(minutes=10), ml=250)
+    app.journal.sync()
+
+    _cli(path, EV_SIP, T0 + timedelta(minutes=20), ml=300)
+    _cli(path, EV_MOVE, T0 + timedelta(minutes=30))
+    app.journal.compact()
+
+    assert [r["e"] for r in app.foreign] == [EV_SIP, EV_MOVE]
+    state = recover(path)
+    assert state.water_progress == 550
+    assert [e.kind for e in state.events] == [KIND_SIP, KIND_SIP, KIND_MOVE]
+    assert app.session.stats.moves == 1
+
+
+def test_own_records_are_not_foreign(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _cli(path, EV_START, T0)
+    app = Desktop(path)
+    assert app.journal.recover().session_open
+    app.journal.append(EV_MOVE, T0 + timedelta(minutes=5))
+    app.journal.sync()
+    app.journal.append(EV_END, T0 + timedelta(minutes=6))
+    app.journal.compact()
+    assert app.foreign == []
+
+
+def test_late_record_is_inserted_in_order():
+    sess = ReminderSession()
+    sess.start(T0)
+    sess.log_move(T0 + timedelta(minutes=50))
+    assert sess.merge_event(T0 + timedelta(minutes=20), KIND_MOVE)
+    assert not sess.merge_event(T0 - timedelta(minutes=1), KIND_MOVE)
+    assert [e.when for e in sess.events] == [T0 + timedelta(minutes=20), T0 + timedelta(minutes=50)]
+    assert sess.stats.longest_gap == 30 * 60
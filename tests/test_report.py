@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.events import to_ms
+from healthy_life.history import KIND_END, KIND_MOVE, KIND_PAUSE, KIND_RESUME, KIND_SIP, KIND_START
+from healthy_life.report import WRITERS, Report, read_report
+from healthy_life.session import ReminderSession
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+END = T0 + timedelta(hours=8)
+
+
+def _report(rows):
+    return Report.from_events(lambda: iter(rows), END, 1700, 250)
+
+
+def _rows():
+    rows = [(to_ms(T0), KIND_START, 0)]
+    for i in range(1, 2500):      # 跨过写出器的分块边界
+        when = to_ms(T0 + timedelta(seconds=10 * i))
+        rows.append((when, (KIND_SIP, KIND_MOVE, KIND_PAUSE, KIND_RESUME)[i % 4], 250 if i % 4 == 0 else 0))
+    rows.append((to_ms(END), KIND_END, 0))
+    return rows
+
+
+def _write(tmp_path, report, fmt, stem="health_report"):
+    writer = WRITERS[fmt]
+    path = tmp_path / f"{stem}.{writer.ext}"
+    chunks = list(writer.render(report))
+    if writer.binary:
+        path.write_bytes(b"".join(chunks))
+    else:
+        path.write_text("".join(chunks), encoding="utf-8")
+    return path
+
+
+def _readable(fmt):
+    if fmt == "col":
+        pytest.importorskip("numpy")
+    return fmt
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "col"])
+def test_round_trip(tmp_path, fmt):
+    report = _report(_rows())
+    summary, events = read_report(_write(tmp_path, report, _readable(fmt)))
+    assert list(events) == list(report.events())
+    if fmt == "csv":
+        assert summary is None          # csv 只有事件
+    else:
+        assert summary == report.summary.to_dict()
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "col"])
+def test_round_trip_empty_report(tmp_path, fmt):
+    report = _report([])
+    assert report.summary.start is None
+    summary, events = read_report(_write(tmp_path, report, _readable(fmt)))
+    assert list(events) == []
+    if fmt != "csv":
+        assert summary == report.summary.to_dict()
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "col"])
+def test_round_trip_non_ascii_path(tmp_path, fmt):
+    # Windows 上的用户目录、报告目录常是中文
+    sess = ReminderSession()
+    sess.start(T0)
+    sess.log_sip(T0 + timedelta(minutes=5))
+    sess.log_move(T0 + timedelta(minutes=30))
+    report = sess.report(END, 3600)
+    folder = tmp_path / "张三的报告"
+    folder.mkdir()
+    summary, events = read_report(_write(folder, report, _readable(fmt), stem="健康报告_2025-11-12"))
+    assert list(events) == list(report.events())
+    if fmt != "csv":
+        assert summary == report.summary.to_dict()
+
+
+def test_txt_has_summary_and_is_not_read_back(tmp_path):
+    report = _report(_rows())
+    path = _write(tmp_path, report, "txt")
+    text = path.read_text(encoding="utf-8")
+    s = report.summary
+    assert f"累计饮水 / Total intake: {s.intake_ml} ml" in text
+    assert f"累计活动 / Activities: {s.moves}" in text
+    assert "健康生活小助手" in text
+    with pytest.raises(ValueError):
+        read_report(path)       # txt 是给人看的，汇总工具不读
+
+    empty = "".join(WRITERS["txt"].render(_report([])))
+    assert "开始时间 / Start: -" in empty
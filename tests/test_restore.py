@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from healthy_life.clock import ActiveClock, ManualClock
+from healthy_life.journal import EV_MOVE, EV_START, EventJournal, recover
+from healthy_life.session import ReminderSession
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+
+
+def _journal(path, gap_hours):
+    journal = EventJournal(path)
+    journal.append(EV_START, T0, goal=1700, sip_size=250, wi=5400, si=3600)
+    journal.append(EV_MOVE, T0 + timedelta(hours=1))
+    journal.close()
+    state = recover(path)
+    return state, T0 + timedelta(hours=1 + gap_hours)
+
+
+def test_restore_gap_is_paused(tmp_path):
+    state, now = _journal(tmp_path / "journal.jsonl", gap_hours=2)
+    clock = ManualClock(wall=now)
+    sess = ReminderSession(clock=ActiveClock(clock))
+    sess.restore(state, now=now, pause_at=state.last_event)
+
+    assert sess.paused
+    assert sess.elapsed_seconds(now) == 3600
+    clock.advance(600)          # 暂停中不走
+    assert sess.elapsed_seconds(clock.wall()) == 3600
+
+    sess.resume(clock.wall())
+    clock.advance(60)
+    assert sess.elapsed_seconds(clock.wall()) == 3660
+
+
+def test_restore_gap_without_clock(tmp_path):
+    state, now = _journal(tmp_path / "journal.jsonl", gap_hours=5)
+    sess = ReminderSession()
+    sess.restore(state, now=now, pause_at=state.last_event)
+    assert sess.elapsed_seconds(now) == 3600
+    # 提醒排在恢复后的下一个整间隔
+    assert sess.seconds_until_next(now) is None
+    sess.resume(now)
+    assert sess.seconds_until_next(now) == 1800
+
+
+def test_restore_keeps_journaled_pause(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = EventJournal(path)
+    journal.append(EV_START, T0, wi=5400, si=3600)
+    journal.append("pause", T0 + timedelta(minutes=30))
+    journal.close()
+    now = T0 + timedelta(hours=8)
+    sess = ReminderSession(clock=ActiveClock(ManualClock(wall=now)))
+    sess.restore(recover(path), now=now, pause_at=now)
+    assert sess.paused_at == T0 + timedelta(minutes=30)
+    assert sess.elapsed_seconds(now) == 1800
+
+
+def test_restore_after_clean_quit_keeps_time_until_exit(tmp_path):
+    # 9:00 开始、没有任何记录，17:00 从托盘退出：shutdown() 记一条暂停
+    path = tmp_path / "journal.jsonl"
+    journal = EventJournal(path)
+    journal.append(EV_START, T0, wi=5400, si=3600)
+    journal.append("pause", T0 + timedelta(hours=8))
+    journal.close()
+    now = T0 + timedelta(hours=24)
+    state = recover(path)
+    sess = ReminderSession(clock=ActiveClock(ManualClock(wall=now)))
+    sess.restore(state, now=now, pause_at=state.last_event)
+    assert sess.paused
+    assert sess.elapsed_seconds(now) == 8 * 3600
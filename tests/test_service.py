@@ -0,0 +1,38 @@
+import asyncio
+import gc
+import logging
+from datetime import datetime, timedelta
+
+from healthy_life.service import ReminderService
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+
+
+def test_async_callbacks_are_kept_and_errors_logged(caplog):
+    now = [T0]
+    seen = []
+
+    async def on_reminder(user_id, kind):
+        await asyncio.sleep(0)
+        gc.collect()        # 没有强引用的任务会在这里被回收
+        seen.append((user_id, kind))
+        if user_id == "bad":
+            raise RuntimeError("boom")
+
+    async def main():
+        svc = ReminderService(on_reminder, clock=lambda: now[0])
+        for user in ("ok", "bad"):
+            svc.open_session(user, water_interval_sec=60, sedentary_interval_sec=3600)
+        now[0] += timedelta(seconds=60)
+        fired = sum(svc.tick() for _ in range(60))
+        assert fired == 2 and len(svc._tasks) == 2
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return svc
+
+    with caplog.at_level(logging.ERROR, logger="healthy_life.service"):
+        svc = asyncio.run(main())
+    assert sorted(seen) == [("bad", "water"), ("ok", "water")]
+    assert svc._tasks == set()
+    assert svc.errors == 1
+    assert "boom" in caplog.text
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.history import KIND_END, KIND_MOVE, KIND_SIP, KIND_START
+from healthy_life.report import Report
+from healthy_life.sqlhistory import SqliteHistory
+
+DAY = datetime(2025, 11, 10)
+
+
+def _at(day, hours):
+    return DAY + timedelta(days=day, hours=hours)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SqliteHistory(tmp_path / "history.sqlite3")
+    yield db
+    db.close()
+
+
+def _write(db, rows):
+    for when, kind in rows:
+        db.append(when, kind, 250 if kind == KIND_SIP else 0)
+    db.flush(wait=True)
+
+
+def _report_longest(db, start, end):
+    return Report.from_events(lambda: db.rows(start, end), end, 1700, 250).summary.longest_sedentary_sec
+
+
+def test_longest_sedentary_includes_trailing_interval(db):
+    _write(db, [
+        # 第 0 天：活动之后又坐了 3 小时才下班
+        (_at(0, 9), KIND_START), (_at(0, 10), KIND_MOVE), (_at(0, 10.5), KIND_SIP),
+        (_at(0, 13), KIND_END),
+        # 第 1 天：崩溃，没有 end；第 2 天的 start 截断它
+        (_at(1, 9), KIND_START), (_at(1, 9.5), KIND_MOVE),
+        (_at(2, 9), KIND_START), (_at(2, 11), KIND_MOVE), (_at(2, 12), KIND_MOVE),
+        # 第 3 天：还在进行中
+        (_at(3, 9), KIND_START), (_at(3, 9.25), KIND_MOVE),
+    ])
+    cases = [
+        (_at(0, 0), _at(1, 0), 3 * 3600),                  # 活动 → end
+        (_at(0, 0), _at(0, 11), 3600),                     # end 在区间之外：算到区间终点
+        (_at(1, 0), _at(2, 0), 14.5 * 3600),               # 崩溃：活动 → 区间终点
+        (_at(1, 0), _at(3, 0), 23.5 * 3600),               # 崩溃：活动 → 下一场开始
+        (_at(2, 0), _at(3, 0), 12 * 3600),                 # 没有 end：算到区间终点
+        (_at(3, 0), _at(3, 12), 2.75 * 3600),              # 进行中
+    ]
+    for start, end, expected in cases:
+        gap = db.longest_sedentary(start, end)
+        assert gap.sec == expected, (start, end)
+        assert gap.sec == _report_longest(db, start, end), (start, end)
+    gap = db.longest_sedentary(_at(0, 0), _at(1, 0))
+    assert (gap.start, gap.end) == (_at(0, 10), _at(0, 13))
+
+
+def test_longest_sedentary_empty_range(db):
+    _write(db, [(_at(0, 9), KIND_START), (_at(0, 10), KIND_END)])
+    assert db.longest_sedentary(_at(5, 0), _at(6, 0)) is None
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthy_life.stats import GapSketch, SessionStats
+
+T0 = datetime(2025, 11, 12, 9, 0, 0)
+QS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+def _exact(values, q):
+    # 与 GapSketch.quantile 的秩定义一致：第 floor(q * (n - 1)) 个
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(7, 1.2) for _ in range(5000)]    # 久坐间隔量级：几分钟到几小时
+    sketch = GapSketch(alpha=0.01)
+    for v in values:
+        sketch.add(v)
+    assert sketch.count == len(values)
+    for q in QS:
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+
+
+def test_empty_and_single_sample():
+    sketch = GapSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.quantiles((0.5, 0.9)) == [None, None]
+
+    sketch.add(1800.0)
+    for q in QS:
+        assert sketch.quantile(q) == pytest.approx(1800.0, rel=sketch.alpha)
+
+
+def test_zero_gaps_counted_separately():
+    sketch = GapSketch()
+    for v in (0.0, 0.0, 0.0, 60.0):
+        sketch.add(v)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(60.0, rel=sketch.alpha)
+
+
+def test_merge_equals_single_sketch():
+    rng = random.Random(11)
+    a_vals = [rng.uniform(1, 600) for _ in range(700)]
+    b_vals = [rng.uniform(300, 7200) for _ in range(300)] + [0.0]
+    a, b, both = GapSketch(), GapSketch(), GapSketch()
+    for v in a_vals:
+        a.add(v)
+        both.add(v)
+    for v in b_vals:
+        b.add(v)
+        both.add(v)
+    a.merge(b)
+    assert a.count == both.count == len(a_vals) + len(b_vals)
+    assert a.quantiles(QS) == both.quantiles(QS)
+    for q in QS:
+        assert a.quantile(q) == pytest.approx(_exact(a_vals + b_vals, q), rel=0.01, abs=1e-9)
+
+    empty = GapSketch()
+    empty.merge(GapSketch())
+    assert empty.quantile(0.5) is None
+
+
+def test_session_stats_gaps_and_longest():
+    stats = SessionStats(T0)
+    stats.add_sip(250)
+    stats.add_sip(300)
+    for minutes in (20, 30, 90):
+        stats.add_move(T0 + timedelta(minutes=minutes))
+
+    assert (stats.sips, stats.intake, stats.moves) == (2, 550, 3)
+    assert stats.gaps.count == 3                   # 开始→第一次活动、活动→活动
+    assert stats.longest_gap == 60 * 60
+    # 仍在进行中的一段也算
+    assert stats.current_gap(T0 + timedelta(minutes=200)) == 110 * 60
+    assert stats.longest_gap_until(T0 + timedelta(minutes=200)) == 110 * 60
+    assert stats.longest_gap_until(T0 + timedelta(minutes=100)) == 60 * 60
+    assert stats.avg_move_gap(elapsed=0) == 35 * 60
+
+
+def test_session_stats_without_moves():
+    stats = SessionStats(T0)
+    assert stats.current_gap(T0 - timedelta(minutes=1)) == 0.0    # 时钟回拨不出负数
+    assert stats.longest_gap_until(T0 + timedelta(hours=2)) == 2 * 3600
+    assert stats.avg_move_gap(elapsed=3600) == 3600
+    assert stats.gaps.quantile(0.5) is None
+
+    stats.add_move(T0 + timedelta(minutes=45))
+    stats.reset(T0 + timedelta(hours=1))
+    assert (stats.moves, stats.gaps.count, stats.longest_gap) == (0, 0, 0.0)
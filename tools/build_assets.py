@@ -0,0 +1,124 @@
+"""构建预缩放资源包：按 bundle.ASSET_VARIANTS 把原图缩放到各 DPI，打成一个 assets.hlpack。
+
+运行时 ``AssetCache`` 会 mmap 这个文件，按键直接取缩好的像素，启动和弹窗时
+不再解码、缩放原图；包不存在、缺某个变体或字节序不符时照旧从 images/ 加载，
+所以发布包里 images/ 仍须完整。缺原图或解码失败时构建失败（退出码 1）。打包前运行一次::
+
+    python tools/build_assets.py                      # 读 ./images，写 ./assets.hlpack
+    python tools/build_assets.py --src DIR --out PATH --dpr 1 2
+
+小图存成预乘 ARGB32 原始像素（运行时零解码），超过 ``RAW_MAX_BYTES`` 的大图存 PNG（有透明）或 JPEG。
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PyQt5.QtCore import QBuffer, QByteArray, QCoreApplication, QIODevice, QSize, Qt  # noqa: E402
+from PyQt5.QtGui import QImage, QImageReader  # noqa: E402
+
+from healthy_life.bundle import ASSET_DPRS, ASSET_VARIANTS, BundleWriter, asset_key  # noqa: E402
+from healthy_life.config import ASSET_BUNDLE_NAME  # noqa: E402
+
+RAW_MAX_BYTES = 256 * 1024      # 单帧超过这个大小改存 PNG / JPEG
+JPEG_QUALITY = 92
+
+
+def _codec(img: QImage, animated: bool) -> str:
+    if img.width() * img.height() * 4 <= RAW_MAX_BYTES:
+        return "raw"
+    # 照片类大图用 JPEG，比 PNG 小得多；动画和带透明的图保持无损
+    return "png" if animated or img.hasAlphaChannel() else "jpg"
+
+
+def _encode(img: QImage, codec: str) -> bytes:
+    if codec == "raw":
+        img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        return img.constBits().asstring(img.sizeInBytes())
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, codec.upper(), JPEG_QUALITY if codec == "jpg" else -1)
+    return bytes(data)
+
+
+def _still(path: Path, width: int, height: int, dpr: float) -> QImage:
+    # 与 AssetCache.pixmap 的缩放方式相同，只是目标是物理像素
+    img = QImage(str(path))
+    if img.isNull():
+        return img
+    if width:
+        return img.scaled(round(width * dpr), round(height * dpr),
+                          Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return img.scaledToHeight(round(height * dpr), Qt.SmoothTransformation)
+
+
+def _frames(path: Path, width: int, height: int, dpr: float) -> List[Tuple[QImage, int]]:
+    # 与 QMovie.setScaledSize 相同：直接缩放到目标尺寸（不保持比例）
+    reader = QImageReader(str(path))
+    reader.setScaledSize(QSize(round(width * dpr), round(height * dpr)))
+    out = []
+    while True:
+        img = reader.read()
+        if img.isNull():
+            break
+        out.append((img, reader.nextImageDelay()))
+        if not reader.supportsAnimation():
+            break
+    return out
+
+
+def build(src: Path, out: Path, dprs: Iterable[float] = ASSET_DPRS,
+          variants=ASSET_VARIANTS) -> List[Tuple[str, float, str, int, int]]:
+    """生成资源包；返回 (键, dpr, codec, 帧数, 字节数) 列表。
+
+    任何变体缺原图或无法解码都抛 FileNotFoundError，不写出残缺的包。"""
+    _app = QCoreApplication.instance() or QCoreApplication([])   # noqa: F841  图片格式插件需要
+    writer = BundleWriter()
+    rows = []
+    missing = []
+    for rel, width, height, animated in variants:
+        path = Path(src) / rel
+        if not path.is_file():
+            missing.append(f"{rel}（找不到原图）")
+            continue
+        key = asset_key(rel, width, height)
+        for dpr in dprs:
+            frames = _frames(path, width, height, dpr) if animated else [(_still(path, width, height, dpr), 0)]
+            frames = [(img, delay) for img, delay in frames if not img.isNull()]
+            if not frames:
+                missing.append(f"{rel}（无法解码）")
+                break
+            img = frames[0][0]
+            codec = _codec(img, animated)
+            encoded = [(_encode(img, codec), delay) for img, delay in frames]
+            writer.add(key, dpr, img.width(), img.height(), codec, encoded)
+            rows.append((key, dpr, codec, len(encoded), sum(len(b) for b, _ in encoded)))
+    if missing:
+        raise FileNotFoundError("资源包缺变体: " + ", ".join(dict.fromkeys(missing)))
+    writer.write(out)
+    return rows
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="构建预缩放资源包")
+    ap.add_argument("--src", type=Path, default=Path("."), help="含 images/ 的目录")
+    ap.add_argument("--out", type=Path, default=Path(ASSET_BUNDLE_NAME))
+    ap.add_argument("--dpr", type=float, nargs="+", default=list(ASSET_DPRS))
+    args = ap.parse_args(argv)
+
+    try:
+        rows = build(args.src, args.out, args.dpr)
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    for key, dpr, codec, n, size in rows:
+        print(f"{key:<36}{dpr:>5g}x  {codec:<4}{n:>4} 帧{size / 1024:>10.1f} KB")
+    print(f"{args.out}: {args.out.stat().st_size / 1024:.1f} KB, {len(rows)} 个变体")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""确定性时钟场景：验证调度器在时钟跳变下的触发序列。
+
+用 ManualClock 驱动挂着 ActiveClock 的 ReminderSession，按脚本推进时间，
+记录每次提醒触发时的活动秒数，与期望序列逐项比较。
+
+    python tools/clock_harness.py        # 全部通过时退出码为 0
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from healthy_life.clock import ActiveClock, ManualClock  # noqa: E402
+from healthy_life.session import ReminderSession  # noqa: E402
+
+WATER, MOVE = 600, 900      # 喝水 10 分钟、久坐 15 分钟，序列短一些便于核对
+HEARTBEAT = 30              # 对应桌面端的挂起检测心跳
+STALL = 2 * HEARTBEAT
+
+
+def _session(exact: bool = True):
+    clock = ManualClock(exact=exact)
+    sess = ReminderSession(
+        water_interval_sec=WATER,
+        sedentary_interval_sec=MOVE,
+        clock=ActiveClock(clock, stall_sec=STALL),
+    )
+    sess.start(clock.wall())
+    return sess, clock
+
+
+def _fire(sess, clock, out):
+    gap = sess.check_suspend(clock.wall())
+    if gap:
+        out.append((round(sess.elapsed_seconds()), "suspend", round(gap)))
+    for kind in sess.due_reminders(clock.wall()):
+        out.append((round(sess.elapsed_seconds()), kind))
+
+
+def drive(steps, exact: bool = True):
+    """steps 中每一项是 (动作, 秒数)：
+
+    - ``run``：正常运行，按心跳与提醒截止点唤醒；
+    - ``suspend``：系统挂起，醒来时立即唤醒一次；
+    - ``stall``：进程卡住（未挂起），期间没有任何唤醒；
+    - ``wall``：只改墙上时间（校时 / 夏令时）；
+    - ``pause`` / ``resume``：用户暂停与继续（秒数忽略）。
+    """
+    sess, clock = _session(exact)
+    out = []
+    for op, sec in steps:
+        if op == "run":
+            left = sec
+            while left > 0:
+                nxt = sess.seconds_until_next()
+                step = min(left, HEARTBEAT, left if nxt is None else max(nxt, 0.001))
+                clock.advance(step)
+                left -= step
+                _fire(sess, clock, out)
+        elif op == "suspend":
+            clock.suspend(sec)
+            _fire(sess, clock, out)
+        elif op == "stall":
+            clock.advance(sec)
+            _fire(sess, clock, out)
+        elif op == "wall":
+            clock.jump_wall(sec)
+        elif op == "pause":
+            sess.pause(clock.wall())
+        elif op == "resume":
+            sess.resume(clock.wall())
+    return out
+
+
+# 同一秒到期时按各自上次排入堆的先后触发
+BASELINE = [
+    (600, "water"), (900, "move"), (1200, "water"), (1800, "move"), (1800, "water"),
+    (2400, "water"), (2700, "move"), (3000, "water"), (3600, "move"), (3600, "water"),
+]
+
+SCENARIOS = [
+    ("baseline", dict(steps=[("run", 3600)]), BASELINE),
+    # 校时 / 夏令时只动墙上时间，活动时间和触发序列不变
+    ("wall jumps", dict(steps=[("run", 1000), ("wall", -3600), ("run", 1000),
+                               ("wall", 7200), ("run", 1600)]), BASELINE),
+    # 精确挂起时钟：3 小时挂起整段计为暂停，序列与基线相同
+    ("suspend (exact)", dict(steps=[("run", 1000), ("suspend", 10800), ("run", 2600)]),
+     BASELINE[:2] + [(1000, "suspend", 10800)] + BASELINE[2:]),
+    # 只有心跳的平台：挂起中最多 STALL 秒被当成活动时间，之后不会连发
+    ("suspend (heartbeat)", dict(steps=[("run", 1000), ("suspend", 10800), ("run", 2600)],
+                                 exact=False),
+     BASELINE[:2] + [(1060, "suspend", 10740)] + BASELINE[2:]),
+    # 卡住 3 小时（未挂起）：错过的 18 次喝水、12 次久坐各合并成一次
+    ("stall", dict(steps=[("run", 1000), ("stall", 10800), ("run", 1200)]),
+     [(600, "water"), (900, "move"), (11800, "water"), (11800, "move"),
+      (12000, "water"), (12600, "move"), (12600, "water")]),
+    # 暂停期间的挂起不重复扣除
+    ("suspend while paused", dict(steps=[("run", 1000), ("pause", 0), ("suspend", 10800),
+                                         ("resume", 0), ("run", 2600)]), BASELINE),
+]
+
+
+def main() -> int:
+    failed = 0
+    for name, kw, expected in SCENARIOS:
+        got = drive(**kw)
+        ok = got == expected
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {got}")
+        if not ok:
+            print(f"     expected: {expected}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,8 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('images', 'images')],
+    # images/ 整个带上：资源包缺变体或字节序不符时 AssetCache 退回原图
+    datas=[('assets.hlpack', '.'), ('images', 'images')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},